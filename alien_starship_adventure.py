@@ -5,539 +5,719 @@ A text-based adventure set on an abandoned alien starship orbiting a desolate pl
 Objective: Find escape pods to get off the ship by collecting items and solving puzzles.
 """
 
-from typing import Optional
+from contextlib import nullcontext
+from time import perf_counter_ns
+from typing import Callable, Iterable, Iterator, Optional, Tuple
 import random
 
+from starship_commands import DEFAULT_PARSER, Command, ItemIndex
+from starship_render import NullRenderer, Renderer, TextRenderer, spoken_name, title_name
+from starship_routes import Router
+from starship_snapshot import restore_snapshot, write_snapshot
+from starship_solver import Solver
+from starship_world import DANGLING_EXIT, DIRECTION_COUNT, DIRECTION_INDEX, DIRECTIONS, NO_EXIT
+from starship_worldfile import shared_world
+
+# Items a random event can reveal in the current room
+BONUS_ITEMS = ("energy_cell", "oxygen_canister", "medical_kit", "alien_crystal")
+
+# Stands in for a room lock when the game's rooms are not shared
+_NO_LOCK = nullcontext()
+
+# Process-wide recorder installed by starship_metrics.enable(); a module
+# global, since it is tested once per command, random event and message
+_metrics = None
+
+
+def set_metrics(metrics):
+    """Install a metrics recorder for every game in the process, or None to stop"""
+    global _metrics
+    _metrics = metrics
+
+
 class Item:
+    """Immutable item definition, shared by every game on a ship"""
+
+    __slots__ = ("name", "description", "usable")
+
     def __init__(self, name: str, description: str, usable: bool = False):
         self.name = name
         self.description = description
         self.usable = usable
 
+class ItemBag:
+    """Insertion-ordered multiset of items keyed by lower-cased name
+
+    Lookup, insertion and removal are O(1) dict operations. Iteration yields
+    every unit in insertion order, so a bag holding two energy cells yields
+    the same Item twice; ``len()`` counts units, not distinct names. Lookup
+    methods take names that the caller has already normalized.
+    """
+
+    __slots__ = ("_entries", "_units")
+
+    def __init__(self, items: Iterable[Item] = ()):
+        self._entries = {}
+        self._units = 0
+        for item in items:
+            self.add(item)
+
+    def add(self, item: Item, count: int = 1):
+        key = item.name.lower()
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = [item, count]
+        else:
+            entry[1] += count
+        self._units += count
+
+    def get(self, name: str) -> Optional[Item]:
+        entry = self._entries.get(name)
+        return entry[0] if entry is not None else None
+
+    def count(self, name: str) -> int:
+        entry = self._entries.get(name)
+        return entry[1] if entry is not None else 0
+
+    def remove(self, name: str) -> Optional[Item]:
+        """Take one unit out of the bag and return it, or None if absent"""
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        entry[1] -= 1
+        if not entry[1]:
+            del self._entries[name]
+        self._units -= 1
+        return entry[0]
+
+    def grouped(self) -> Iterator[Tuple[Item, int]]:
+        """Yield (item, count) per distinct name in insertion order"""
+        for item, count in self._entries.values():
+            yield item, count
+
+    def clear(self):
+        self._entries.clear()
+        self._units = 0
+
+    def copy(self) -> "ItemBag":
+        clone = ItemBag.__new__(ItemBag)
+        clone._entries = {key: [item, count] for key, (item, count) in self._entries.items()}
+        clone._units = self._units
+        return clone
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return self._units
+
+    def __bool__(self) -> bool:
+        return self._units > 0
+
+    def __iter__(self) -> Iterator[Item]:
+        for item, count in self._entries.values():
+            for _ in range(count):
+                yield item
+
 class Room:
+    __slots__ = ("id", "name", "description", "level", "exits", "items", "visited", "locked",
+                 "lock_description", "required_item")
+
     def __init__(self, name: str, description: str, level: int):
+        self.id = None
         self.name = name
         self.description = description
         self.level = level
         self.exits = {}
-        self.items = []
+        self.items = ItemBag()
         self.visited = False
         self.locked = False
         self.lock_description = ""
         self.required_item = None
 
+    def fork(self) -> "Room":
+        """Copy the room's mutable state, sharing its description and exits"""
+        clone = object.__new__(Room)
+        clone.id = self.id
+        clone.name = self.name
+        clone.description = self.description
+        clone.level = self.level
+        clone.exits = self.exits
+        clone.items = self.items.copy()
+        clone.visited = self.visited
+        clone.locked = self.locked
+        clone.lock_description = self.lock_description
+        clone.required_item = self.required_item
+        return clone
+
 class Player:
+    __slots__ = ("current_room", "inventory", "max_inventory")
+
     def __init__(self):
         self.current_room = None
-        self.inventory = []
+        self.inventory = ItemBag()
         self.max_inventory = 10
 
+    def fork(self, current_room: "Room") -> "Player":
+        clone = object.__new__(Player)
+        clone.current_room = current_room
+        clone.inventory = self.inventory.copy()
+        clone.max_inventory = self.max_inventory
+        return clone
+
     def add_item(self, item: Item) -> bool:
         if len(self.inventory) < self.max_inventory:
-            self.inventory.append(item)
+            self.inventory.add(item)
             return True
         return False
 
     def has_item(self, item_name: str) -> bool:
-        return any(item.name.lower() == item_name.lower() for item in self.inventory)
+        return item_name.lower() in self.inventory
 
     def get_item(self, item_name: str) -> Optional[Item]:
-        for item in self.inventory:
-            if item.name.lower() == item_name.lower():
-                return item
-        return None
+        return self.inventory.get(item_name.lower())
 
     def remove_item(self, item_name: str) -> bool:
-        for i, item in enumerate(self.inventory):
-            if item.name.lower() == item_name.lower():
-                del self.inventory[i]
-                return True
-        return False
+        return self.inventory.remove(item_name.lower()) is not None
 
 class AlienStarshipGame:
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None, renderer: Optional[Renderer] = None, ship=None):
+        # Unseeded games still get a concrete seed so journals can reproduce them
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+        self._rng = None
+        self.renderer = renderer if renderer is not None else TextRenderer()
         self.player = Player()
-        self.rooms = {}
-        self.items = {}
         self.game_over = False
         self.victory = False
         self.escape_pods_found = 0
         self.required_escape_pods = 1
-        
-        self.create_items()
-        self.create_rooms()
-        self.setup_connections()
-        self.place_items()
-        
-        # Start in the docking bay
-        self.player.current_room = self.rooms["docking_bay"]
-
-    def create_items(self):
-        """Create all items in the game"""
-        items_data = [
-            ("security_keycard", "A magnetic keycard with alien symbols", True),
-            ("plasma_torch", "A portable cutting tool that still has power", True),
-            ("oxygen_canister", "Emergency oxygen supply", True),
-            ("alien_crystal", "A glowing crystal that hums with energy", True),
-            ("maintenance_tool", "Alien maintenance device with multiple attachments", True),
-            ("data_pad", "An alien tablet displaying navigation data", False),
-            ("energy_cell", "High-capacity power cell", True),
-            ("neural_interface", "Alien neural interface headset", True),
-            ("gravity_boots", "Magnetic boots for zero-gravity movement", True),
-            ("translation_device", "Device that translates alien text", True),
-            ("emergency_beacon", "Distress beacon still functional", False),
-            ("alien_weapon", "Strange alien energy weapon", False),
-            ("medical_kit", "Alien medical supplies", True),
-            ("ship_schematic", "Holographic ship layout", False),
-            ("command_codes", "Access codes for ship systems", True),
-        ]
-        
-        for name, desc, usable in items_data:
-            self.items[name] = Item(name, desc, usable)
-
-    def create_rooms(self):
-        """Create all 50+ rooms across multiple levels"""
-        rooms_data = [
-            # Level 1 - Lower Decks
-            ("docking_bay", "The ship's main docking bay. Your shuttle is docked here, but it's damaged beyond repair. Strange alien symbols cover the walls.", 1),
-            ("cargo_hold_1", "A vast cargo hold with massive alien containers. Some are open, revealing strange artifacts.", 1),
-            ("cargo_hold_2", "Another cargo hold, this one mostly empty except for scattered debris.", 1),
-            ("maintenance_shaft_1", "A narrow maintenance corridor with exposed conduits and alien machinery.", 1),
-            ("storage_room_1", "A storage room filled with alien equipment and supplies.", 1),
-            ("storage_room_2", "Another storage room, this one seems to have been ransacked.", 1),
-            ("engine_room_lower", "The lower section of the massive engine room. Alien technology hums quietly.", 1),
-            ("waste_processing", "The ship's waste processing facility. The smell is... alien.", 1),
-            ("water_recycling", "Water recycling systems still function, creating an eerie dripping sound.", 1),
-            ("emergency_stairwell_1", "A emergency stairwell leading to upper levels.", 1),
-            ("airlock_1", "An airlock leading to the ship's exterior. The outer door is sealed.", 1),
-            ("power_distribution_1", "A room full of alien power distribution systems.", 1),
-            
-            # Level 2 - Crew Quarters
-            ("crew_quarters_1", "Personal quarters with an alien sleeping alcove and strange personal effects.", 2),
-            ("crew_quarters_2", "More crew quarters, these seem hastily abandoned.", 2),
-            ("crew_quarters_3", "Crew quarters with signs of a struggle.", 2),
-            ("crew_quarters_4", "Luxurious quarters, possibly for an officer.", 2),
-            ("crew_mess_hall", "The crew's dining area with alien food preparation stations.", 2),
-            ("recreation_room", "A room with alien entertainment devices and games.", 2),
-            ("gymnasium", "Exercise facility with strange alien fitness equipment.", 2),
-            ("medical_bay", "The ship's medical facility with advanced alien medical equipment.", 2),
-            ("laboratory_1", "A scientific laboratory with specimens in alien containers.", 2),
-            ("laboratory_2", "Another lab focused on materials science.", 2),
-            ("corridor_2a", "A main corridor running the length of level 2.", 2),
-            ("corridor_2b", "Another corridor with viewports showing the desolate planet below.", 2),
-            ("emergency_stairwell_2", "Emergency stairwell connecting levels 1 and 3.", 2),
-            
-            # Level 3 - Operations
-            ("navigation_room", "The ship's navigation center with star charts and alien computers.", 3),
-            ("communications", "Communications array with long-range transmitters.", 3),
-            ("security_office", "Security station with monitors showing various ship areas.", 3),
-            ("armory", "Weapons storage with alien armaments secured behind energy barriers.", 3),
-            ("workshop", "Engineering workshop with alien tools and partially assembled devices.", 3),
-            ("computer_core", "The ship's main computer systems room, humming with activity.", 3),
-            ("hydroponics", "Alien plant cultivation facility with strange, wilted vegetation.", 3),
-            ("observation_deck", "A deck with large windows overlooking the planet surface.", 3),
-            ("conference_room", "A meeting room with a large holographic display table.", 3),
-            ("corridor_3a", "Main corridor of the operations level.", 3),
-            ("corridor_3b", "Secondary corridor with access to specialized rooms.", 3),
-            ("emergency_stairwell_3", "Stairwell providing access to the bridge level.", 3),
-            ("maintenance_shaft_2", "Another maintenance area with complex alien systems.", 3),
-            
-            # Level 4 - Command
-            ("bridge", "The ship's command center with the captain's chair and main controls.", 4),
-            ("captain_quarters", "Luxurious captain's quarters with alien artifacts and a personal safe.", 4),
-            ("ready_room", "The captain's private meeting room adjacent to the bridge.", 4),
-            ("tactical_center", "Advanced tactical systems and weapons control.", 4),
-            ("sensor_array", "Long-range sensor control room with displays of nearby space.", 4),
-            ("escape_pod_bay_1", "Primary escape pod bay. Several pods are missing, but one remains.", 4),
-            ("escape_pod_bay_2", "Secondary escape pod bay. All pods appear to be gone.", 4),
-            ("commander_quarters", "First officer's quarters.", 4),
-            ("vip_quarters", "Guest quarters for important visitors.", 4),
-            ("bridge_corridor", "Corridor leading to various command level rooms.", 4),
-            
-            # Level 5 - Upper Systems
-            ("engine_room_upper", "Upper section of the engine room with main reactor controls.", 5),
-            ("shield_generator", "Ship's defensive shield generation systems.", 5),
-            ("power_core", "The ship's main power generation facility.", 5),
-            ("environmental_control", "Life support and environmental systems control.", 5),
-            ("maintenance_shaft_3", "Upper maintenance areas with access to ship's exterior systems.", 5),
-            ("emergency_systems", "Emergency power and backup systems.", 5),
-            ("upper_corridor", "The highest accessible corridor on the ship.", 5),
-        ]
-        
-        for name, desc, level in rooms_data:
-            self.rooms[name] = Room(name, desc, level)
-
-    def setup_connections(self):
-        """Set up connections between rooms"""
-        connections = [
-            # Level 1 connections
-            ("docking_bay", {"north": "cargo_hold_1", "east": "maintenance_shaft_1", "up": "emergency_stairwell_1"}),
-            ("cargo_hold_1", {"south": "docking_bay", "north": "cargo_hold_2", "east": "storage_room_1"}),
-            ("cargo_hold_2", {"south": "cargo_hold_1", "east": "storage_room_2", "north": "engine_room_lower"}),
-            ("maintenance_shaft_1", {"west": "docking_bay", "north": "power_distribution_1", "up": "maintenance_shaft_2"}),
-            ("storage_room_1", {"west": "cargo_hold_1", "north": "storage_room_2"}),
-            ("storage_room_2", {"south": "storage_room_1", "west": "cargo_hold_2", "north": "waste_processing"}),
-            ("engine_room_lower", {"south": "cargo_hold_2", "east": "water_recycling", "up": "engine_room_upper"}),
-            ("waste_processing", {"south": "storage_room_2", "east": "water_recycling"}),
-            ("water_recycling", {"west": "waste_processing", "south": "engine_room_lower"}),
-            ("emergency_stairwell_1", {"down": "docking_bay", "up": "emergency_stairwell_2"}),
-            ("airlock_1", {"north": "power_distribution_1"}),
-            ("power_distribution_1", {"south": "airlock_1", "west": "maintenance_shaft_1"}),
-            
-            # Level 2 connections
-            ("emergency_stairwell_2", {"down": "emergency_stairwell_1", "up": "emergency_stairwell_3", "north": "corridor_2a"}),
-            ("corridor_2a", {"south": "emergency_stairwell_2", "north": "crew_mess_hall", "east": "crew_quarters_1", "west": "corridor_2b"}),
-            ("corridor_2b", {"east": "corridor_2a", "north": "recreation_room", "south": "medical_bay"}),
-            ("crew_quarters_1", {"west": "corridor_2a", "north": "crew_quarters_2"}),
-            ("crew_quarters_2", {"south": "crew_quarters_1", "north": "crew_quarters_3"}),
-            ("crew_quarters_3", {"south": "crew_quarters_2", "west": "crew_quarters_4"}),
-            ("crew_quarters_4", {"east": "crew_quarters_3", "south": "crew_mess_hall"}),
-            ("crew_mess_hall", {"north": "crew_quarters_4", "south": "corridor_2a", "east": "gymnasium"}),
-            ("recreation_room", {"south": "corridor_2b", "east": "laboratory_1"}),
-            ("gymnasium", {"west": "crew_mess_hall", "north": "laboratory_2"}),
-            ("medical_bay", {"north": "corridor_2b", "east": "laboratory_1"}),
-            ("laboratory_1", {"west": "medical_bay", "north": "recreation_room", "east": "laboratory_2"}),
-            ("laboratory_2", {"west": "laboratory_1", "south": "gymnasium"}),
-            
-            # Level 3 connections
-            ("emergency_stairwell_3", {"down": "emergency_stairwell_2", "up": "bridge_corridor", "east": "corridor_3a"}),
-            ("corridor_3a", {"west": "emergency_stairwell_3", "north": "navigation_room", "east": "corridor_3b", "south": "computer_core"}),
-            ("corridor_3b", {"west": "corridor_3a", "north": "communications", "south": "workshop"}),
-            ("navigation_room", {"south": "corridor_3a", "east": "communications", "west": "security_office"}),
-            ("communications", {"west": "navigation_room", "south": "corridor_3b", "east": "observation_deck"}),
-            ("security_office", {"east": "navigation_room", "south": "armory"}),
-            ("armory", {"north": "security_office", "east": "computer_core"}),
-            ("computer_core", {"north": "corridor_3a", "west": "armory", "east": "workshop"}),
-            ("workshop", {"west": "computer_core", "north": "corridor_3b", "east": "hydroponics"}),
-            ("hydroponics", {"west": "workshop", "north": "observation_deck", "east": "conference_room"}),
-            ("observation_deck", {"south": "hydroponics", "west": "communications"}),
-            ("conference_room", {"west": "hydroponics"}),
-            ("maintenance_shaft_2", {"down": "maintenance_shaft_1", "up": "maintenance_shaft_3"}),
-            
-            # Level 4 connections
-            ("bridge_corridor", {"down": "emergency_stairwell_3", "north": "bridge", "east": "captain_quarters", "south": "escape_pod_bay_1"}),
-            ("bridge", {"south": "bridge_corridor", "east": "ready_room", "west": "tactical_center"}),
-            ("ready_room", {"west": "bridge", "south": "captain_quarters"}),
-            ("captain_quarters", {"north": "ready_room", "west": "bridge_corridor", "south": "commander_quarters"}),
-            ("tactical_center", {"east": "bridge", "south": "sensor_array"}),
-            ("sensor_array", {"north": "tactical_center", "east": "escape_pod_bay_2"}),
-            ("escape_pod_bay_1", {"north": "bridge_corridor", "east": "escape_pod_bay_2", "south": "vip_quarters"}),
-            ("escape_pod_bay_2", {"west": "escape_pod_bay_1", "north": "sensor_array"}),
-            ("commander_quarters", {"north": "captain_quarters", "south": "vip_quarters"}),
-            ("vip_quarters", {"north": "commander_quarters", "west": "escape_pod_bay_1"}),
-            
-            # Level 5 connections
-            ("engine_room_upper", {"down": "engine_room_lower", "north": "power_core", "east": "shield_generator"}),
-            ("power_core", {"south": "engine_room_upper", "east": "environmental_control"}),
-            ("shield_generator", {"west": "engine_room_upper", "north": "environmental_control"}),
-            ("environmental_control", {"south": "shield_generator", "west": "power_core", "north": "upper_corridor"}),
-            ("upper_corridor", {"south": "environmental_control", "east": "emergency_systems", "west": "maintenance_shaft_3"}),
-            ("emergency_systems", {"west": "upper_corridor"}),
-            ("maintenance_shaft_3", {"down": "maintenance_shaft_2", "east": "upper_corridor"}),
-        ]
-        
-        for room_name, exits in connections:
-            if room_name in self.rooms:
-                self.rooms[room_name].exits = exits
-
-    def place_items(self):
-        """Place items throughout the ship and set up locked rooms"""
-        item_placements = [
-            ("security_keycard", "security_office"),
-            ("plasma_torch", "workshop"),
-            ("oxygen_canister", "emergency_systems"),
-            ("alien_crystal", "power_core"),
-            ("maintenance_tool", "maintenance_shaft_1"),
-            ("data_pad", "navigation_room"),
-            ("energy_cell", "power_distribution_1"),
-            ("neural_interface", "laboratory_1"),
-            ("gravity_boots", "maintenance_shaft_3"),
-            ("translation_device", "communications"),
-            ("emergency_beacon", "escape_pod_bay_2"),
-            ("alien_weapon", "armory"),
-            ("medical_kit", "medical_bay"),
-            ("ship_schematic", "computer_core"),
-            ("command_codes", "captain_quarters"),
-        ]
-        
-        for item_name, room_name in item_placements:
-            if item_name in self.items and room_name in self.rooms:
-                self.rooms[room_name].items.append(self.items[item_name])
-        
-        # Set up locked rooms and their requirements
-        locked_rooms = [
-            ("armory", "security_keycard", "The armory is sealed with a magnetic lock requiring a security keycard."),
-            ("captain_quarters", "command_codes", "The captain's quarters require command authorization codes."),
-            ("power_core", "maintenance_tool", "The power core is protected by a maintenance panel that needs special tools."),
-            ("escape_pod_bay_1", "energy_cell", "The escape pod bay needs power to unlock the launch sequence."),
-        ]
-        
-        for room_name, required_item, lock_desc in locked_rooms:
-            if room_name in self.rooms:
-                self.rooms[room_name].locked = True
-                self.rooms[room_name].required_item = required_item
-                self.rooms[room_name].lock_description = lock_desc
+        self.items_dropped = 0
+        # Bumped whenever locks open or items appear, so cached plans can be dropped
+        self.revision = 0
+        self.solver = None
+        self.router = None
+        self.parser = DEFAULT_PARSER
+        self.commands = COMMANDS
+        # Optional recorder notified of every parsed command and random event
+        self.journal = None
+        # True while a command runs, so random events inside it can be told apart
+        self.in_command = False
+        # Optional tracker notified of moves and items appearing in rooms
+        self.reachability = None
+        # One lock per room ID when several players share the rooms
+        self.room_locks = None
+        # IDs of the rooms this player has seen, when shared rooms' own
+        # visited flags would mix up the players
+        self.visited = None
+        # The Crew sharing these rooms, told about every lock opened
+        self.crew = None
+
+        # The stock ship is shared by every game in the process; each game
+        # only forks the rooms it touches, like generated and cached ships
+        if ship is None:
+            ship = shared_world()
+        self.player.current_room = ship.attach(self)
+        self.item_index = ItemIndex.for_names(tuple(self.items))
+
+    @property
+    def rng(self) -> random.Random:
+        # Seeded on first use: the generator's state is most of a fresh game's memory
+        if self._rng is None:
+            self._rng = random.Random(self.seed)
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng: random.Random):
+        self._rng = rng
+
+    def fork(self) -> "AlienStarshipGame":
+        """Clone the game mid-play
+
+        The world, item definitions and each room's description and exits
+        are shared with the original; only touched rooms' items and flags,
+        the player and the RNG state are copied. The clone renders nothing
+        and records no journal until it is given its own.
+        """
+        clone = object.__new__(AlienStarshipGame)
+        clone.__dict__.update(self.__dict__)
+        if self._rng is not None:
+            # Skip seeding; the full state is overwritten right away
+            clone._rng = random.Random.__new__(random.Random)
+            clone._rng.setstate(self._rng.getstate())
+        clone.rooms = self.rooms.fork()
+        clone.room_list = clone.rooms.by_id
+        clone.player = self.player.fork(clone.room_list[self.player.current_room.id])
+        if self.visited is not None:
+            clone.visited = set(self.visited)
+        # Verbs registered on either game afterwards must not leak to the other
+        if self.commands is not COMMANDS:
+            clone.commands = dict(self.commands)
+        if self.parser is not DEFAULT_PARSER:
+            clone.parser = self.parser.copy()
+        clone.renderer = NullRenderer()
+        clone.solver = None
+        clone.router = None
+        clone.journal = None
+        clone.reachability = None
+        clone.crew = None
+        return clone
+
+    def snapshot(self) -> bytes:
+        """Serialize the mutable game state to the binary snapshot format"""
+        return write_snapshot(self)
+
+    def restore(self, data: bytes):
+        """Replace the mutable game state with a snapshot taken from the same ship"""
+        restore_snapshot(self, data)
+        self.router = None
+        if self.reachability is not None:
+            self.reachability.rebuild()
+
+    def restart(self, seed: int):
+        """Start over on the same ship with a new seed, keeping renderer and hooks
+
+        Cheaper than building a new game, for drivers playing many seeds.
+        """
+        self.seed = seed
+        self._rng = None
+        self.rooms.reset()
+        self.player.inventory.clear()
+        self.player.current_room = self.room_list[self.world.start_room]
+        if self.visited is not None:
+            self.visited.clear()
+        self.game_over = False
+        self.victory = False
+        self.escape_pods_found = 0
+        self.items_dropped = 0
+        self.revision += 1
+        self.solver = None
+        self.router = None
+        if self.reachability is not None:
+            self.reachability.rebuild()
+
+    def room_lock(self, room: Room):
+        """The lock guarding a room's items and lock state, if rooms are shared"""
+        if self.room_locks is None:
+            return _NO_LOCK
+        return self.room_locks[room.id]
+
+    def output(self, text: str, kind: str = "message"):
+        """Report a tagged message to the renderer"""
+        if _metrics is not None:
+            _metrics.messages[kind] += 1
+        self.renderer.message(text, kind)
 
     def display_room(self):
         """Display current room information
 
-        Prints a full description the first time a room is visited and a
+        Renders a full description the first time a room is visited and a
         shorter reminder on subsequent visits.
         """
         room = self.player.current_room
-        print(f"\n=== {room.name.replace('_', ' ').title()} (Level {room.level}) ===")
-
-        if room.visited:
-            print(f"You are back in the {room.name.replace('_', ' ')}.")
-        else:
-            print(room.description)
+        if self.visited is None:
+            first_visit = not room.visited
             room.visited = True
-        
-        if room.items:
-            print(f"\nItems here: {', '.join([item.name.replace('_', ' ').title() for item in room.items])}")
-        
-        exits = list(room.exits.keys())
-        if exits:
-            print(f"Exits: {', '.join(exits)}")
-        
-        if room.locked and room.required_item:
-            print(f"\n{room.lock_description}")
+        else:
+            first_visit = room.id not in self.visited
+            self.visited.add(room.id)
+        with self.room_lock(room):
+            self.renderer.room(room, first_visit)
 
     def move_player(self, direction: str) -> bool:
         """Move player to adjacent room"""
         current_room = self.player.current_room
+        direction_index = DIRECTION_INDEX.get(direction)
+        if direction_index is None:
+            next_room_id = NO_EXIT
+        else:
+            next_room_id = self.world.exits[current_room.id * DIRECTION_COUNT + direction_index]
         
-        if direction not in current_room.exits:
-            print("You can't go that way.")
+        if next_room_id == NO_EXIT:
+            self.output("You can't go that way.", "no_exit")
             return False
         
-        next_room_name = current_room.exits[direction]
-        next_room = self.rooms.get(next_room_name)
-        
-        if not next_room:
-            print("There's nowhere to go in that direction.")
+        if next_room_id == DANGLING_EXIT:
+            self.output("There's nowhere to go in that direction.", "no_exit")
             return False
         
-        if next_room.locked:
-            if not next_room.required_item or not self.player.has_item(next_room.required_item):
-                print(f"The way is blocked. {next_room.lock_description}")
-                return False
-            else:
-                print(f"You use the {next_room.required_item.replace('_', ' ')} to unlock the way forward.")
-                next_room.locked = False
+        next_room = self.room_list[next_room_id]
+        
+        with self.room_lock(next_room):
+            if next_room.locked:
+                if not next_room.required_item or not self.player.has_item(next_room.required_item):
+                    self.output(f"The way is blocked. {next_room.lock_description}", "blocked")
+                    return False
+                else:
+                    self.output(f"You use the {spoken_name(next_room.required_item)} to unlock the way forward.", "unlock")
+                    next_room.locked = False
+                    self.revision += 1
+                    if self.crew is not None:
+                        self.crew.unlocked(next_room_id)
+                    elif self.router is not None:
+                        self.router.unlocked(next_room_id)
         
         self.player.current_room = next_room
+        if self.reachability is not None:
+            self.reachability.moved(current_room.id, next_room_id)
         return True
 
+    def path_to(self, room_name: str) -> Optional[list]:
+        """Directions of the shortest open route to a room, or None if it is out of reach
+
+        Locked rooms count as open when the player carries their key.
+        """
+        room_id = self.world.room_ids.get(room_name)
+        if room_id is None:
+            return None
+        if self.router is None:
+            self.router = Router(self)
+        if self.crew is not None:
+            self.crew.update_router(self)
+        source = self.player.current_room.id
+        rooms = self.router.path(source, room_id)
+        if rooms is None:
+            return None
+        return [DIRECTIONS[d] for d in self.router.directions(source, rooms)]
+
+    def travel_to(self, room_name: str) -> bool:
+        """Walk the shortest route to a room, one move per turn
+
+        A random event fires before every move after the first, as when
+        moving by hand. Stops early if a move fails, e.g. because a hazard
+        made the player drop a key. Returns True on arrival.
+        """
+        route = self.path_to(room_name)
+        if route is None:
+            return False
+        for step, direction in enumerate(route):
+            if step:
+                self.trigger_random_event()
+            if not self.move_player(direction):
+                return False
+        return True
+
+    def choose_item(self, phrase: str, missing: str, *bags: ItemBag) -> Optional[str]:
+        """Resolve a typed item phrase to the name of an item held by one of the bags
+
+        Reports a missing item (``missing`` is formatted with the phrase) or
+        asks which item was meant when the phrase is ambiguous, and returns
+        None in both cases.
+        """
+        matches = self.item_index.resolve(phrase, bags)
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            options = " or ".join(spoken_name(name) for name in matches)
+            self.output(f"Which do you mean: {options}?", "ambiguous")
+        else:
+            self.output(missing.format(" ".join(phrase.lower().replace('_', ' ').split())), "missing_item")
+        return None
+
     def take_item(self, item_name: str):
         """Take an item from the current room"""
+        self._take(item_name, False)
+
+    def _take_resolved(self, item_name: str):
+        """take_item for an exact catalog name, skipping phrase resolution"""
+        self._take(item_name, True)
+
+    def _take(self, item_name: str, resolved: bool):
         room = self.player.current_room
-        item_name = item_name.lower().replace(' ', '_')
-        
-        for item in room.items:
-            if item.name.lower() == item_name:
-                if self.player.add_item(item):
-                    room.items.remove(item)
-                    print(f"You take the {item.name.replace('_', ' ')}.")
-                    
-                    # Check for escape pod
-                    if room.name in ["escape_pod_bay_1", "escape_pod_bay_2"] and item.name == "emergency_beacon":
-                        self.escape_pods_found += 1
-                        print("\n*** You've found a working escape pod! ***")
-                        if self.escape_pods_found >= self.required_escape_pods:
-                            self.victory = True
-                            print("You can now escape the alien starship!")
-                else:
-                    print("Your inventory is full!")
+        # Choosing and removing happen under one lock, so of two players
+        # reaching for the last unit exactly one gets it
+        with self.room_lock(room):
+            if not resolved:
+                item_name = self.choose_item(item_name, "There's no {} here.", room.items)
+                if item_name is None:
+                    return
+            elif item_name not in room.items:
+                self.output(f"There's no {spoken_name(item_name)} here.", "missing_item")
+                return
+            item = room.items.get(item_name)
+            
+            if not self.player.add_item(item):
+                self.output("Your inventory is full!", "inventory_full")
                 return
+            
+            room.items.remove(item_name)
+        self.output(f"You take the {spoken_name(item.name)}.", "take")
         
-        print(f"There's no {item_name.replace('_', ' ')} here.")
+        # Check for escape pod
+        if room.name.startswith("escape_pod_bay") and item.name == "emergency_beacon":
+            self.escape_pods_found += 1
+            self.output("\n*** You've found a working escape pod! ***", "escape_pod")
+            if self.escape_pods_found >= self.required_escape_pods:
+                self.victory = True
+                self.output("You can now escape the alien starship!", "escape_pod")
+        if self.reachability is not None:
+            self.reachability.item_taken(room.id, item)
 
     def use_item(self, item_name: str):
         """Use an item from inventory"""
-        item_name = item_name.lower().replace(' ', '_')
-        item = self.player.get_item(item_name)
-        
-        if not item:
-            print(f"You don't have a {item_name.replace('_', ' ')}.")
+        item_name = self.choose_item(item_name, "You don't have a {}.", self.player.inventory)
+        if item_name is None:
             return
+        item = self.player.inventory.get(item_name)
         
         if not item.usable:
-            print(f"You can't use the {item.name.replace('_', ' ')} here.")
+            self.output(f"You can't use the {spoken_name(item.name)} here.", "use_failed")
             return
         
         room = self.player.current_room
         
         # Special use cases
-        if item.name == "plasma_torch" and room.name == "docking_bay":
-            print("You use the plasma torch to cut through some debris, revealing a hidden compartment!")
-            if "hidden_keycard" not in [i.name for i in room.items]:
-                room.items.append(Item("hidden_keycard", "A backup security keycard", True))
+        # Rewards only exist on ships whose catalog defines them
+        if item.name == "plasma_torch" and room.name == "docking_bay" and "hidden_keycard" in self.items:
+            self.output("You use the plasma torch to cut through some debris, revealing a hidden compartment!", "use")
+            with self.room_lock(room):
+                revealed = "hidden_keycard" not in room.items
+                if revealed:
+                    room.items.add(self.items["hidden_keycard"])
+            if revealed and self.reachability is not None:
+                self.reachability.item_placed(room.id, self.items["hidden_keycard"])
         
         elif item.name == "translation_device":
-            print("The translation device reveals the meaning of alien symbols around you.")
-            print("You learn more about the ship's layout and purpose.")
+            self.output("The translation device reveals the meaning of alien symbols around you.", "use")
+            self.output("You learn more about the ship's layout and purpose.", "use")
         
-        elif item.name == "neural_interface" and room.name == "computer_core":
-            print("You interface with the alien computer system!")
-            print("You download critical ship schematics and escape pod locations.")
+        elif (item.name == "neural_interface" and room.name == "computer_core"
+              and "ship_schematic" in self.items):
+            self.output("You interface with the alien computer system!", "use")
+            self.output("You download critical ship schematics and escape pod locations.", "use")
             if not self.player.has_item("ship_schematic"):
                 self.player.add_item(self.items["ship_schematic"])
+                if self.reachability is not None:
+                    self.reachability.item_taken(room.id, self.items["ship_schematic"])
         
         else:
-            print(f"You use the {item.name.replace('_', ' ')}, but nothing happens here.")
+            self.output(f"You use the {spoken_name(item.name)}, but nothing happens here.", "use")
 
     def examine_item(self, item_name: str):
         """Examine an item either in the room or inventory"""
-        item_name = item_name.lower().replace(' ', '_')
         room = self.player.current_room
-
-        for item in room.items:
-            if item.name.lower() == item_name:
-                print(f"{item.name.replace('_', ' ').title()}: {item.description}")
+        with self.room_lock(room):
+            item_name = self.choose_item(item_name, "There is no {} here or in your inventory.",
+                                         room.items, self.player.inventory)
+            if item_name is None:
                 return
-
-        for item in self.player.inventory:
-            if item.name.lower() == item_name:
-                print(f"{item.name.replace('_', ' ').title()}: {item.description}")
-                return
-
-        print(f"There is no {item_name.replace('_', ' ')} here or in your inventory.")
+            item = room.items.get(item_name) or self.player.inventory.get(item_name)
+        self.output(f"{title_name(item.name)}: {item.description}", "examine")
 
     def show_inventory(self):
         """Display player inventory"""
-        if not self.player.inventory:
-            print("Your inventory is empty.")
+        self.renderer.inventory(self.player.inventory)
+
+    def show_hint(self):
+        """Suggest the next step of the shortest winning plan"""
+        if self.solver is None:
+            self.solver = Solver(self)
+        command = self.solver.next_command()
+        if command is None:
+            self.output("The ship's computer finds no way off this ship from here.", "hint")
         else:
-            print("Inventory:")
-            for item in self.player.inventory:
-                print(f"  - {item.name.replace('_', ' ').title()}: {item.description}")
+            self.output(f"Hint: try '{spoken_name(command)}'.", "hint")
 
     def show_help(self):
         """Display help information"""
-        print("""
+        self.output("""
 Available commands:
   go <direction> - Move in a direction (north, south, east, west, up, down)
+  goto <room> - Walk the shortest known route to a room
   take <item> - Pick up an item
   use <item> - Use an item from your inventory
   examine <item> - Inspect an item in the room or your inventory
   inventory - Show your inventory
   look - Look around the current room
+  hint - Suggest the next step towards an escape pod
   help - Show this help message
   quit - Exit the game
   
 Objective: Explore the abandoned alien starship and find escape pods to get off the ship.
 Collect items to solve puzzles and unlock new areas.
-        """)
+        """, "help")
 
     def trigger_random_event(self):
         """Occasionally trigger a small random event."""
-        roll = random.random()
+        metrics = _metrics
+        start = 0
+        if metrics is not None:
+            metrics.roll_calls += 1
+            if not metrics.roll_calls & metrics.mask:
+                start = perf_counter_ns()
+        roll = self.rng.random()
+        draws = [roll]
         room = self.player.current_room
 
-        # 5% chance to discover an additional item
+        # 5% chance to discover an additional item, if the ship's catalog has any
         if roll < 0.05:
-            bonus_items = ["energy_cell", "oxygen_canister", "medical_kit", "alien_crystal"]
-            item_name = random.choice(bonus_items)
-            item = self.items[item_name]
-            room.items.append(item)
-            print(f"\n*** You discover a hidden {item.name.replace('_', ' ')}! ***")
+            bonus_items = [name for name in BONUS_ITEMS if name in self.items]
+            if bonus_items:
+                item_name = self.rng.choice(bonus_items)
+                draws.append(item_name)
+                item = self.items[item_name]
+                with self.room_lock(room):
+                    room.items.add(item)
+                self.revision += 1
+                if self.reachability is not None:
+                    self.reachability.item_placed(room.id, item)
+                self.output(f"\n*** You discover a hidden {spoken_name(item.name)}! ***", "event_discovery")
 
         # Another 5% chance for a minor hazard
         elif roll < 0.10:
-            print("\n*** A sudden burst of cold air startles you. You manage to stay safe. ***")
-            if self.player.inventory and random.random() < 0.5:
-                dropped = random.choice(self.player.inventory)
-                self.player.inventory.remove(dropped)
-                room.items.append(dropped)
-                print(f"You fumble and drop your {dropped.name.replace('_', ' ')}!")
+            self.output("\n*** A sudden burst of cold air startles you. You manage to stay safe. ***", "event_hazard")
+            if self.player.inventory:
+                fumble = self.rng.random()
+                draws.append(fumble)
+                if fumble < 0.5:
+                    dropped = self.rng.choice(list(self.player.inventory))
+                    draws.append(dropped.name)
+                    self.player.inventory.remove(dropped.name.lower())
+                    with self.room_lock(room):
+                        room.items.add(dropped)
+                    self.items_dropped += 1
+                    self.revision += 1
+                    if self.reachability is not None:
+                        self.reachability.item_placed(room.id, dropped)
+                    self.output(f"You fumble and drop your {spoken_name(dropped.name)}!", "item_dropped")
+
+        if self.journal is not None:
+            self.journal.event(draws)
+        if start:
+            metrics.end_roll(start)
+
+    def show_victory(self):
+        """Display the closing victory banner"""
+        self.output("\n" + "="*50, "victory")
+        self.output("🚀 CONGRATULATIONS! 🚀", "victory")
+        self.output("You successfully found an escape pod and escaped the alien starship!", "victory")
+        self.output("The mysterious vessel continues its orbit around the desolate planet,", "victory")
+        self.output("its secrets partially revealed but many mysteries still remaining...", "victory")
+        self.output("="*50, "victory")
+
+    def handle_command(self, command: str):
+        """Execute a single command line against the game"""
+        self.execute(self.parser.parse(command))
+
+    def execute(self, parsed: Command):
+        """Execute an already parsed command, with metrics and journaling"""
+        metrics = _metrics
+        start = 0
+        if metrics is not None:
+            metrics.command_calls += 1
+            metrics.verb_calls[parsed.verb] += 1
+            if not metrics.command_calls & metrics.mask:
+                start = perf_counter_ns()
+        self.in_command = True
+        try:
+            if parsed.verb is None:
+                if parsed.args:
+                    self.output("I don't understand that command. Type 'help' for available commands.", "unknown_command")
+                return
+            self.commands[parsed.verb](self, parsed)
+        finally:
+            self.in_command = False
+            if start:
+                metrics.end_command(parsed.verb, start)
+            # Recorded once it has run, so checkpoints see its effects; a
+            # command that raises is still journaled for bug reports
+            if self.journal is not None:
+                self.journal.command(parsed)
+
+    def register_command(self, verb: str, handler: Callable[["AlienStarshipGame", Command], None],
+                         aliases: Tuple[str, ...] = ()):
+        """Add a verb for this game only; handler receives (game, command)"""
+        if self.commands is COMMANDS:
+            self.commands = dict(COMMANDS)
+            self.parser = self.parser.copy()
+        self.commands[verb] = handler
+        self.parser.register(verb, aliases)
+
+    def _cmd_quit(self, command: Command):
+        self.output("Thanks for playing!", "quit")
+        self.game_over = True
+
+    def _cmd_go(self, command: Command):
+        if not command.args:
+            self.output("Go where? (north, south, east, west, up, down)", "prompt")
+        elif self.move_player(command.args[0]):
+            self.display_room()
+
+    def _cmd_goto(self, command: Command):
+        if not command.args:
+            self.output("Go to which room?", "prompt")
+            return
+        room_name = "_".join(command.args)
+        if room_name not in self.world.room_ids:
+            self.output(f"There's no {spoken_name(room_name)} on this ship.", "unknown_room")
+            return
+        if room_name == self.player.current_room.name:
+            self.output(f"You are already in the {spoken_name(room_name)}.", "travel")
+            return
+        route = self.path_to(room_name)
+        if route is None:
+            self.output(f"You don't know a way to the {spoken_name(room_name)} from here.", "no_route")
+            return
+        moves = "1 move" if len(route) == 1 else f"{len(route)} moves"
+        self.output(f"You head for the {spoken_name(room_name)} ({moves}).", "travel")
+        self.travel_to(room_name)
+        self.display_room()
+
+    def _cmd_take(self, command: Command):
+        if not command.args:
+            self.output("Take what?", "prompt")
+        else:
+            self.take_item(command.object)
+
+    def _cmd_use(self, command: Command):
+        if not command.args:
+            self.output("Use what?", "prompt")
+        else:
+            self.use_item(command.object)
+
+    def _cmd_examine(self, command: Command):
+        if not command.args:
+            self.output("Examine what?", "prompt")
+        else:
+            self.examine_item(command.object)
 
     def game_loop(self):
         """Main game loop"""
-        print("=== ALIEN STARSHIP ADVENTURE ===")
-        print("You dock with an abandoned alien starship orbiting a desolate planet.")
-        print("Your mission: explore the ship, collect items, and find escape pods to get off alive!")
-        print("Type 'help' for commands.\n")
+        self.output("=== ALIEN STARSHIP ADVENTURE ===", "banner")
+        self.output("You dock with an abandoned alien starship orbiting a desolate planet.", "banner")
+        self.output("Your mission: explore the ship, collect items, and find escape pods to get off alive!", "banner")
+        self.output("Type 'help' for commands.\n", "banner")
         
         self.display_room()
         
         while not self.game_over and not self.victory:
             self.trigger_random_event()
             try:
-                command = input("\n> ").strip().lower()
-                
-                if not command:
-                    continue
-                
-                parts = command.split()
-                action = parts[0]
-                
-                if action in ["quit", "exit"]:
-                    print("Thanks for playing!")
-                    self.game_over = True
-                
-                elif action in ["help", "?"]:
-                    self.show_help()
-                
-                elif action in ["look", "l"]:
-                    self.display_room()
-                
-                elif action in ["inventory", "inv", "i"]:
-                    self.show_inventory()
-                
-                elif action in ["go", "move", "walk"]:
-                    if len(parts) < 2:
-                        print("Go where? (north, south, east, west, up, down)")
-                    else:
-                        direction = parts[1]
-                        if self.move_player(direction):
-                            self.display_room()
-                
-                elif action in ["take", "get", "pick"]:
-                    if len(parts) < 2:
-                        print("Take what?")
-                    else:
-                        item_name = " ".join(parts[1:])
-                        self.take_item(item_name)
-                
-                elif action in ["use"]:
-                    if len(parts) < 2:
-                        print("Use what?")
-                    else:
-                        item_name = " ".join(parts[1:])
-                        self.use_item(item_name)
-
-                elif action in ["examine", "inspect", "x"]:
-                    if len(parts) < 2:
-                        print("Examine what?")
-                    else:
-                        item_name = " ".join(parts[1:])
-                        self.examine_item(item_name)
-
-                # Allow movement without "go"
-                elif action in ["north", "south", "east", "west", "up", "down", "n", "s", "e", "w", "u", "d"]:
-                    direction_map = {"n": "north", "s": "south", "e": "east", "w": "west", "u": "up", "d": "down"}
-                    direction = direction_map.get(action, action)
-                    if self.move_player(direction):
-                        self.display_room()
-                
-                else:
-                    print("I don't understand that command. Type 'help' for available commands.")
-                
+                self.renderer.flush()
+                self.handle_command(input("\n> "))
             except KeyboardInterrupt:
-                print("\n\nThanks for playing!")
+                self.output("\n\nThanks for playing!", "quit")
                 self.game_over = True
             except EOFError:
-                print("\n\nThanks for playing!")
+                self.output("\n\nThanks for playing!", "quit")
                 self.game_over = True
         
         if self.victory:
-            print("\n" + "="*50)
-            print("🚀 CONGRATULATIONS! 🚀")
-            print("You successfully found an escape pod and escaped the alien starship!")
-            print("The mysterious vessel continues its orbit around the desolate planet,")
-            print("its secrets partially revealed but many mysteries still remaining...")
-            print("="*50)
+            self.show_victory()
+        self.renderer.flush()
+
+# Verb -> handler(game, command); games copy this table before adding verbs
+COMMANDS = {
+    "quit": AlienStarshipGame._cmd_quit,
+    "help": lambda game, command: game.show_help(),
+    "hint": lambda game, command: game.show_hint(),
+    "look": lambda game, command: game.display_room(),
+    "inventory": lambda game, command: game.show_inventory(),
+    "go": AlienStarshipGame._cmd_go,
+    "goto": AlienStarshipGame._cmd_goto,
+    "take": AlienStarshipGame._cmd_take,
+    "use": AlienStarshipGame._cmd_use,
+    "examine": AlienStarshipGame._cmd_examine,
+}
 
 def main():
     """Main function to start the game"""
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for Alien Starship Adventure.
+Microbenchmarks time each command handler and world construction,
+macrobenchmarks time complete seeded playthroughs on the stock ship and on
+generated ships, memory benchmarks measure what one game instance
+allocates, and the opt-in server suite measures command latency with
+10,000 players connected. Results are written as JSON and can be compared
+against a stored baseline; every metric is lower-is-better.
+
+    python starship_bench.py --output baseline.json
+    python starship_bench.py --compare baseline.json --threshold 0.25
+    python starship_bench.py --suite server
+"""
+
+from typing import Callable, List, Optional
+import argparse
+import asyncio
+import gc
+import json
+import multiprocessing
+import platform
+import random
+import socket
+import sys
+import time
+import tracemalloc
+
+from alien_starship_adventure import AlienStarshipGame
+from starship_generator import ProceduralShip
+from starship_multiplayer import stress, stress_processes
+from starship_render import NullRenderer
+from starship_script import CompiledScript, _stdin_run
+from starship_server import PROMPT
+from starship_sim import explorer_policy, run_playthrough
+from starship_solver import solve
+
+SCHEMA = 1
+
+# (label, levels, width, height) of the generated ships used for scaling runs
+SYNTHETIC_SHIPS = [
+    ("small", 5, 16, 16),
+    ("large", 5, 64, 64),
+]
+
+
+class BenchmarkResult(dict):
+    """One metric: ``value`` in ``unit`` (seconds per op or bytes)"""
+
+    def __init__(self, name: str, kind: str, value: float, unit: str, **extra):
+        super().__init__(name=name, kind=kind, value=value, unit=unit, **extra)
+
+
+def _best(run: Callable[[], float], repeat: int) -> float:
+    """Smallest of several timings, with the collector off as timeit does"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return min(run() for _ in range(repeat))
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def time_call(call: Callable[[], object], number: int, repeat: int = 5) -> float:
+    """Seconds per call of a side-effect free callable"""
+    def run():
+        start = time.perf_counter()
+        for _ in range(number):
+            call()
+        return (time.perf_counter() - start) / number
+    return _best(run, repeat)
+
+
+def time_on_forks(game: AlienStarshipGame, action: Callable[[AlienStarshipGame], object],
+                  number: int, repeat: int = 5) -> float:
+    """Seconds per call of a state-changing action, each call on a fresh fork"""
+    def run():
+        games = [game.fork() for _ in range(number)]
+        start = time.perf_counter()
+        for copy in games:
+            action(copy)
+        return (time.perf_counter() - start) / number
+    return _best(run, repeat)
+
+
+def _stock_game() -> AlienStarshipGame:
+    return AlienStarshipGame(seed=1, renderer=NullRenderer())
+
+
+def _game_before(verb: str):
+    """A stock game following the winning plan up to its first ``verb`` command, and that command"""
+    game = _stock_game()
+    for command in solve(_stock_game()):
+        if command.split()[0] == verb:
+            return game, command
+        game.handle_command(command)
+    raise ValueError(f"The winning plan never uses {verb!r}")
+
+
+def micro_benchmarks(scale: float = 1.0) -> List[BenchmarkResult]:
+    """Per-call timings of command handlers and world construction"""
+    n = max(10, int(2000 * scale))
+    results = []
+
+    def add(name: str, seconds: float):
+        results.append(BenchmarkResult(f"micro.{name}", "micro", seconds, "s"))
+
+    add("construct.stock", time_call(_stock_game, max(5, n // 20)))
+    add("construct.procedural_small",
+        time_call(lambda: AlienStarshipGame(seed=1, renderer=NullRenderer(),
+                                            ship=ProceduralShip(1)), max(5, n // 20)))
+
+    start = _stock_game()
+    add("move_player", time_on_forks(start, lambda game: game.move_player("east"), n))
+    add("move_player.no_exit", time_on_forks(start, lambda game: game.move_player("south"), n))
+    add("handle_command.go", time_on_forks(start, lambda game: game.handle_command("go east"), n))
+    add("handle_command.unknown", time_call(lambda: start.handle_command("xyzzy"), n))
+    # The farthest room reachable from the start; forks begin with no cached routes
+    routes = [(len(route), name) for name in start.world.room_names
+              for route in [start.path_to(name)] if route]
+    far = max(routes)[1]
+    add("handle_command.goto", time_on_forks(start, lambda game: game.handle_command(f"goto {far}"), n))
+    add("path_to.cached", time_call(lambda: start.path_to(far), n))
+
+    taking, command = _game_before("take")
+    phrase = command.split(" ", 1)[1]
+    add("take_item", time_on_forks(taking, lambda game: game.take_item(phrase), n))
+
+    equipped = _stock_game()
+    for command in ["east", "take maintenance tool"]:
+        equipped.handle_command(command)
+    add("use_item", time_call(lambda: equipped.use_item("maintenance tool"), n))
+    add("examine_item", time_call(lambda: equipped.examine_item("maintenance tool"), n))
+    add("show_inventory", time_call(equipped.show_inventory, n))
+    add("display_room", time_call(equipped.display_room, n))
+    add("show_help", time_call(equipped.show_help, n))
+    equipped.show_hint()
+    add("show_hint.cached", time_call(equipped.show_hint, n))
+    add("handle_command.use", time_call(lambda: equipped.handle_command("use maintenance tool"), n))
+    add("handle_command.examine", time_call(lambda: equipped.handle_command("examine tool"), n))
+    add("handle_command.hint", time_on_forks(equipped, lambda game: game.handle_command("hint"),
+                                             max(5, n // 20)))
+    # Cutting into the docking bay's hidden compartment, from the start room
+    torch = _stock_game()
+    torch.player.add_item(torch.items["plasma_torch"])
+    add("handle_command.use.reveal",
+        time_on_forks(torch, lambda game: game.handle_command("use plasma torch"), n))
+    add("player.has_item.hit", time_call(lambda: equipped.player.has_item("maintenance_tool"), n * 10))
+    add("player.has_item.miss", time_call(lambda: equipped.player.has_item("alien_weapon"), n * 10))
+    add("trigger_random_event", time_on_forks(equipped, AlienStarshipGame.trigger_random_event, n))
+    add("fork", time_call(equipped.fork, n))
+    add("snapshot", time_call(equipped.snapshot, n))
+    return results
+
+
+def macro_benchmarks(scale: float = 1.0) -> List[BenchmarkResult]:
+    """Timings of complete seeded playthroughs"""
+    runs = max(3, int(50 * scale))
+    results = []
+
+    def playthroughs(name: str, ship_factory: Optional[Callable[[], object]], max_steps: int):
+        steps = 0
+        start = time.perf_counter()
+        for seed in range(runs):
+            ship = ship_factory() if ship_factory else None
+            steps += run_playthrough(seed, max_steps=max_steps, ship=ship).steps
+        elapsed = time.perf_counter() - start
+        results.append(BenchmarkResult(f"macro.{name}", "macro", elapsed / runs, "s",
+                                       runs=runs, seconds_per_step=elapsed / max(steps, 1)))
+
+    playthroughs("playthrough.stock.explorer", None, 1000)
+    for label, levels, width, height in SYNTHETIC_SHIPS:
+        playthroughs(f"playthrough.{label}.explorer",
+                     lambda: ProceduralShip(1, levels, width, height), 1000)
+
+    def solved():
+        game = _stock_game()
+        for command in solve(game):
+            game.trigger_random_event()
+            game.handle_command(command)
+    results.append(BenchmarkResult("macro.playthrough.stock.solved", "macro",
+                                   _best(lambda: _elapsed(solved), 3), "s"))
+
+    # The winning plan as a QA script: game_loop on stdin against a compiled run
+    plan = solve(_stock_game())
+    script = CompiledScript.compile(plan)
+    text = "".join(command + "\n" for command in plan)
+    game = _stock_game()
+    stdin = _best(lambda: _elapsed(lambda: [_stdin_run(text, seed) for seed in range(runs)]), 3) / runs
+    compiled = _best(lambda: _elapsed(lambda: [script.run(seed, max_steps=len(plan), game=game)
+                                               for seed in range(runs)]), 3) / runs
+    results.append(BenchmarkResult("macro.script.game_loop", "macro", stdin, "s", runs=runs))
+    results.append(BenchmarkResult("macro.script.compiled", "macro", compiled, "s", runs=runs,
+                                   speedup=stdin / compiled))
+
+    # Shared-world crews: one thread, one thread per core, one crew per core
+    cores = multiprocessing.cpu_count()
+    steps = max(50, int(1000 * scale))
+    for name, run in (("one_thread", lambda: stress(16, 1, steps)),
+                      ("thread_per_core", lambda: stress(16, cores, steps)),
+                      ("process_per_core", lambda: stress_processes(16, cores, steps))):
+        report = run()
+        results.append(BenchmarkResult(f"macro.crew.{name}", "macro",
+                                       1 / report["commands_per_second"], "s", cores=cores))
+    return results
+
+
+def _elapsed(call: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def _allocated(build: Callable[[], object]) -> int:
+    """Bytes still allocated by whatever ``build`` returns"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        keep = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del keep
+    return size
+
+
+def _explored(game: AlienStarshipGame, steps: int) -> AlienStarshipGame:
+    rng = random.Random(0)
+    for _ in range(steps):
+        if game.victory or game.game_over:
+            break
+        game.trigger_random_event()
+        game.handle_command(explorer_policy(game, rng))
+    return game
+
+
+def _serve(port: int):
+    """Child process body: host a game server until terminated"""
+    from starship_server import GameServer
+
+    asyncio.run(GameServer(port=port, idle_timeout=3600.0).serve_forever())
+
+
+async def _connect(port: int, retries: int = 200):
+    for attempt in range(retries):
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            break
+        except ConnectionError:
+            if attempt == retries - 1:
+                raise
+            await asyncio.sleep(0.05)
+    await reader.readuntil(PROMPT)
+    return reader, writer
+
+
+async def _drive(port: int, sessions: int, probes: int) -> List[float]:
+    """Open ``sessions`` players, then time ``probes`` commands one at a time"""
+    players = [await _connect(port)]
+    while len(players) < sessions:
+        batch = min(500, sessions - len(players))
+        players += await asyncio.gather(*(_connect(port) for _ in range(batch)))
+    rng = random.Random(0)
+    latencies = []
+    for _ in range(probes):
+        reader, writer = rng.choice(players)
+        start = time.perf_counter()
+        writer.write(b"look\n")
+        await reader.readuntil(PROMPT)
+        latencies.append(time.perf_counter() - start)
+    for _, writer in players:
+        writer.close()
+    return latencies
+
+
+def server_benchmarks(scale: float = 1.0) -> List[BenchmarkResult]:
+    """Command round-trip latency with many players connected to one server
+
+    The server runs in a child process; this process holds the connections
+    and sends one command at a time from a random player, so each sample is
+    the latency of a command while every other player sits idle.
+    """
+    sessions = max(100, int(10000 * scale))
+    probes = max(200, int(5000 * scale))
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = multiprocessing.Process(target=_serve, args=(port,), daemon=True)
+    server.start()
+    try:
+        start = time.perf_counter()
+        latencies = asyncio.run(_drive(port, sessions, probes))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.join(10)
+    latencies.sort()
+
+    def percentile(q: float) -> float:
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    extra = {"sessions": sessions, "probes": probes}
+    return [BenchmarkResult("server.command.p50", "server", percentile(0.50), "s", **extra),
+            BenchmarkResult("server.command.p99", "server", percentile(0.99), "s", **extra),
+            BenchmarkResult("server.command.max", "server", latencies[-1], "s", **extra),
+            BenchmarkResult("server.session.open", "server", (elapsed - sum(latencies)) / sessions,
+                            "s", **extra)]
+
+
+def memory_benchmarks(scale: float = 1.0) -> List[BenchmarkResult]:
+    """Bytes allocated per game instance"""
+    steps = max(50, int(1000 * scale))
+    _stock_game()  # warm shared caches (world definition, item index)
+    template = _explored(_stock_game(), steps)
+    results = [
+        BenchmarkResult("memory.game.stock", "memory", _allocated(_stock_game), "bytes"),
+        BenchmarkResult("memory.game.stock.played", "memory",
+                        _allocated(lambda: _explored(_stock_game(), steps)), "bytes", steps=steps),
+        BenchmarkResult("memory.game.stock.fork", "memory", _allocated(template.fork), "bytes"),
+    ]
+    for label, levels, width, height in SYNTHETIC_SHIPS:
+        ship = ProceduralShip(1, levels, width, height)
+        AlienStarshipGame(renderer=NullRenderer(), ship=ship)
+        build = lambda: _explored(AlienStarshipGame(seed=1, renderer=NullRenderer(), ship=ship), steps)
+        results.append(BenchmarkResult(f"memory.game.{label}.played", "memory", _allocated(build),
+                                       "bytes", steps=steps, rooms=ship.room_count))
+    return results
+
+
+SUITES = {
+    "micro": micro_benchmarks,
+    "macro": macro_benchmarks,
+    "memory": memory_benchmarks,
+    "server": server_benchmarks,
+}
+# The server suite opens thousands of sockets, so it only runs when asked for
+DEFAULT_SUITES = ("micro", "macro", "memory")
+
+
+def run_suite(suites=DEFAULT_SUITES, scale: float = 1.0) -> dict:
+    """Run the named suites and return the JSON-ready report"""
+    results = {}
+    for suite in suites:
+        for result in SUITES[suite](scale):
+            results[result["name"]] = result
+    return {
+        "schema": SCHEMA,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "scale": scale,
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float = 0.20) -> List[dict]:
+    """Per-metric ratios against a baseline; ``regression`` marks ratios above 1 + threshold"""
+    rows = []
+    for name, result in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None or not base["value"]:
+            continue
+        ratio = result["value"] / base["value"]
+        rows.append({"name": name, "baseline": base["value"], "value": result["value"],
+                     "unit": result["unit"], "ratio": ratio, "regression": ratio > 1 + threshold})
+    return rows
+
+
+def _format(value: float, unit: str) -> str:
+    if unit == "bytes":
+        return f"{value / 1024:.1f} KiB"
+    for factor, suffix in ((1, "s"), (1e3, "ms"), (1e6, "us")):
+        if value * factor >= 1:
+            return f"{value * factor:.2f} {suffix}"
+    return f"{value * 1e9:.0f} ns"
+
+
+def main():
+    """Command line entry point for the benchmark suite"""
+    parser = argparse.ArgumentParser(description="Benchmark Alien Starship Adventure.")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES),
+                        help="suite to run (repeatable; default all but server)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply iteration counts")
+    parser.add_argument("--quick", action="store_true", help="same as --scale 0.1")
+    parser.add_argument("--output", help="write the JSON report here ('-' for stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="relative slowdown or growth counted as a regression")
+    args = parser.parse_args()
+
+    report = run_suite(args.suite or DEFAULT_SUITES, 0.1 if args.quick else args.scale)
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        for name, result in report["results"].items():
+            print(f"{name:40} {_format(result['value'], result['unit']):>12}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold)
+        regressions = [row for row in rows if row["regression"]]
+        print(f"\nCompared with {args.compare}:", file=sys.stderr)
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(f"{row['name']:40} {row['ratio']:6.2f}x {flag}", file=sys.stderr)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Command parsing for Alien Starship Adventure.
+Turns a raw input line into a structured Command using a precompiled verb
+table: explicit aliases first, then unique prefixes of every verb and
+alias. Item phrases are resolved against a precomputed word index with a
+fuzzy fallback for typos.
+"""
+
+from difflib import get_close_matches
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+from starship_world import DIRECTIONS
+
+DIRECTION_ALIASES = {"n": "north", "s": "south", "e": "east", "w": "west", "u": "up", "d": "down"}
+
+# (verb, aliases)
+DEFAULT_VERBS = [
+    ("quit", ("exit",)),
+    ("help", ("?",)),
+    ("hint", ()),
+    ("look", ("l",)),
+    ("inventory", ("inv", "i")),
+    ("go", ("move", "walk")),
+    ("goto", ()),
+    ("take", ("get", "pick")),
+    ("use", ()),
+    ("examine", ("inspect", "x", "ex")),
+]
+
+
+class Command(NamedTuple):
+    verb: Optional[str]
+    args: Tuple[str, ...]
+    raw: str
+
+    @property
+    def object(self) -> str:
+        """Everything after the verb, as typed"""
+        return " ".join(self.args)
+
+
+class CommandParser:
+    """Parser over a verb table with alias and unique-prefix lookup
+
+    Bare direction words parse as ``go <direction>``. Lookups go through two
+    dicts: explicit aliases, then a flattened trie holding every prefix
+    that identifies exactly one verb or direction. Parsed lines are cached,
+    so replaying logs with repeated commands mostly costs one dict hit.
+    """
+
+    def __init__(self, verbs: Iterable[Tuple[str, Sequence[str]]] = DEFAULT_VERBS,
+                 cache_size: int = 4096):
+        self._verbs: Dict[str, Tuple[str, ...]] = {}
+        self._cache_size = cache_size
+        for verb, aliases in verbs:
+            self._verbs[verb] = tuple(aliases)
+        self._compile()
+
+    def register(self, verb: str, aliases: Sequence[str] = ()):
+        """Add a verb (or extra aliases for an existing one) and recompile"""
+        self._verbs[verb] = self._verbs.get(verb, ()) + tuple(aliases)
+        self._compile()
+
+    def copy(self) -> "CommandParser":
+        return CommandParser(self._verbs.items(), self._cache_size)
+
+    @property
+    def verbs(self) -> Tuple[str, ...]:
+        return tuple(self._verbs)
+
+    def _compile(self):
+        # Words map to (verb, implied first argument)
+        exact = {}
+        for direction in DIRECTIONS:
+            exact[direction] = ("go", direction)
+        for short, direction in DIRECTION_ALIASES.items():
+            exact[short] = ("go", direction)
+        for verb, aliases in self._verbs.items():
+            exact[verb] = (verb, None)
+            for alias in aliases:
+                exact[alias] = (verb, None)
+
+        owners: Dict[str, set] = {}
+        for word, target in exact.items():
+            for end in range(1, len(word)):
+                owners.setdefault(word[:end], set()).add(target)
+        prefixes = {prefix: targets.pop() for prefix, targets in owners.items()
+                    if len(targets) == 1 and prefix not in exact}
+
+        self._words = {**prefixes, **exact}
+        directions = {direction: direction for direction in DIRECTIONS}
+        directions.update(DIRECTION_ALIASES)
+        for word, (verb, implied) in self._words.items():
+            if verb == "go" and implied is not None:
+                directions.setdefault(word, implied)
+        self._directions = directions
+        self.parse = lru_cache(maxsize=self._cache_size)(self._parse)
+
+    def _parse(self, line: str) -> Command:
+        parts = line.strip().lower().split()
+        if not parts:
+            return Command(None, (), line)
+        target = self._words.get(parts[0])
+        if target is None:
+            return Command(None, tuple(parts), line)
+        verb, implied = target
+        args = tuple(parts[1:])
+        if implied is not None:
+            args = (implied,) + args
+        elif verb == "go" and args:
+            args = (self._directions.get(args[0], args[0]),) + args[1:]
+        return Command(verb, args, line)
+
+
+class ItemIndex:
+    """Precomputed lookup from typed phrases to item names
+
+    A phrase resolves to the names whose words start with each of the
+    phrase's words ("maint tool", "keycard"). Words that match nothing fall
+    back to the closest known word, to absorb typos. Resolution results are
+    cached per phrase; filtering to the items actually present is a cheap
+    membership test on top.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names = tuple(names)
+        self._exact = set(self.names)
+        self._by_prefix: Dict[str, set] = {}
+        for name in self.names:
+            for word in name.split("_"):
+                for end in range(1, len(word) + 1):
+                    self._by_prefix.setdefault(word[:end], set()).add(name)
+        self._words = sorted({word for name in self.names for word in name.split("_")})
+        self._order = {name: i for i, name in enumerate(self.names)}
+        self.candidates = lru_cache(maxsize=4096)(self._candidates)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def for_names(names: Tuple[str, ...]) -> "ItemIndex":
+        """Shared index per item catalog"""
+        return ItemIndex(names)
+
+    def _word_matches(self, word: str) -> set:
+        found = self._by_prefix.get(word)
+        if found is not None:
+            return found
+        close = get_close_matches(word, self._words, n=3, cutoff=0.75)
+        return set().union(*(self._by_prefix[match] for match in close)) if close else set()
+
+    def _candidates(self, phrase: str) -> Tuple[str, ...]:
+        words = phrase.lower().replace("_", " ").split()
+        if not words:
+            return ()
+        joined = "_".join(words)
+        if joined in self._exact:
+            return (joined,)
+        matches = None
+        for word in words:
+            found = self._word_matches(word)
+            matches = set(found) if matches is None else matches & found
+            if not matches:
+                return ()
+        return tuple(sorted(matches, key=self._order.__getitem__))
+
+    def resolve(self, phrase: str, scopes: Sequence = ()) -> Tuple[str, ...]:
+        """Item names matching a phrase, restricted to those in any of the scopes"""
+        matches = self.candidates(phrase)
+        if not scopes or len(matches) == 1 and any(matches[0] in scope for scope in scopes):
+            return matches
+        return tuple(name for name in matches if any(name in scope for scope in scopes))
+
+
+DEFAULT_PARSER = CommandParser()
+
+
+def parse_command(line: str) -> Command:
+    """Parse one input line with the default verb table"""
+    return DEFAULT_PARSER.parse(line)
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Gym-style environments for training agents on Alien Starship Adventure.
+StarshipEnv wraps one headless game behind reset(seed) / step(action) with
+integer actions and a numeric observation; SyncVectorEnv steps a batch of
+games in-process and SharedMemoryVectorEnv spreads the batch over worker
+processes that write straight into shared observation buffers.
+
+Actions: 0-5 move north/south/east/west/up/down, then ``take <item>`` for
+every item of the catalog, then ``use <item>`` for every item.
+
+Observation, six integers:
+
+    room ID, level, inventory item bitset, room item bitset,
+    open exits mask (bit per direction), locked neighbours mask
+
+Each step runs the game's random event and then the action, as game_loop
+does. Reward is 1.0 on the step that wins the game and 0.0 otherwise.
+The vector environments need NumPy; StarshipEnv does not. Their int64
+observations hold item bitsets for catalogs of at most MAX_VECTOR_ITEMS
+items, and their ships must be describable by ship_spec() so worker
+processes can rebuild them.
+"""
+
+from typing import List, Optional, Tuple
+import argparse
+import multiprocessing
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from alien_starship_adventure import AlienStarshipGame
+from starship_journal import build_ship, world_spec
+from starship_render import NullRenderer
+from starship_world import DIRECTIONS
+from starship_worldfile import shared_world
+
+OBSERVATION_SIZE = 6
+ROOM, LEVEL, INVENTORY, ROOM_ITEMS, EXITS, LOCKED = range(OBSERVATION_SIZE)
+# Item bitsets must fit the vector environments' int64 observations
+MAX_VECTOR_ITEMS = 63
+
+
+class StarshipEnv:
+    """One game behind a reset/step interface
+
+    ``step`` returns ``(observation, reward, terminated, truncated, info)``;
+    episodes are truncated after ``max_steps`` steps.
+    """
+
+    def __init__(self, ship=None, max_steps: int = 1000):
+        self.ship = ship
+        self.max_steps = max_steps
+        self.game: Optional[AlienStarshipGame] = None
+        self.steps = 0
+        self._commands: List[str] = []
+        self._item_bits = {}
+        self._exit_masks = {}
+
+    @property
+    def action_count(self) -> int:
+        return len(self.action_meanings())
+
+    def action_meanings(self) -> List[str]:
+        """The command each action index runs"""
+        if not self._commands:
+            self.reset(0)
+        return self._commands
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[Tuple[int, ...], dict]:
+        self.game = AlienStarshipGame(seed=seed, renderer=NullRenderer(), ship=self.ship)
+        self.steps = 0
+        world = self.game.world
+        if not self._commands:
+            self._commands = ([f"go {direction}" for direction in DIRECTIONS]
+                              + [f"take {name}" for name in world.item_names]
+                              + [f"use {name}" for name in world.item_names])
+            self._item_bits = {name: 1 << item_id for item_id, name in enumerate(world.item_names)}
+        return self.observe(), {"seed": self.game.seed}
+
+    def step(self, action: int) -> Tuple[Tuple[int, ...], float, bool, bool, dict]:
+        game = self.game
+        game.trigger_random_event()
+        game.handle_command(self._commands[action])
+        self.steps += 1
+        terminated = game.victory or game.game_over
+        truncated = not terminated and self.steps >= self.max_steps
+        return self.observe(), 1.0 if game.victory else 0.0, terminated, truncated, {}
+
+    def _bits(self, bag) -> int:
+        bits = 0
+        item_bits = self._item_bits
+        for item, _ in bag.grouped():
+            bits |= item_bits[item.name]
+        return bits
+
+    def _exit_mask(self, room_id: int) -> int:
+        mask = self._exit_masks.get(room_id)
+        if mask is None:
+            mask = 0
+            for direction, _ in self.game.world.neighbors(room_id):
+                mask |= 1 << direction
+            self._exit_masks[room_id] = mask
+        return mask
+
+    def _locked_mask(self, room_id: int) -> int:
+        mask = 0
+        room_list = self.game.room_list
+        for direction, target in self.game.world.neighbors(room_id):
+            if room_list[target].locked:
+                mask |= 1 << direction
+        return mask
+
+    def observe(self) -> Tuple[int, ...]:
+        room = self.game.player.current_room
+        return (room.id, room.level, self._bits(self.game.player.inventory), self._bits(room.items),
+                self._exit_mask(room.id), self._locked_mask(room.id))
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Vector environments need NumPy: pip install numpy")
+
+
+def _check_catalog(env: StarshipEnv):
+    items = (len(env.action_meanings()) - len(DIRECTIONS)) // 2
+    if items > MAX_VECTOR_ITEMS:
+        raise ValueError(f"The ship's catalog has {items} items; vector environment "
+                         f"observations hold item bitsets of at most {MAX_VECTOR_ITEMS}")
+
+
+class SyncVectorEnv:
+    """A batch of environments stepped in-process
+
+    Arrays are shared between calls and overwritten by every step. Finished
+    episodes reset automatically with the next seed of their slot
+    (``seed + slot + episode * num_envs``); the returned observation is then
+    the first one of the new episode.
+    """
+
+    def __init__(self, num_envs: int, ship=None, max_steps: int = 1000, buffers=None,
+                 first_slot: int = 0, stride: Optional[int] = None):
+        _require_numpy()
+        self.num_envs = num_envs
+        self.envs = [StarshipEnv(ship, max_steps) for _ in range(num_envs)]
+        _check_catalog(self.envs[0])
+        if buffers is None:
+            buffers = (np.zeros((num_envs, OBSERVATION_SIZE), dtype=np.int64),
+                       np.zeros(num_envs, dtype=np.float64),
+                       np.zeros(num_envs, dtype=bool),
+                       np.zeros(num_envs, dtype=bool))
+        self.observations, self.rewards, self.terminated, self.truncated = buffers
+        self._seed = 0
+        self._episodes = [0] * num_envs
+        # A worker's slice seeds as slots first_slot.. of a stride-wide batch
+        self._first_slot = first_slot
+        self._stride = stride or num_envs
+
+    @property
+    def action_count(self) -> int:
+        return self.envs[0].action_count
+
+    def _slot_seed(self, slot: int) -> int:
+        return self._seed + self._first_slot + slot + self._episodes[slot] * self._stride
+
+    def reset(self, seed: int = 0):
+        self._seed = seed
+        self._episodes = [0] * self.num_envs
+        for slot, env in enumerate(self.envs):
+            observation, _ = env.reset(self._slot_seed(slot))
+            self.observations[slot] = observation
+        return self.observations
+
+    def step(self, actions):
+        observations, rewards = self.observations, self.rewards
+        terminated, truncated = self.terminated, self.truncated
+        for slot, env in enumerate(self.envs):
+            observation, reward, done, cut, _ = env.step(int(actions[slot]))
+            rewards[slot] = reward
+            terminated[slot] = done
+            truncated[slot] = cut
+            if done or cut:
+                self._episodes[slot] += 1
+                observation, _ = env.reset(self._slot_seed(slot))
+            observations[slot] = observation
+        return observations, rewards, terminated, truncated
+
+
+def _buffers(shared, num_envs: int):
+    """NumPy views over the shared blocks"""
+    observations, rewards, terminated, truncated, actions = shared
+    return (np.ndarray((num_envs, OBSERVATION_SIZE), dtype=np.int64, buffer=observations.buf),
+            np.ndarray(num_envs, dtype=np.float64, buffer=rewards.buf),
+            np.ndarray(num_envs, dtype=bool, buffer=terminated.buf),
+            np.ndarray(num_envs, dtype=bool, buffer=truncated.buf),
+            np.ndarray(num_envs, dtype=np.int64, buffer=actions.buf))
+
+
+def _worker(connection, names, num_envs: int, start: int, stop: int, ship: Optional[dict],
+            max_steps: int):
+    from multiprocessing import shared_memory
+
+    shared = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        observations, rewards, terminated, truncated, actions = _buffers(shared, num_envs)
+        envs = SyncVectorEnv(stop - start, build_ship(ship), max_steps,
+                             (observations[start:stop], rewards[start:stop],
+                              terminated[start:stop], truncated[start:stop]),
+                             first_slot=start, stride=num_envs)
+        local_actions = actions[start:stop]
+        while True:
+            command, argument = connection.recv()
+            if command == "step":
+                envs.step(local_actions)
+            elif command == "reset":
+                envs.reset(argument)
+            elif command == "close":
+                break
+            connection.send(None)
+    finally:
+        for block in shared:
+            block.close()
+        connection.close()
+
+
+class SharedMemoryVectorEnv:
+    """A batch of environments split over worker processes
+
+    Observations, rewards, done flags and actions live in shared memory; a
+    step sends one short message per worker and each worker writes its slice
+    of the buffers in place. Seeds and auto-resets match SyncVectorEnv.
+    Workers rebuild the ship from its ship_spec(), since generated ships do
+    not pickle; ``context`` names the multiprocessing start method.
+    """
+
+    def __init__(self, num_envs: int, workers: Optional[int] = None, ship=None, max_steps: int = 1000,
+                 context: Optional[str] = None):
+        _require_numpy()
+        from multiprocessing import shared_memory
+
+        spec = world_spec(ship) if ship is not None else None
+        if spec is None and ship is not None and ship is not shared_world():
+            raise ValueError("Worker processes can only rebuild the stock ship, "
+                             "generated ships and cached worlds")
+        env = StarshipEnv(ship, max_steps)
+        _check_catalog(env)
+        self.action_count = env.action_count
+        self.num_envs = num_envs
+        workers = max(1, min(workers or multiprocessing.cpu_count(), num_envs))
+        sizes = (num_envs * OBSERVATION_SIZE * 8, num_envs * 8, num_envs, num_envs, num_envs * 8)
+        self._shared = [shared_memory.SharedMemory(create=True, size=size) for size in sizes]
+        (self.observations, self.rewards, self.terminated,
+         self.truncated, self._actions) = _buffers(self._shared, num_envs)
+
+        self._connections = []
+        self._processes = []
+        bounds = [num_envs * i // workers for i in range(workers + 1)]
+        names = [block.name for block in self._shared]
+        processes = multiprocessing.get_context(context)
+        for start, stop in zip(bounds, bounds[1:]):
+            parent, child = processes.Pipe()
+            process = processes.Process(target=_worker, daemon=True,
+                                        args=(child, names, num_envs, start, stop, spec, max_steps))
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def _broadcast(self, command: str, argument=None):
+        for connection in self._connections:
+            connection.send((command, argument))
+        for connection in self._connections:
+            connection.recv()
+
+    def reset(self, seed: int = 0):
+        self._broadcast("reset", seed)
+        return self.observations
+
+    def step(self, actions):
+        self._actions[:] = actions
+        self._broadcast("step")
+        return self.observations, self.rewards, self.terminated, self.truncated
+
+    def close(self):
+        for connection in self._connections:
+            try:
+                connection.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+        # Drop our views before releasing the blocks
+        self.observations = self.rewards = self.terminated = self.truncated = self._actions = None
+        for block in self._shared:
+            block.close()
+            block.unlink()
+        self._shared = []
+
+    def __enter__(self) -> "SharedMemoryVectorEnv":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def benchmark(num_envs: int = 64, steps: int = 2000, workers: int = 0, seed: int = 0):
+    """Print environment steps per second under a uniformly random policy"""
+    _require_numpy()
+    envs = SharedMemoryVectorEnv(num_envs, workers) if workers else SyncVectorEnv(num_envs)
+    try:
+        envs.reset(seed)
+        rng = np.random.default_rng(seed)
+        actions = rng.integers(0, envs.action_count, size=(steps, num_envs))
+        start = time.perf_counter()
+        for step in range(steps):
+            envs.step(actions[step])
+        elapsed = time.perf_counter() - start
+    finally:
+        if workers:
+            envs.close()
+    kind = f"{workers} worker(s)" if workers else "in-process"
+    print(f"{kind}: {num_envs * steps / elapsed:,.0f} steps/s ({num_envs} envs x {steps} steps)")
+
+
+def main():
+    """Command line entry point: measure environment throughput"""
+    parser = argparse.ArgumentParser(description="Benchmark the Alien Starship training environments.")
+    parser.add_argument("--envs", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=0, help="0 steps in-process")
+    args = parser.parse_args()
+    benchmark(args.envs, args.steps, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+Procedural starship generator for Alien Starship Adventure.
+Builds seeded multi-level ships of arbitrary size. Every property of a room
+(name, description, exits, items, lock) is a pure function of the seed and
+the room ID, so rooms are only materialized when the game first touches
+them and startup cost does not depend on the size of the ship.
+"""
+
+from typing import Dict, Optional
+
+from starship_world import DIRECTION_COUNT, DIRECTIONS, NO_EXIT, NO_ITEM
+from starship_worldfile import shared_world
+
+_MASK = (1 << 64) - 1
+
+# Items that open the lock between deck L and deck L + 1, in deck order
+LOCK_ITEMS = ["security_keycard", "command_codes", "maintenance_tool", "energy_cell"]
+LOOT_ITEMS = ["oxygen_canister", "alien_crystal", "data_pad", "medical_kit",
+              "plasma_torch", "translation_device", "gravity_boots", "alien_weapon"]
+
+ROOM_KINDS = [
+    ("corridor", "A dim corridor on deck {level}, lined with humming alien conduits."),
+    ("cargo_hold", "A cargo hold on deck {level} stacked with sealed alien containers."),
+    ("storage_room", "A cramped storage room on deck {level}, shelves half emptied."),
+    ("crew_quarters", "Abandoned crew quarters on deck {level} with a strange sleeping alcove."),
+    ("laboratory", "A laboratory on deck {level} full of specimens in murky containers."),
+    ("power_distribution", "Power distribution nodes on deck {level} crackle with stray energy."),
+    ("observation_deck", "An observation deck on deck {level} overlooking the desolate planet."),
+    ("workshop", "A workshop on deck {level} littered with half-assembled devices."),
+]
+SPECIAL_DESCRIPTIONS = {
+    "docking_bay": "The ship's main docking bay. Your shuttle is docked here, but it's damaged beyond repair.",
+    "emergency_stairwell": "An emergency stairwell linking deck {level} to its neighbours.",
+    "maintenance_shaft": "A narrow maintenance shaft running between decks, next to deck {level}.",
+    "escape_pod_bay": "An escape pod bay on deck {level}. Launch cradles line the walls.",
+}
+
+
+def _mix(*values: int) -> int:
+    """Deterministic 64-bit hash of a tuple of integers (splitmix64 rounds)"""
+    h = 0x9E3779B97F4A7C15
+    for value in values:
+        h = (h ^ (value & _MASK)) * 0xBF58476D1CE4E5B9 & _MASK
+        h = (h ^ (h >> 27)) * 0x94D049BB133111EB & _MASK
+        h ^= h >> 31
+    return h
+
+
+class _Lazy:
+    """Read-only sequence whose items are computed on demand"""
+
+    __slots__ = ("_length", "_compute")
+
+    def __init__(self, length: int, compute):
+        self._length = length
+        self._compute = compute
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int):
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return self._compute(index)
+
+
+class _RoomIds:
+    """Name to room ID mapping that parses the ID out of the room name"""
+
+    __slots__ = ("_ship",)
+
+    def __init__(self, ship: "ProceduralShip"):
+        self._ship = ship
+
+    def get(self, name: str, default=None):
+        _, _, suffix = name.rpartition("_")
+        if not suffix.isdigit():
+            return default
+        room_id = int(suffix)
+        if room_id >= self._ship.room_count or self._ship.room_name(room_id) != name:
+            return default
+        return room_id
+
+    def __getitem__(self, name: str) -> int:
+        room_id = self.get(name)
+        if room_id is None:
+            raise KeyError(name)
+        return room_id
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+
+class ProceduralShip:
+    """Seeded, lazily evaluated ship layout
+
+    Each deck is a ``width`` x ``height`` grid. Rooms in a row are always
+    linked east-west, rows are linked north-south at column 0 and at a
+    seeded subset of other columns, so every deck is connected. Decks are
+    joined by an emergency stairwell and a maintenance shaft whose upper
+    landings are locked; the item that opens them is hidden on the deck
+    below. Escape pod bays sit on the top deck, one holding the beacon.
+
+    Exposes the same ``exits``/``levels``/``required``/``room_names``/
+    ``room_ids`` interface as ``CompiledWorld``, computed per access.
+    """
+
+    def __init__(self, seed: int, levels: int = 5, width: int = 16, height: int = 16,
+                 pod_bays: int = 2, loot_percent: int = 8):
+        if width * height < 6 + pod_bays:
+            raise ValueError("Decks are too small to hold stairwells, shafts and pod bays")
+        self.seed = seed
+        self.level_count = levels
+        self.width = width
+        self.height = height
+        self.per_level = width * height
+        self.room_count = levels * self.per_level
+        self.loot_percent = loot_percent
+        self.start_room = 0
+        self.item_names = []
+        self.item_ids = {}
+
+        # Per-deck special cells: O(levels) state, independent of ship size
+        self.up_stair = [None] * (levels + 1)
+        self.up_shaft = [None] * (levels + 1)
+        self.key_cell = [None] * (levels + 1)
+        self.special: Dict[int, str] = {}
+        self.pod_cells = []
+        self.beacon_room = None
+
+        for level in range(1, levels + 1):
+            used = set()
+            if level == 1:
+                used.add(0)
+                self.special[0] = "docking_bay"
+            if level > 1:
+                used.update((self.up_stair[level - 1], self.up_shaft[level - 1]))
+            pick = lambda salt: self._free_cell(level, salt, used)
+            if level < levels:
+                self.up_stair[level] = pick(1)
+                self.up_shaft[level] = pick(2)
+                self.key_cell[level] = pick(3)
+            else:
+                self.pod_cells = [pick(10 + n) for n in range(pod_bays)]
+                beacon = self.pod_cells[_mix(seed, 4) % pod_bays]
+                self.beacon_room = self._room_id(level, beacon)
+
+        for level in range(1, levels + 1):
+            base = (level - 1) * self.per_level
+            if level < levels:
+                self.special[base + self.up_stair[level]] = "emergency_stairwell"
+                self.special[base + self.up_shaft[level]] = "maintenance_shaft"
+            if level > 1:
+                self.special[base + self.up_stair[level - 1]] = "emergency_stairwell"
+                self.special[base + self.up_shaft[level - 1]] = "maintenance_shaft"
+        for cell in self.pod_cells:
+            self.special[self._room_id(levels, cell)] = "escape_pod_bay"
+
+        self.exits = _Lazy(self.room_count * DIRECTION_COUNT,
+                           lambda slot: self.exit(slot // DIRECTION_COUNT, slot % DIRECTION_COUNT))
+        self.levels = _Lazy(self.room_count, lambda room_id: room_id // self.per_level + 1)
+        self.required = _Lazy(self.room_count, self._required_item_id)
+        self.room_names = _Lazy(self.room_count, self.room_name)
+        self.room_ids = _RoomIds(self)
+
+    def _free_cell(self, level: int, salt: int, used: set) -> int:
+        attempt = 0
+        while True:
+            cell = _mix(self.seed, level, salt, attempt) % self.per_level
+            if cell not in used:
+                used.add(cell)
+                return cell
+            attempt += 1
+
+    def _room_id(self, level: int, cell: int) -> int:
+        return (level - 1) * self.per_level + cell
+
+    def _linked_rows(self, level: int, x: int, y: int) -> bool:
+        """Whether the cell at (x, y) has a north-south link to (x, y + 1)"""
+        return x == 0 or _mix(self.seed, level, x, y, 5) % 3 == 0
+
+    def room_name(self, room_id: int) -> str:
+        kind = self.special.get(room_id)
+        if kind is None:
+            kind = ROOM_KINDS[_mix(self.seed, room_id, 6) % len(ROOM_KINDS)][0]
+        return f"{kind}_{room_id}"
+
+    def exit(self, room_id: int, direction: int) -> int:
+        """Target room ID of one exit slot, or ``NO_EXIT``"""
+        level, cell = divmod(room_id, self.per_level)
+        level += 1
+        y, x = divmod(cell, self.width)
+        name = DIRECTIONS[direction]
+        if name == "north":
+            if y + 1 < self.height and self._linked_rows(level, x, y):
+                return room_id + self.width
+        elif name == "south":
+            if y > 0 and self._linked_rows(level, x, y - 1):
+                return room_id - self.width
+        elif name == "east":
+            if x + 1 < self.width:
+                return room_id + 1
+        elif name == "west":
+            if x > 0:
+                return room_id - 1
+        elif name == "up":
+            if level < self.level_count and cell in (self.up_stair[level], self.up_shaft[level]):
+                return room_id + self.per_level
+        elif level > 1 and cell in (self.up_stair[level - 1], self.up_shaft[level - 1]):
+            return room_id - self.per_level
+        return NO_EXIT
+
+    def neighbors(self, room_id: int):
+        """Yield (direction, target room ID) for every exit of a room"""
+        for direction in range(DIRECTION_COUNT):
+            target = self.exit(room_id, direction)
+            if target >= 0:
+                yield direction, target
+
+    def required_item(self, room_id: int) -> Optional[str]:
+        level, cell = divmod(room_id, self.per_level)
+        if level and cell in (self.up_stair[level], self.up_shaft[level]):
+            return LOCK_ITEMS[(level - 1) % len(LOCK_ITEMS)]
+        return None
+
+    def _required_item_id(self, room_id: int) -> int:
+        name = self.required_item(room_id)
+        return NO_ITEM if name is None else self.item_ids.get(name, NO_ITEM)
+
+    def starts_locked(self, room_id: int) -> bool:
+        return self.required_item(room_id) is not None
+
+    def lock_items(self):
+        """IDs of every item that opens some lock"""
+        names = {LOCK_ITEMS[(level - 1) % len(LOCK_ITEMS)] for level in range(1, self.level_count)}
+        return {self.item_ids[name] for name in names if name in self.item_ids}
+
+    def escape_pod_rooms(self):
+        return [self._room_id(self.level_count, cell) for cell in self.pod_cells]
+
+    def max_level_step(self) -> int:
+        return 1
+
+    def initial_items(self, room_id: int):
+        """Names of the items a room starts with"""
+        level, cell = divmod(room_id, self.per_level)
+        level += 1
+        names = []
+        if room_id == self.beacon_room:
+            names.append("emergency_beacon")
+        if cell == self.key_cell[level]:
+            names.append(LOCK_ITEMS[(level - 1) % len(LOCK_ITEMS)])
+        roll = _mix(self.seed, room_id, 7)
+        if roll % 100 < self.loot_percent:
+            names.append(LOOT_ITEMS[(roll >> 8) % len(LOOT_ITEMS)])
+        return names
+
+    def make_room(self, room_id: int, items: Dict[str, "Item"]) -> "Room":
+        """Materialize the Room object for an ID"""
+        from alien_starship_adventure import Room
+
+        name = self.room_name(room_id)
+        kind = name.rpartition("_")[0]
+        level = room_id // self.per_level + 1
+        description = SPECIAL_DESCRIPTIONS.get(kind)
+        if description is None:
+            description = ROOM_KINDS[_mix(self.seed, room_id, 6) % len(ROOM_KINDS)][1]
+        room = Room(name, description.format(level=level), level)
+        room.id = room_id
+        room.exits = {DIRECTIONS[d]: self.room_name(target) for d, target in self.neighbors(room_id)}
+        for item_name in self.initial_items(room_id):
+            room.items.add(items[item_name])
+        required = self.required_item(room_id)
+        if required:
+            room.locked = True
+            room.required_item = required
+            room.lock_description = f"The hatch is sealed. It needs a {required.replace('_', ' ')} to open."
+        return room
+
+    def attach(self, game) -> "Room":
+        """Install the stock items and lazily materialized rooms on a game
+
+        Returns the start room.
+        """
+        game.items = shared_world().items
+        self.item_names = list(game.items)
+        self.item_ids = {name: i for i, name in enumerate(self.item_names)}
+        game.world = self
+        game.rooms = LazyRooms(self, game.items)
+        game.room_list = game.rooms.by_id
+        return game.room_list[self.start_room]
+
+
+class _RoomsById:
+    """Sequence view of a LazyRooms by room ID"""
+
+    __slots__ = ("_rooms",)
+
+    def __init__(self, rooms: "LazyRooms"):
+        self._rooms = rooms
+
+    def __len__(self) -> int:
+        return self._rooms.ship.room_count
+
+    def __getitem__(self, room_id: int) -> "Room":
+        room = self._rooms.materialized.get(room_id)
+        return room if room is not None else self._rooms.room_at(room_id)
+
+
+class LazyRooms(dict):
+    """Name to Room mapping that materializes rooms on first access
+
+    Only rooms that have been touched are stored, so ``len()`` and iteration
+    cover the materialized part of the ship. This overlay is all the room
+    state a game owns.
+    """
+
+    __slots__ = ("ship", "items", "materialized", "by_id")
+
+    def __init__(self, ship: ProceduralShip, items: Dict[str, "Item"]):
+        super().__init__()
+        self.ship = ship
+        self.items = items
+        self.materialized: Dict[int, "Room"] = {}
+        self.by_id = _RoomsById(self)
+
+    def room_at(self, room_id: int) -> "Room":
+        room = self.materialized.get(room_id)
+        if room is None:
+            if not 0 <= room_id < self.ship.room_count:
+                raise IndexError(room_id)
+            room = self.ship.make_room(room_id, self.items)
+            self.materialized[room_id] = room
+            dict.__setitem__(self, room.name, room)
+        return room
+
+    def fork(self) -> "LazyRooms":
+        """Copy the materialized rooms; the rest stay implied by the ship"""
+        clone = LazyRooms(self.ship, self.items)
+        for room_id, room in self.materialized.items():
+            copy = room.fork()
+            clone.materialized[room_id] = copy
+            dict.__setitem__(clone, copy.name, copy)
+        return clone
+
+    def reset(self):
+        """Forget every materialized room"""
+        self.materialized.clear()
+        dict.clear(self)
+
+    def __missing__(self, name: str) -> "Room":
+        room_id = self.ship.room_ids.get(name)
+        if room_id is None:
+            raise KeyError(name)
+        return self.room_at(room_id)
+
+    def get(self, name: str, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __contains__(self, name) -> bool:
+        return dict.__contains__(self, name) or name in self.ship.room_ids
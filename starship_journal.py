@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Command journals for Alien Starship Adventure.
+A journal is an append-only, newline-delimited JSON log of one game: a
+header with the seed, the ship and a starting snapshot, then one record per
+parsed command and per random event (with the values drawn from the RNG).
+Replaying a journal re-executes it headlessly and checks every draw.
+
+Records:
+
+    {"journal": 1, "seed": ..., "ship": {...} | null, "start": "<base64 snapshot>"}
+    {"c": raw line, "v": verb, "a": [args], "e": [[roll, draws...], ...]}
+    {"e": [roll, draws...]}
+
+A command record lists the random events fired while it ran (``goto``
+walks several turns) under "e", omitted when there were none; standalone
+event records are the ones fired between commands.
+
+Checkpoints live next to the journal. ``<journal>.ckpt`` holds snapshots
+taken every ``interval`` commands and ``<journal>.cidx`` a fixed-width
+index of them, so seeking to command N restores the nearest checkpoint and
+replays fewer than ``interval`` commands. The index carries a digest of the
+journal's header line; checkpoints whose digest does not match are ignored,
+and recording a journal removes any checkpoints left over at its path.
+
+    cidx     4s magic, H version, H reserved, I interval, 8s header digest,
+             then per checkpoint
+             Q commands done, Q journal offset, Q ckpt offset, I snapshot length
+"""
+
+from collections import deque
+from typing import Callable, Iterator, Optional, Tuple
+import argparse
+import base64
+import hashlib
+import json
+import os
+import struct
+import time
+
+from starship_commands import Command
+
+VERSION = 1
+CHECKPOINT_MAGIC = b"ASJC"
+CHECKPOINT_VERSION = 2
+
+_INDEX_HEADER = struct.Struct("<4sHHI8s")
+_INDEX_ENTRY = struct.Struct("<QQQI")
+_SEPARATORS = (",", ":")
+
+
+class JournalError(ValueError):
+    pass
+
+
+def ship_spec(game) -> Optional[dict]:
+    """Describe the game's ship so a replayer can rebuild it; None for the stock ship"""
+    return world_spec(game.world)
+
+
+def world_spec(world) -> Optional[dict]:
+    """ship_spec() of a ship object; None for the stock ship and unknown kinds"""
+    from starship_generator import ProceduralShip
+    from starship_worldfile import CachedWorld
+
+    if isinstance(world, ProceduralShip):
+        return {"kind": "procedural", "seed": world.seed, "levels": world.level_count,
+                "width": world.width, "height": world.height,
+                "pod_bays": len(world.pod_cells), "loot_percent": world.loot_percent}
+    if isinstance(world, CachedWorld):
+        return {"kind": "cache", "path": world.path}
+    return None
+
+
+def build_ship(spec: Optional[dict]):
+    """Rebuild a ship from ship_spec(); None stands for the stock ship"""
+    if spec is None:
+        return None
+    if spec["kind"] == "procedural":
+        from starship_generator import ProceduralShip
+        return ProceduralShip(spec["seed"], spec["levels"], spec["width"], spec["height"],
+                              spec["pod_bays"], spec["loot_percent"])
+    if spec["kind"] == "cache":
+        from starship_worldfile import CachedWorld
+        return CachedWorld(spec["path"])
+    raise JournalError(f"Unknown ship kind {spec['kind']!r}")
+
+
+def build_game(header: dict, renderer=None, setup: Optional[Callable] = None):
+    """Create a fresh game matching a journal header
+
+    ``setup(game)`` runs on the new game, to register the custom commands
+    the journaled game had.
+    """
+    from alien_starship_adventure import AlienStarshipGame
+    from starship_render import NullRenderer
+
+    game = AlienStarshipGame(seed=header["seed"],
+                             renderer=renderer if renderer is not None else NullRenderer(),
+                             ship=build_ship(header.get("ship")))
+    if setup is not None:
+        setup(game)
+    return game
+
+
+def checkpoint_paths(path: str) -> Tuple[str, str]:
+    return path + ".ckpt", path + ".cidx"
+
+
+def _header_digest(line: bytes) -> bytes:
+    """Ties checkpoint files to the journal whose header line this is"""
+    return hashlib.blake2b(line, digest_size=8).digest()
+
+
+def _read_header_digest(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return _header_digest(f.readline())
+
+
+class _CheckpointWriter:
+    def __init__(self, path: str, interval: int, digest: bytes):
+        snapshots, index = checkpoint_paths(path)
+        self.interval = interval
+        self._snapshots = open(snapshots, "wb")
+        self._index = open(index, "wb")
+        self._index.write(_INDEX_HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, 0, interval, digest))
+
+    def add(self, commands: int, journal_offset: int, snapshot: bytes):
+        self._index.write(_INDEX_ENTRY.pack(commands, journal_offset, self._snapshots.tell(), len(snapshot)))
+        self._snapshots.write(snapshot)
+
+    def flush(self):
+        self._snapshots.flush()
+        self._index.flush()
+
+    def close(self):
+        self._snapshots.close()
+        self._index.close()
+
+
+class JournalWriter:
+    """Records a game as it is played
+
+    Attach with ``JournalWriter(path, game)``; the game then reports every
+    parsed command and random event. Records are written through a buffer
+    that is flushed every ``flush_every`` records, so a journal can be
+    tailed while the game runs. With ``checkpoint_every`` set, a snapshot is
+    taken after every that many commands.
+    """
+
+    def __init__(self, path: str, game, checkpoint_every: int = 0, flush_every: int = 64):
+        self.path = path
+        self.game = game
+        self.commands = 0
+        self._file = open(path, "wb")
+        self._flush_every = flush_every
+        self._unflushed = 0
+        self._nested = []
+        header = {"journal": VERSION, "seed": game.seed, "ship": ship_spec(game),
+                  "start": base64.b64encode(game.snapshot()).decode("ascii")}
+        line = json.dumps(header, separators=_SEPARATORS)
+        self._write(line)
+        self._file.flush()
+        if checkpoint_every:
+            self._checkpoints = _CheckpointWriter(path, checkpoint_every,
+                                                  _header_digest(line.encode() + b"\n"))
+        else:
+            # Checkpoints of an earlier game recorded at this path no longer apply
+            self._checkpoints = None
+            for stale in checkpoint_paths(path):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+        game.journal = self
+
+    def _write(self, line: str):
+        self._file.write(line.encode() + b"\n")
+        self._unflushed += 1
+        if self._unflushed >= self._flush_every:
+            self.flush()
+
+    def command(self, command: Command):
+        record = {"c": command.raw, "v": command.verb, "a": command.args}
+        if self._nested:
+            record["e"] = self._nested
+            self._nested = []
+        self._write(json.dumps(record, separators=_SEPARATORS))
+        self.commands += 1
+        if self._checkpoints is not None and self.commands % self._checkpoints.interval == 0:
+            self._checkpoints.add(self.commands, self._file.tell(), self.game.snapshot())
+
+    def event(self, draws: list):
+        if self.game.in_command:
+            self._nested.append(draws)
+            return
+        self._write(json.dumps({"e": draws}, separators=_SEPARATORS))
+
+    def flush(self):
+        self._unflushed = 0
+        self._file.flush()
+        if self._checkpoints is not None:
+            self._checkpoints.flush()
+
+    def close(self):
+        """Flush and detach from the game"""
+        if self.game is not None and self.game.journal is self:
+            self.game.journal = None
+        self._file.close()
+        if self._checkpoints is not None:
+            self._checkpoints.close()
+
+    def __enter__(self) -> "JournalWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_journal(path: str, offset: int = 0) -> Iterator[Tuple[int, dict]]:
+    """Yield (offset after the record, record) one line at a time, from ``offset`` on"""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            offset += len(line)
+            if not line.endswith(b"\n"):
+                # Partially written tail of a journal still being recorded
+                return
+            yield offset, json.loads(line)
+
+
+def read_header(path: str) -> Tuple[dict, int]:
+    """The journal header and the offset of the first record"""
+    for offset, header in read_journal(path):
+        if header.get("journal") != VERSION:
+            raise JournalError(f"{path} is not a version {VERSION} journal")
+        return header, offset
+    raise JournalError(f"{path} is empty")
+
+
+class _DrawChecker:
+    """Stands in for a journal during replay and compares random draws"""
+
+    __slots__ = ("expected", "commands")
+
+    def __init__(self):
+        self.expected = deque()
+        self.commands = 0
+
+    def command(self, command: Command):
+        pass
+
+    def event(self, draws: list):
+        expected = self.expected.popleft() if self.expected else None
+        if draws != expected:
+            raise JournalError(f"Replay diverged after command {self.commands}: "
+                               f"drew {draws}, journal has {expected}")
+
+    def check_consumed(self):
+        if self.expected:
+            raise JournalError(f"Replay diverged at command {self.commands}: "
+                               f"{len(self.expected)} recorded event(s) did not happen")
+
+
+def _apply(game, record: dict, checker: _DrawChecker) -> bool:
+    """Re-execute one record; True if it was a command"""
+    raw = record.get("c")
+    if raw is not None:
+        verb = record["v"]
+        if verb is not None and verb not in game.commands:
+            raise JournalError(f"Command {checker.commands} uses unknown verb {verb!r}; "
+                               f"register it in the replayed game with setup")
+        checker.expected.extend(record.get("e", ()))
+        game.execute(Command(verb, tuple(record["a"]), raw))
+        checker.check_consumed()
+        checker.commands += 1
+        return True
+    checker.expected.append(record["e"])
+    game.trigger_random_event()
+    return False
+
+
+def replay(path: str, until: Optional[int] = None, game=None, offset: Optional[int] = None,
+           done: int = 0, checkpoint_every: int = 0, setup: Optional[Callable] = None):
+    """Re-execute a journal headlessly and return the resulting game
+
+    Stops after ``until`` commands when given. ``game``, ``offset`` and
+    ``done`` continue from a restored state. With ``checkpoint_every``,
+    checkpoint files are (re)written alongside the journal while replaying.
+    ``setup`` is passed to build_game().
+    """
+    header, first = read_header(path)
+    if game is None:
+        game = build_game(header, setup=setup)
+        game.restore(base64.b64decode(header["start"]))
+    if offset is None:
+        offset = first
+    checker = _DrawChecker()
+    checker.commands = done
+    game.journal = checker
+    checkpoints = None
+    if checkpoint_every:
+        checkpoints = _CheckpointWriter(path, checkpoint_every, _read_header_digest(path))
+    try:
+        if until is not None and done >= until:
+            return game
+        for offset, record in read_journal(path, offset):
+            if _apply(game, record, checker):
+                if checkpoints is not None and checker.commands % checkpoint_every == 0:
+                    checkpoints.add(checker.commands, offset, game.snapshot())
+                if until is not None and checker.commands >= until:
+                    break
+    finally:
+        game.journal = None
+        if checkpoints is not None:
+            checkpoints.close()
+    game.renderer.flush()
+    return game
+
+
+def _nearest_checkpoint(path: str, command: int) -> Optional[Tuple[int, int, bytes]]:
+    snapshots, index = checkpoint_paths(path)
+    try:
+        f = open(index, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        head = f.read(_INDEX_HEADER.size)
+        if len(head) < _INDEX_HEADER.size:
+            return None
+        magic, version, _, interval, digest = _INDEX_HEADER.unpack(head)
+        if magic != CHECKPOINT_MAGIC:
+            raise JournalError(f"{index} is not a checkpoint index")
+        if version != CHECKPOINT_VERSION or digest != _read_header_digest(path):
+            # Written by another version, or for another journal: replay instead
+            return None
+        count = (os.fstat(f.fileno()).st_size - _INDEX_HEADER.size) // _INDEX_ENTRY.size
+        slot = min(command // interval, count) - 1
+        if slot < 0:
+            return None
+        f.seek(_INDEX_HEADER.size + slot * _INDEX_ENTRY.size)
+        done, journal_offset, snapshot_offset, length = _INDEX_ENTRY.unpack(f.read(_INDEX_ENTRY.size))
+    with open(snapshots, "rb") as f:
+        f.seek(snapshot_offset)
+        return done, journal_offset, f.read(length)
+
+
+def seek(path: str, command: int, setup: Optional[Callable] = None):
+    """The game as it stood right after ``command`` commands
+
+    Restores the nearest earlier checkpoint, if any, and replays the rest.
+    """
+    header, _ = read_header(path)
+    checkpoint = _nearest_checkpoint(path, command)
+    if checkpoint is None:
+        return replay(path, until=command, setup=setup)
+    done, journal_offset, snapshot = checkpoint
+    game = build_game(header, setup=setup)
+    game.restore(snapshot)
+    return replay(path, until=command, game=game, offset=journal_offset, done=done)
+
+
+def main():
+    """Command line entry point: replay, checkpoint or seek within a journal"""
+    parser = argparse.ArgumentParser(description="Replay Alien Starship command journals.")
+    parser.add_argument("journal")
+    parser.add_argument("--checkpoint-every", type=int, default=0,
+                        help="write checkpoints every N commands while replaying")
+    parser.add_argument("--seek", type=int, help="restore the game after N commands")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.seek is not None:
+        game = seek(args.journal, args.seek)
+    else:
+        game = replay(args.journal, checkpoint_every=args.checkpoint_every)
+    elapsed = time.perf_counter() - start
+    room = game.player.current_room
+    print(f"room: {room.name} (level {room.level})")
+    print(f"inventory: {', '.join(item.name for item in game.player.inventory) or '-'}")
+    print(f"victory: {game.victory}  game over: {game.game_over}")
+    print(f"elapsed: {elapsed * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
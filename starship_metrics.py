@@ -0,0 +1,264 @@
+"""
+Opt-in instrumentation for Alien Starship Adventure.
+enable() installs a recorder that the game checks once per command,
+random event and message; disable() removes it, leaving one global
+variable test on those paths. No handler is wrapped, so instrumentation
+adds no Python frames inside a command: a command's time is attributed to
+its verb, and the only handler timed on its own is trigger_random_event,
+which runs outside commands. Metrics aggregate over every game in the
+process and export as Prometheus text or JSON.
+
+Commands per verb, random events and messages are counted exactly.
+Latency is measured on every ``sample_every``-th call only, because
+reading the clock costs about as much as a small handler; histogram
+buckets therefore hold a sample of calls while their ``calls`` are exact.
+Bucket ``i`` counts calls shorter than ``2 ** (i + 8)`` ns (256 ns,
+512 ns, ... about 2 s), the last one catches the rest.
+"""
+
+from collections import defaultdict
+from typing import Dict, Optional
+import json
+import time
+
+BUCKET_SHIFT = 8
+BUCKET_COUNT = 24
+# Slots for every possible shifted 64-bit duration, so recording needs no clamp
+_SLOTS = 64 - BUCKET_SHIFT + 1
+
+ROLL_HANDLER = "trigger_random_event"
+
+# Outcome of a random event -> message kind that reports it
+RANDOM_OUTCOMES = {"discovery": "event_discovery", "hazard": "event_hazard", "drop": "item_dropped"}
+
+
+class Histogram:
+    """Sampled latencies plus an exact call count"""
+
+    __slots__ = ("slots", "total_ns", "tally")
+
+    def __init__(self):
+        self.slots = [0] * _SLOTS
+        self.total_ns = 0
+        # One-element list, so recorders can bump it through a local
+        self.tally = [0]
+
+    def clear(self):
+        self.slots[:] = [0] * _SLOTS
+        self.total_ns = 0
+        self.tally[0] = 0
+
+    @property
+    def calls(self) -> int:
+        return self.tally[0]
+
+    @property
+    def counts(self) -> list:
+        """Sample counts per bucket, the last bucket holding everything slower"""
+        return self.slots[:BUCKET_COUNT - 1] + [sum(self.slots[BUCKET_COUNT - 1:])]
+
+    @property
+    def count(self) -> int:
+        return sum(self.slots)
+
+    @staticmethod
+    def bound(index: int) -> float:
+        """Upper bound of a bucket in seconds"""
+        return (1 << (index + BUCKET_SHIFT)) / 1e9
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile, in seconds"""
+        counts = self.counts
+        total = sum(counts)
+        if not total:
+            return None
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= q * total:
+                return self.bound(index)
+        return self.bound(BUCKET_COUNT - 1)
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "sampled": self.count,
+            "sum_seconds": self.total_ns / 1e9,
+            "buckets": {f"{self.bound(i):g}": count for i, count in enumerate(self.counts) if count},
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Metrics:
+    """Per-verb and random event latency histograms plus exact counters"""
+
+    def __init__(self, sample_every: int = 64):
+        self.commands: Dict[str, Histogram] = defaultdict(Histogram)
+        self.handlers: Dict[str, Histogram] = defaultdict(Histogram)
+        self.messages: Dict[str, int] = defaultdict(int)
+        self.dispatch = Histogram()
+        self.rolls = self.handlers[ROLL_HANDLER]
+        # Bumped by the game itself, which times a call when the count has
+        # no bits of ``mask`` set; copied into the histograms on export
+        self.command_calls = 0
+        self.verb_calls: Dict[Optional[str], int] = defaultdict(int)
+        self.roll_calls = 0
+        self.sample_every = sample_every
+
+    @property
+    def sample_every(self) -> int:
+        return self.mask + 1
+
+    @sample_every.setter
+    def sample_every(self, sample_every: int):
+        if sample_every < 1 or sample_every & (sample_every - 1):
+            raise ValueError("sample_every must be a power of two")
+        self.mask = sample_every - 1
+
+    # Called by the game on sampled calls only
+
+    def end_command(self, verb: Optional[str], start: int):
+        # Blank lines and unknown verbs are both booked as "unknown"
+        elapsed = time.perf_counter_ns() - start
+        bucket = (elapsed >> BUCKET_SHIFT).bit_length()
+        for histogram in (self.dispatch, self.commands[verb or "unknown"]):
+            histogram.slots[bucket] += 1
+            histogram.total_ns += elapsed
+
+    def end_roll(self, start: int):
+        elapsed = time.perf_counter_ns() - start
+        self.rolls.slots[(elapsed >> BUCKET_SHIFT).bit_length()] += 1
+        self.rolls.total_ns += elapsed
+
+    def reset(self):
+        """Zero every metric in place"""
+        for histogram in list(self.commands.values()) + list(self.handlers.values()):
+            histogram.clear()
+        self.commands.clear()
+        self.dispatch.clear()
+        self.command_calls = 0
+        self.verb_calls.clear()
+        self.roll_calls = 0
+        for kind in self.messages:
+            self.messages[kind] = 0
+
+    @property
+    def total_commands(self) -> int:
+        return self.command_calls
+
+    @property
+    def failed_moves(self) -> int:
+        return self.messages["no_exit"] + self.messages["blocked"]
+
+    @property
+    def random_rolls(self) -> int:
+        return self.roll_calls
+
+    def _sync(self):
+        # Exact counts are kept as plain ints for the game to bump cheaply
+        self.dispatch.tally[0] = self.command_calls
+        self.rolls.tally[0] = self.roll_calls
+        for verb, calls in list(self.verb_calls.items()):
+            self.commands[verb or "unknown"].tally[0] = calls
+
+    def as_dict(self) -> dict:
+        """JSON-ready snapshot of every metric"""
+        self._sync()
+        return {
+            "timestamp": time.time(),
+            "commands_total": self.total_commands,
+            "commands": {verb: histogram.as_dict() for verb, histogram in sorted(self.commands.items())},
+            "handlers": {name: histogram.as_dict() for name, histogram in sorted(self.handlers.items())},
+            "messages": dict(sorted(self.messages.items())),
+            "failed_moves": self.failed_moves,
+            "lock_hits": {"blocked": self.messages["blocked"], "unlocked": self.messages["unlock"]},
+            "inventory_full": self.messages["inventory_full"],
+            "random_events": {
+                "rolls": self.random_rolls,
+                **{outcome: self.messages[kind] for outcome, kind in RANDOM_OUTCOMES.items()},
+            },
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.as_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        self._sync()
+        lines = []
+
+        def histogram(name: str, label: str, histograms: Dict[str, Histogram], help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, histogram in sorted(histograms.items()):
+                cumulative = 0
+                for index, count in enumerate(histogram.counts[:-1]):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{label}="{key}",le="{Histogram.bound(index):g}"}} {cumulative}')
+                total = cumulative + histogram.counts[-1]
+                lines.append(f'{name}_bucket{{{label}="{key}",le="+Inf"}} {total}')
+                lines.append(f'{name}_sum{{{label}="{key}"}} {histogram.total_ns / 1e9:.9f}')
+                lines.append(f'{name}_count{{{label}="{key}"}} {total}')
+
+        def counter(name: str, help_text: str, samples: Dict[str, int]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in samples.items():
+                lines.append(f"{name}{labels} {value}")
+
+        histogram("starship_command_duration_seconds", "verb", self.commands,
+                  "Time to execute one command, by verb (sampled)")
+        histogram("starship_handler_duration_seconds", "handler", self.handlers,
+                  "Time spent in a game handler run outside commands (sampled)")
+        counter("starship_commands_total", "Commands executed", {"": self.total_commands})
+        counter("starship_command_calls_total", "Commands executed, by verb",
+                {f'{{verb="{verb}"}}': histogram.calls
+                 for verb, histogram in sorted(self.commands.items())})
+        counter("starship_handler_calls_total", "Game handler calls, by handler",
+                {f'{{handler="{name}"}}': histogram.calls
+                 for name, histogram in sorted(self.handlers.items())})
+        counter("starship_messages_total", "Messages reported to players, by kind",
+                {f'{{kind="{kind}"}}': count for kind, count in sorted(self.messages.items())})
+        counter("starship_failed_moves_total", "Moves that went nowhere or hit a lock",
+                {"": self.failed_moves})
+        counter("starship_lock_hits_total", "Moves into locked rooms, by result",
+                {'{result="blocked"}': self.messages["blocked"],
+                 '{result="unlocked"}': self.messages["unlock"]})
+        counter("starship_inventory_full_total", "Items not taken because the inventory was full",
+                {"": self.messages["inventory_full"]})
+        counter("starship_random_event_rolls_total", "Random event rolls", {"": self.random_rolls})
+        counter("starship_random_events_total", "Random events that did something, by outcome",
+                {f'{{outcome="{outcome}"}}': self.messages[kind]
+                 for outcome, kind in RANDOM_OUTCOMES.items()})
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+def enable(metrics: Metrics = METRICS, sample_every: int = 64) -> Metrics:
+    """Start recording into ``metrics`` for every game in this process
+
+    ``sample_every`` must be a power of two; 1 times every call, at
+    several times the overhead.
+    """
+    import alien_starship_adventure
+
+    metrics.sample_every = sample_every
+    alien_starship_adventure.set_metrics(metrics)
+    return metrics
+
+
+def disable():
+    """Stop recording; the collected metrics are kept"""
+    import alien_starship_adventure
+
+    alien_starship_adventure.set_metrics(None)
+
+
+def enabled() -> bool:
+    import alien_starship_adventure
+
+    return alien_starship_adventure._metrics is not None
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Vectorized Monte Carlo of random events for Alien Starship Adventure.
+Advances N games in lockstep with NumPy: player rooms, inventories, room
+contents and locks live in arrays, every turn draws all of its random
+numbers in one call, and the random event rules and a movement policy are
+applied with masked array operations. Used to estimate item discovery,
+inventory loss and time-to-victory distributions over millions of turns.
+
+Each turn mirrors the game loop: a random event (5% discovery of a bonus
+item, 5% hazard with a 50% chance of dropping one carried item), then one
+policy action. Inventories are per-item counts rather than bitsets because
+discoveries can stack several units of an item.
+
+State is dense: room contents take games x rooms x items int32 counts, and
+setup walks every room once, materializing a generated ship in full. It
+suits the stock ship and generated ships of a few thousand rooms; batches
+whose arrays would exceed MAX_STATE_BYTES are refused, so run fewer games
+per batch instead. Each turn adds at most one unit to any count, and
+step() stops at ``max_turns``, before an int32 count could overflow.
+
+Requires NumPy, which the game itself does not.
+"""
+
+from typing import Callable, Optional
+import argparse
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from starship_world import DIRECTION_COUNT, NO_EXIT, NO_ITEM
+
+DISCOVERY_CHANCE = 0.05
+HAZARD_CHANCE = 0.05
+FUMBLE_CHANCE = 0.5
+
+# Largest per-batch state, in bytes, BatchSimulator agrees to allocate
+MAX_STATE_BYTES = 2 << 30
+_COUNT_MAX = 2 ** 31 - 1
+
+# Random columns drawn per game per turn
+_ROLL, _BONUS, _FUMBLE, _DROP, _MOVE = range(5)
+_DRAWS = 5
+
+# Policy(sim, games, uniforms) -> a direction index for each listed game
+MovementPolicy = Callable[["BatchSimulator", "np.ndarray", "np.ndarray"], "np.ndarray"]
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("starship_montecarlo needs NumPy: pip install numpy")
+
+
+def random_exit_policy(sim: "BatchSimulator", games: "np.ndarray", uniform: "np.ndarray") -> "np.ndarray":
+    """Pick one of the current room's exits uniformly, like explorer_policy"""
+    rooms = sim.room[games]
+    pick = (uniform * sim.exit_counts[rooms]).astype(np.int64)
+    return sim.exit_choices[rooms, pick]
+
+
+class BatchSimulator:
+    """N copies of one ship advanced turn by turn
+
+    ``take_items`` makes the policy pick up an item in sight before moving
+    on, as ``starship_sim.explorer_policy`` does: the room's original item
+    if still there (rooms list items in arrival order), else the lowest
+    item ID. The movement policy then only decides where to go.
+    """
+
+    def __init__(self, games: int, seed: Optional[int] = None, ship=None,
+                 policy: Optional[MovementPolicy] = None, take_items: bool = True):
+        _require_numpy()
+        from alien_starship_adventure import AlienStarshipGame, BONUS_ITEMS
+        from starship_render import NullRenderer
+
+        template = AlienStarshipGame(seed=0, renderer=NullRenderer(), ship=ship)
+        world = template.world
+        rooms = world.room_count
+        items = len(world.item_names)
+        # room_items and room_totals (int32), locked (bool), inventory (int32)
+        state_bytes = games * (rooms * (items * 4 + 4 + 1) + items * 4)
+        if state_bytes > MAX_STATE_BYTES:
+            raise ValueError(f"{games} games of a {rooms}-room, {items}-item ship need "
+                             f"{state_bytes / 2 ** 30:.1f} GiB of state; "
+                             f"run at most {MAX_STATE_BYTES // (state_bytes // games)} games per batch")
+        self.world = world
+        self.games = games
+        self.rng = np.random.default_rng(seed)
+        self.policy = policy or random_exit_policy
+        self.take_items = take_items
+        self.max_inventory = template.player.max_inventory
+
+        self.exits = np.asarray(world.exits, dtype=np.int32).reshape(rooms, DIRECTION_COUNT)
+        self.required = np.asarray(world.required, dtype=np.int16)
+        self.bonus_items = np.array([world.item_ids[name] for name in BONUS_ITEMS
+                                     if name in world.item_ids], dtype=np.int64)
+        self.beacon = world.item_ids["emergency_beacon"]
+        self.pod_rooms = np.zeros(rooms, dtype=bool)
+        self.pod_rooms[world.escape_pod_rooms()] = True
+        # exit_choices[room, k] is the direction of the room's k-th exit
+        valid = self.exits != NO_EXIT
+        self.exit_counts = valid.sum(axis=1)
+        self.exit_choices = np.zeros((rooms, DIRECTION_COUNT), dtype=np.int64)
+        for room_id in range(rooms):
+            directions = np.flatnonzero(valid[room_id])
+            self.exit_choices[room_id, :directions.size] = directions
+
+        start_items = np.zeros((rooms, items), dtype=np.int32)
+        start_locked = np.zeros(rooms, dtype=bool)
+        for room_id in range(rooms):
+            start_locked[room_id] = world.starts_locked(room_id)
+            for item, count in template.room_list[room_id].items.grouped():
+                start_items[room_id, world.item_ids[item.name]] = count
+
+        self.room = np.full(games, template.player.current_room.id, dtype=np.int64)
+        self.inventory = np.zeros((games, items), dtype=np.int32)
+        self.carried = np.zeros(games, dtype=np.int64)
+        self.start_items = start_items
+        self.room_items = np.broadcast_to(start_items, (games, rooms, items)).copy()
+        # Units per room, kept alongside room_items so presence checks stay 2-D
+        self.room_totals = np.broadcast_to(start_items.sum(axis=1, dtype=np.int32),
+                                           (games, rooms)).copy()
+        self.locked = np.broadcast_to(start_locked, (games, rooms)).copy()
+        self.turn = 0
+        # A turn adds at most one unit to a room, so counts fit int32 until then
+        self.max_turns = _COUNT_MAX - int(self.room_totals[0].max(initial=0))
+        self.victory_turn = np.full(games, -1, dtype=np.int64)
+        self.items_lost = np.zeros(games, dtype=np.int64)
+        self.discoveries = np.zeros(games, dtype=np.int64)
+
+    @property
+    def active(self) -> "np.ndarray":
+        return self.victory_turn < 0
+
+    def step(self):
+        """Advance every unfinished game by one turn"""
+        live = np.flatnonzero(self.active)
+        if not live.size:
+            return
+        if self.turn >= self.max_turns:
+            raise OverflowError(f"item counts could overflow after {self.max_turns} turns")
+        draws = self.rng.random((live.size, _DRAWS))
+        self._random_events(live, draws)
+        self._act(live, draws)
+        self.turn += 1
+
+    def run(self, turns: int) -> "MonteCarloResult":
+        for _ in range(turns):
+            if not self.active.any():
+                break
+            self.step()
+        return MonteCarloResult(self)
+
+    def _random_events(self, live: "np.ndarray", draws: "np.ndarray"):
+        roll = draws[:, _ROLL]
+        rooms = self.room[live]
+
+        found = roll < DISCOVERY_CHANCE
+        if found.any() and len(self.bonus_items):
+            games = live[found]
+            bonus = self.bonus_items[(draws[found, _BONUS] * len(self.bonus_items)).astype(np.int64)]
+            self.room_items[games, rooms[found], bonus] += 1
+            self.room_totals[games, rooms[found]] += 1
+            self.discoveries[games] += 1
+
+        carried = self.carried[live]
+        fumble = ((roll >= DISCOVERY_CHANCE) & (roll < DISCOVERY_CHANCE + HAZARD_CHANCE)
+                  & (carried > 0) & (draws[:, _FUMBLE] < FUMBLE_CHANCE))
+        if fumble.any():
+            games = live[fumble]
+            # Every carried unit is equally likely to slip, as with rng.choice(list(inventory))
+            units = np.cumsum(self.inventory[games], axis=1)
+            pick = (draws[fumble, _DROP] * carried[fumble]).astype(np.int64)
+            dropped = np.argmax(units > pick[:, None], axis=1)
+            self.inventory[games, dropped] -= 1
+            self.carried[games] -= 1
+            self.room_items[games, rooms[fumble], dropped] += 1
+            self.room_totals[games, rooms[fumble]] += 1
+            self.items_lost[games] += 1
+
+    def _act(self, live: "np.ndarray", draws: "np.ndarray"):
+        rooms = self.room[live]
+        moving = np.ones(live.size, dtype=bool)
+        if self.take_items:
+            can_take = (self.room_totals[live, rooms] > 0) & (self.carried[live] < self.max_inventory)
+            if can_take.any():
+                games = live[can_take]
+                rooms = rooms[can_take]
+                present = self.room_items[games, rooms] > 0
+                # Rooms list their original items before later arrivals
+                original = present & (self.start_items[rooms] > 0)
+                taken = np.where(original.any(axis=1), np.argmax(original, axis=1),
+                                 np.argmax(present, axis=1))
+                self.room_items[games, rooms, taken] -= 1
+                self.room_totals[games, rooms] -= 1
+                self.inventory[games, taken] += 1
+                self.carried[games] += 1
+                won = (taken == self.beacon) & self.pod_rooms[rooms]
+                self.victory_turn[games[won]] = self.turn + 1
+            moving = ~can_take
+
+        if not moving.any():
+            return
+        games = live[moving]
+        direction = self.policy(self, games, draws[moving, _MOVE])
+        target = self.exits[self.room[games], direction]
+        real = target >= 0
+        games, target = games[real], target[real]
+        blocked = self.locked[games, target]
+        if blocked.any():
+            need = self.required[target].astype(np.int64)
+            opens = blocked & (need != NO_ITEM) & (self.inventory[games, np.maximum(need, 0)] > 0)
+            self.locked[games[opens], target[opens]] = False
+            passes = ~blocked | opens
+            games, target = games[passes], target[passes]
+        self.room[games] = target
+
+
+class MonteCarloResult:
+    """Distributions collected from a finished batch"""
+
+    def __init__(self, sim: BatchSimulator):
+        self.games = sim.games
+        self.turns = sim.turn
+        self.victory_turn = sim.victory_turn.copy()
+        self.items_lost = sim.items_lost.copy()
+        self.discoveries = sim.discoveries.copy()
+
+    @property
+    def wins(self) -> int:
+        return int((self.victory_turn >= 0).sum())
+
+    def time_to_victory(self, bins: int = 20):
+        """Histogram (counts, bin edges) of the turn each winning game finished on"""
+        won = self.victory_turn[self.victory_turn >= 0]
+        return np.histogram(won, bins=bins) if won.size else (np.zeros(0, np.int64), np.zeros(0))
+
+    def inventory_loss(self):
+        """Number of games that lost 0, 1, 2, ... items"""
+        return np.bincount(self.items_lost)
+
+    def as_dict(self) -> dict:
+        won = self.victory_turn[self.victory_turn >= 0]
+        quantiles = np.percentile(won, [10, 50, 90]).tolist() if won.size else [None] * 3
+        return {
+            "games": self.games,
+            "turns": self.turns,
+            "wins": self.wins,
+            "win_rate": self.wins / self.games,
+            "mean_turns_to_victory": float(won.mean()) if won.size else None,
+            "turns_to_victory_p10_p50_p90": quantiles,
+            "mean_items_lost": float(self.items_lost.mean()),
+            "items_lost_distribution": self.inventory_loss().tolist(),
+            "mean_discoveries": float(self.discoveries.mean()),
+        }
+
+
+def simulate(games: int, turns: int = 1000, seed: Optional[int] = None, ship=None,
+             policy: Optional[MovementPolicy] = None, take_items: bool = True) -> MonteCarloResult:
+    """Run ``games`` lockstep games for up to ``turns`` turns"""
+    return BatchSimulator(games, seed, ship, policy, take_items).run(turns)
+
+
+def main():
+    """Command line entry point for batched Monte Carlo runs"""
+    parser = argparse.ArgumentParser(description="Vectorized Monte Carlo of Alien Starship random events.")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--turns", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-take", action="store_true", help="only wander, never pick items up")
+    args = parser.parse_args()
+
+    result = simulate(args.games, args.turns, args.seed, take_items=not args.no_take)
+    for key, value in result.as_dict().items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Shared-world multiplayer for Alien Starship Adventure.
+A Crew holds one set of rooms that many players explore at once, each
+player being an ordinary AlienStarshipGame with its own inventory, RNG,
+renderer, visited rooms and victory, joined to the crew's rooms and room
+locks.
+
+Every room has its own lock; there is no global one. Taking an item,
+items appearing from random events or hazard drops, revealing the hidden
+keycard and opening a lock each run under the lock of the one room they
+change, and no code path holds two room locks at once, so players in
+different rooms never wait for each other and there is no lock ordering
+to get wrong. Two players reaching for the last beacon in a bay are
+serialized: exactly one of them takes it.
+
+Rooms are materialized lazily, as in single-player games, under one
+crew-wide lock taken only when a room is touched for the first time, so
+every player gets the same copy. Each player must be driven by one thread
+at a time. Opening a lock is logged on the crew and every player's router
+catches up on the log before planning a ``goto``. Hints are not offered in
+shared games, since the planner would have to read every room while other
+players change them.
+
+The stress harness runs many players on many threads and then checks that
+every item unit on the ship is accounted for: what lies in rooms plus
+what players carry equals the starting items plus what random events
+created.
+
+Threads do not scale on CPython with the GIL: only one thread runs game
+code at a time, so more threads add lock and switching overhead but no
+throughput. The locks are there for correctness, and a free-threaded build
+runs players in different rooms in parallel. To use several cores today,
+stress_processes() shards players into one crew per process, the way a
+server would host several ship instances; each crew plays on one thread
+without contention and throughput grows with the number of cores, but
+players only share a ship with the crewmates in their own process.
+"""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+import argparse
+import random
+import sys
+import threading
+import time
+
+from alien_starship_adventure import COMMANDS, AlienStarshipGame
+from starship_generator import LazyRooms
+from starship_journal import build_ship, world_spec
+from starship_render import NullRenderer
+from starship_world import DIRECTIONS
+
+
+def _no_hint(game: AlienStarshipGame, command):
+    game.output("The ship's computer is too busy tracking the whole crew to give hints.", "hint")
+
+
+class _SharedRooms(LazyRooms):
+    """LazyRooms that materialize each room once, whichever thread asks first"""
+
+    __slots__ = ("_lock",)
+
+    def __init__(self, ship, items):
+        super().__init__(ship, items)
+        self._lock = threading.Lock()
+
+    def room_at(self, room_id: int):
+        room = self.materialized.get(room_id)
+        if room is None:
+            with self._lock:
+                room = LazyRooms.room_at(self, room_id)
+        return room
+
+
+class Crew:
+    """Players sharing one ship's rooms, with a lock per room"""
+
+    def __init__(self, ship=None):
+        self.ship = ship
+        host = AlienStarshipGame(seed=0, renderer=NullRenderer(), ship=ship)
+        self.world = host.world
+        self.items = host.items
+        self.rooms = _SharedRooms(host.rooms.ship, host.rooms.items)
+        self.room_list = self.rooms.by_id
+        self.start_room = host.player.current_room.id
+        self.room_locks = [threading.Lock() for _ in range(self.world.room_count)]
+        self.commands = dict(COMMANDS)
+        self.commands["hint"] = _no_hint
+        self.players: List[AlienStarshipGame] = []
+        # IDs of the rooms opened so far, in order; list appends are atomic
+        self.unlocks: List[int] = []
+        self._unlocks_seen: Dict[AlienStarshipGame, int] = {}
+
+    def unlocked(self, room_id: int):
+        """A player opened a lock; every router learns of it on its next route"""
+        self.unlocks.append(room_id)
+
+    def update_router(self, game: AlienStarshipGame):
+        """Invalidate what ``game``'s router cached before the latest unlocks
+
+        Runs on the player's own thread, so routers are never changed
+        under a player that is planning a route.
+        """
+        seen = self._unlocks_seen.get(game, 0)
+        unlocks = self.unlocks
+        count = len(unlocks)
+        for room_id in unlocks[seen:count]:
+            game.router.unlocked(room_id)
+        self._unlocks_seen[game] = count
+
+    def join(self, seed: Optional[int] = None, renderer=None) -> AlienStarshipGame:
+        """A new player in the start room; returns the player's game"""
+        game = AlienStarshipGame(seed=seed, renderer=renderer, ship=self.ship)
+        game.rooms = self.rooms
+        game.room_list = self.room_list
+        game.room_locks = self.room_locks
+        game.visited = set()
+        game.commands = self.commands
+        game.crew = self
+        game.player.current_room = self.room_list[self.start_room]
+        self.players.append(game)
+        return game
+
+    def census(self) -> Counter:
+        """Item units in every room and every player's inventory
+
+        Each room is counted under its lock; the total is only a consistent
+        snapshot while no player is running. Rooms nobody has touched yet
+        count their starting items without being materialized.
+        """
+        units = Counter()
+        materialized = dict(self.rooms.materialized)
+        for room_id in range(self.world.room_count):
+            room = materialized.get(room_id)
+            if room is None:
+                units.update(self.world.initial_items(room_id))
+                continue
+            with self.room_locks[room_id]:
+                for item, count in room.items.grouped():
+                    units[item.name] += count
+        for game in self.players:
+            for item, count in game.player.inventory.grouped():
+                units[item.name] += count
+        return units
+
+
+class _Tally:
+    """Stands in for a journal to count the items random events create"""
+
+    def __init__(self):
+        self.created = Counter()
+
+    def event(self, draws: list):
+        # A discovery records the item's name; a hazard records only numbers
+        # and the name of an item that changed hands without being created
+        if len(draws) > 1 and isinstance(draws[1], str):
+            self.created[draws[1]] += 1
+
+    def command(self, command):
+        pass
+
+
+def _bag_errors(bag, where: str) -> List[str]:
+    units = sum(count for _, count in bag.grouped())
+    if units != len(bag):
+        return [f"{where}: bag holds {units} units but counts {len(bag)}"]
+    return []
+
+
+def _play(games: List[AlienStarshipGame], steps: int, seed: int, barrier: threading.Barrier,
+          failures: List[str]):
+    rng = random.Random(seed)
+    moves = [f"go {direction}" for direction in DIRECTIONS]
+    barrier.wait()
+    try:
+        for _ in range(steps):
+            for game in games:
+                game.trigger_random_event()
+                room = game.player.current_room
+                command = None
+                if rng.random() < 0.5:
+                    with game.room_lock(room):
+                        names = [item.name for item, _ in room.items.grouped()]
+                    if names:
+                        command = "take " + rng.choice(names)
+                game.handle_command(command or rng.choice(moves))
+    except Exception as exc:
+        failures.append(f"{threading.current_thread().name}: {type(exc).__name__}: {exc}")
+
+
+def stress(players: int = 16, threads: int = 4, steps: int = 2000, seed: int = 0, ship=None,
+           switch_interval: Optional[float] = 1e-6, locked: bool = True) -> Dict[str, object]:
+    """Play ``players`` random players on ``threads`` threads and audit every item
+
+    ``switch_interval`` shortens the interpreter's thread switch interval
+    for the run so threads interleave inside game code as often as
+    possible. With ``locked`` false the room locks are left off, which
+    should make the audit fail sooner or later.
+    """
+    crew = Crew(ship)
+    before = crew.census()
+    tallies = []
+    for player in range(players):
+        game = crew.join(seed=seed + player, renderer=NullRenderer())
+        game.journal = _Tally()
+        tallies.append(game.journal)
+        if not locked:
+            game.room_locks = None
+
+    groups = [crew.players[i::threads] for i in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+    errors: List[str] = []
+    workers = [threading.Thread(target=_play, args=(group, steps, seed * 1000 + i, barrier, errors))
+               for i, group in enumerate(groups)]
+    previous = sys.getswitchinterval()
+    if switch_interval is not None:
+        sys.setswitchinterval(switch_interval)
+    try:
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.setswitchinterval(previous)
+
+    created = Counter()
+    for tally in tallies:
+        created.update(tally.created)
+    expected = before + created
+    after = crew.census()
+    for name in sorted(set(expected) | set(after)):
+        if after[name] > expected[name]:
+            errors.append(f"{name}: {after[name] - expected[name]} duplicated")
+        elif after[name] < expected[name]:
+            errors.append(f"{name}: {expected[name] - after[name]} lost")
+    for room in crew.rooms.materialized.values():
+        errors.extend(_bag_errors(room.items, room.name))
+    for number, game in enumerate(crew.players):
+        errors.extend(_bag_errors(game.player.inventory, f"player {number}"))
+    return {
+        "players": players,
+        "threads": threads,
+        "commands": players * steps,
+        "commands_per_second": players * steps / elapsed,
+        "items_created": sum(created.values()),
+        "items_dropped": sum(game.items_dropped for game in crew.players),
+        "winners": sum(game.victory for game in crew.players),
+        "errors": errors,
+    }
+
+
+def _stress_crew(players: int, steps: int, seed: int, ship: Optional[dict]) -> Dict[str, object]:
+    return stress(players, threads=1, steps=steps, seed=seed, ship=build_ship(ship),
+                  switch_interval=None)
+
+
+def stress_processes(players: int = 16, processes: int = 4, steps: int = 2000, seed: int = 0,
+                     ship=None) -> Dict[str, object]:
+    """Like stress(), with the players split into one crew per process
+
+    Each process rebuilds the ship from its ship_spec() and audits its own
+    crew. Throughput is all commands over the slowest crew's playing time,
+    leaving out process start-up.
+    """
+    sizes = [players // processes + (number < players % processes) for number in range(processes)]
+    spec = world_spec(ship) if ship is not None else None
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_stress_crew, size, steps, seed * 1000 + number, spec)
+                   for number, size in enumerate(sizes) if size]
+        reports = [future.result() for future in futures]
+    commands = sum(report["commands"] for report in reports)
+    elapsed = max(report["commands"] / report["commands_per_second"] for report in reports)
+    return {
+        "players": players,
+        "processes": len(reports),
+        "commands": commands,
+        "commands_per_second": commands / elapsed,
+        "items_created": sum(report["items_created"] for report in reports),
+        "items_dropped": sum(report["items_dropped"] for report in reports),
+        "winners": sum(report["winners"] for report in reports),
+        "errors": [f"crew {number}: {error}" for number, report in enumerate(reports)
+                   for error in report["errors"]],
+    }
+
+
+def main():
+    """Command line entry point: stress shared-world play and audit the items"""
+    parser = argparse.ArgumentParser(description="Stress-test shared-world Alien Starship play.")
+    parser.add_argument("--players", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--steps", type=int, default=2000, help="turns per player")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--unlocked", action="store_true", help="leave the room locks off")
+    parser.add_argument("--processes", type=int,
+                        help="shard the players into one crew per process instead of threads")
+    args = parser.parse_args()
+
+    if args.processes:
+        report = stress_processes(args.players, args.processes, args.steps, args.seed)
+    else:
+        report = stress(args.players, args.threads, args.steps, args.seed, locked=not args.unlocked)
+    for key, value in report.items():
+        if key == "errors":
+            continue
+        print(f"{key}: {value:,.0f}" if isinstance(value, float) else f"{key}: {value}")
+    if report["errors"]:
+        print(f"audit FAILED, {len(report['errors'])} problem(s):")
+        for error in report["errors"][:20]:
+            print(f"  {error}")
+        sys.exit(1)
+    print("audit passed: no item duplicated or lost")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Incremental reachability and softlock detection for Alien Starship Adventure.
+A Reachability tracker keeps the set of rooms the player can still get to,
+given the items carried, the items lying in reachable rooms and the lock
+state, and notices when the game can no longer be won.
+
+Items are never consumed, so within one reachable region the set only
+grows: taking, dropping (items fall into the current room) and unlocking
+leave it unchanged, and an item appearing in a reachable room can only open
+more locks. The set can shrink only when a move has no way back, which is
+where one-way and asymmetric exits matter. Each update therefore costs
+O(rooms newly reached), and a move costs O(1) when the target has an exit
+straight back; only moves with no such exit search the graph, and that
+search stops as soon as it finds a way back.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import argparse
+import time
+
+from starship_world import DIRECTIONS, NO_ITEM, OPPOSITE
+
+BEACON = "emergency_beacon"
+
+
+class _Region:
+    """Rooms reached from one start room, with the keys they provide"""
+
+    __slots__ = ("reach", "count", "keys", "waiting")
+
+    def __init__(self, room_count: int, keys: Set[int]):
+        self.reach = bytearray(room_count)
+        self.count = 0
+        self.keys = keys
+        # Key item ID -> locked rooms next to the region that it would open
+        self.waiting: Dict[int, List[int]] = defaultdict(list)
+
+
+class Reachability:
+    """Rooms reachable from the player, kept up to date as the game runs
+
+    Attach with ``Reachability(game)``; the game then reports moves and
+    items appearing in rooms. ``softlocked`` is true once no reachable
+    escape pod bay holds a beacon; with ``warn`` set the player is told the
+    first time that happens. Inventory capacity is ignored: a full
+    inventory only waits for a hazard to free a slot, and reachability is
+    optimistic when the player would have to juggle more than ten keys.
+    """
+
+    def __init__(self, game, warn: bool = True):
+        self.game = game
+        self.world = game.world
+        self.warn = warn
+        self._key_items = self.world.lock_items()
+        self._pod_rooms = self.world.escape_pod_rooms()
+        self.searches = 0
+        self.rebuild()
+        game.reachability = self
+
+    def rebuild(self):
+        """Recompute from scratch, e.g. after restoring a snapshot"""
+        self._live = getattr(self.game.rooms, "materialized", None)
+        self._region = self._search(self.game.player.current_room.id)
+        # Moves known to lead back into the current region
+        self._returns: Set[Tuple[int, int]] = set()
+        self.softlocked = self._softlocked()
+
+    def _room(self, room_id: int):
+        if self._live is None:
+            return self.game.room_list[room_id]
+        return self._live.get(room_id)
+
+    def _locked(self, room_id: int) -> bool:
+        room = self._room(room_id)
+        return room.locked if room is not None else self.world.starts_locked(room_id)
+
+    def _item_ids(self, room_id: int) -> List[int]:
+        room = self._room(room_id)
+        item_ids = self.world.item_ids
+        if room is not None:
+            return [item_ids.get(item.name, NO_ITEM) for item, _ in room.items.grouped()]
+        return [item_ids.get(name, NO_ITEM) for name in self.world.initial_items(room_id)]
+
+    def _carried_keys(self) -> Set[int]:
+        item_ids = self.world.item_ids
+        keys = set()
+        for item, _ in self.game.player.inventory.grouped():
+            item_id = item_ids.get(item.name, NO_ITEM)
+            if item_id in self._key_items:
+                keys.add(item_id)
+        return keys
+
+    def _expand(self, region: _Region, stack: List[int], goal: Optional[int] = None) -> bool:
+        """Flood the region from already marked rooms; True if ``goal`` is reached"""
+        world = self.world
+        required = world.required
+        key_items = self._key_items
+        reach, keys, waiting = region.reach, region.keys, region.waiting
+        while stack:
+            room_id = stack.pop()
+            if room_id == goal:
+                return True
+            for item_id in self._item_ids(room_id):
+                if item_id in key_items and item_id not in keys:
+                    keys.add(item_id)
+                    for target in waiting.pop(item_id, ()):
+                        if not reach[target]:
+                            reach[target] = 1
+                            region.count += 1
+                            stack.append(target)
+            for _, target in world.neighbors(room_id):
+                if reach[target]:
+                    continue
+                if self._locked(target):
+                    key = required[target]
+                    if key == NO_ITEM:
+                        continue
+                    if key not in keys:
+                        waiting[key].append(target)
+                        continue
+                reach[target] = 1
+                region.count += 1
+                stack.append(target)
+        return False
+
+    def _search(self, start: int, goal: Optional[int] = None) -> Optional[_Region]:
+        """The region around ``start``, or None as soon as it turns out to contain ``goal``"""
+        self.searches += 1
+        region = _Region(self.world.room_count, self._carried_keys())
+        region.reach[start] = 1
+        region.count = 1
+        if self._expand(region, [start], goal):
+            return None
+        return region
+
+    def _softlocked(self) -> bool:
+        if self.game.victory:
+            return False
+        reach = self._region.reach
+        for room_id in self._pod_rooms:
+            if reach[room_id]:
+                room = self._room(room_id)
+                if room is not None:
+                    if BEACON in room.items:
+                        return False
+                elif BEACON in self.world.initial_items(room_id):
+                    return False
+        return True
+
+    def _check(self):
+        softlocked = self._softlocked()
+        if softlocked and not self.softlocked and self.warn:
+            self.game.output("The ship's computer warns: there is no longer any way off this ship.",
+                             "softlock")
+        self.softlocked = softlocked
+
+    # Notifications from the game
+
+    def moved(self, origin: int, target: int):
+        """The player walked from ``origin`` into ``target``"""
+        self._live = getattr(self.game.rooms, "materialized", None)
+        if any(back == origin for _, back in self.world.neighbors(target)):
+            return
+        if (origin, target) in self._returns:
+            return
+        region = self._search(target, goal=origin)
+        if region is None:
+            self._returns.add((origin, target))
+            return
+        self._region = region
+        self._returns.clear()
+        self._check()
+
+    def item_placed(self, room_id: int, item):
+        """An item appeared in a room (discovered, revealed or dropped)"""
+        region = self._region
+        item_id = self.world.item_ids.get(item.name, NO_ITEM)
+        if region.reach[room_id] and item_id in self._key_items and item_id not in region.keys:
+            region.keys.add(item_id)
+            stack = []
+            for target in region.waiting.pop(item_id, ()):
+                if not region.reach[target]:
+                    region.reach[target] = 1
+                    region.count += 1
+                    stack.append(target)
+            self._expand(region, stack)
+        self._check()
+
+    def item_taken(self, room_id: int, item):
+        """The player picked up an item; taking the beacon from a pod bay wins"""
+        self._check()
+
+    # Queries
+
+    @property
+    def reachable_count(self) -> int:
+        return self._region.count
+
+    def is_reachable(self, room_id: int) -> bool:
+        return bool(self._region.reach[room_id])
+
+    def unreachable(self) -> Iterator[int]:
+        """IDs of every room the player can no longer get to"""
+        reach = self._region.reach
+        return (room_id for room_id in range(self.world.room_count) if not reach[room_id])
+
+    def status(self) -> dict:
+        return {
+            "reachable_rooms": self.reachable_count,
+            "unreachable_rooms": self.world.room_count - self.reachable_count,
+            "keys_available": sorted(self.world.item_names[i] for i in self._region.keys),
+            "softlocked": self.softlocked,
+            "searches": self.searches,
+        }
+
+
+def asymmetric_exits(world) -> Iterator[Tuple[int, int, int, bool]]:
+    """Yield (room ID, direction, target ID, one way) for exits the target does not mirror
+
+    An exit is asymmetric when the target's opposite exit leads elsewhere;
+    it is one way when no exit of the target leads back at all.
+    """
+    for room_id in range(world.room_count):
+        for direction, target in world.neighbors(room_id):
+            if world.exit(target, OPPOSITE[direction]) != room_id:
+                one_way = not any(back == room_id for _, back in world.neighbors(target))
+                yield room_id, direction, target, one_way
+
+
+def main():
+    """Command line entry point: report the exit graph and watch random playthroughs"""
+    from alien_starship_adventure import AlienStarshipGame
+    from starship_generator import ProceduralShip
+    from starship_render import NullRenderer
+    from starship_sim import explorer_policy
+    import random
+
+    parser = argparse.ArgumentParser(description="Reachability and softlock report for a ship.")
+    parser.add_argument("--ship-seed", type=int, help="analyze a generated ship instead of the stock one")
+    parser.add_argument("--levels", type=int, default=5)
+    parser.add_argument("--width", type=int, default=16)
+    parser.add_argument("--height", type=int, default=16)
+    parser.add_argument("--runs", type=int, default=100, help="random playthroughs to watch")
+    parser.add_argument("--max-steps", type=int, default=1000)
+    args = parser.parse_args()
+
+    def new_ship():
+        if args.ship_seed is None:
+            return None
+        return ProceduralShip(args.ship_seed, args.levels, args.width, args.height)
+
+    game = AlienStarshipGame(seed=0, renderer=NullRenderer(), ship=new_ship())
+    world = game.world
+    tracker = Reachability(game)
+    print(f"rooms: {world.room_count}, reachable from the start: {tracker.reachable_count}")
+    for room_id in tracker.unreachable():
+        print(f"  unreachable: {world.room_names[room_id]}")
+    for room_id, direction, target, one_way in asymmetric_exits(world):
+        kind = "one-way" if one_way else "asymmetric"
+        print(f"  {kind} exit: {world.room_names[room_id]} {DIRECTIONS[direction]} -> "
+              f"{world.room_names[target]}")
+
+    softlocks = 0
+    steps = 0
+    elapsed = 0.0
+    for seed in range(args.runs):
+        game = AlienStarshipGame(seed=seed, renderer=NullRenderer(), ship=new_ship())
+        tracker = Reachability(game, warn=False)
+        rng = random.Random(seed)
+        for _ in range(args.max_steps):
+            if game.victory or game.game_over:
+                break
+            start = time.perf_counter()
+            game.trigger_random_event()
+            game.handle_command(explorer_policy(game, rng))
+            elapsed += time.perf_counter() - start
+            steps += 1
+        softlocks += tracker.softlocked
+    print(f"playthroughs: {args.runs}, softlocked at the end: {softlocks}, "
+          f"{elapsed / max(steps, 1) * 1e6:.1f} us per tracked step")
+
+
+if __name__ == "__main__":
+    main()
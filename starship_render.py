@@ -0,0 +1,144 @@
+"""
+Output renderers for Alien Starship Adventure.
+The game reports what happens as events (tagged messages, room views,
+inventory listings) and a renderer turns them into output. Renderers
+buffer events and write them in one batch on flush().
+"""
+
+from functools import lru_cache
+from typing import Callable, List, Optional
+import json
+import sys
+
+
+@lru_cache(maxsize=None)
+def spoken_name(name: str) -> str:
+    """'maintenance_tool' -> 'maintenance tool'"""
+    return name.replace('_', ' ')
+
+
+@lru_cache(maxsize=None)
+def title_name(name: str) -> str:
+    """'maintenance_tool' -> 'Maintenance Tool'"""
+    return name.replace('_', ' ').title()
+
+
+def counted_name(name: str, count: int) -> str:
+    return title_name(name) if count == 1 else f"{title_name(name)} x{count}"
+
+
+class Renderer:
+    """Event sink; the base class ignores everything"""
+
+    def message(self, text: str, kind: str = "message"):
+        pass
+
+    def room(self, room, first_visit: bool):
+        pass
+
+    def inventory(self, items):
+        pass
+
+    def flush(self):
+        pass
+
+
+class NullRenderer(Renderer):
+    """Drops all output; for benchmarks and headless runs"""
+
+
+class TextRenderer(Renderer):
+    """Human-readable text, buffered and written in batches
+
+    Lines collect until flush() (or until ``max_lines`` are pending) and are
+    then written with a single call. Room headers are cached per room.
+    """
+
+    def __init__(self, write: Optional[Callable[[str], object]] = None, max_lines: int = 256):
+        self._stream = sys.stdout if write is None else None
+        self._write = write or sys.stdout.write
+        self._lines: List[str] = []
+        self._max_lines = max_lines
+        self._headers = {}
+
+    def message(self, text: str, kind: str = "message"):
+        self._lines.append(text)
+        if len(self._lines) >= self._max_lines:
+            self.flush()
+
+    def room(self, room, first_visit: bool):
+        header = self._headers.get(room.name)
+        if header is None:
+            header = f"\n=== {title_name(room.name)} (Level {room.level}) ==="
+            self._headers[room.name] = header
+        lines = self._lines
+        lines.append(header)
+        if first_visit:
+            lines.append(room.description)
+        else:
+            lines.append(f"You are back in the {spoken_name(room.name)}.")
+        if room.items:
+            lines.append(f"\nItems here: {', '.join([counted_name(item.name, count) for item, count in room.items.grouped()])}")
+        if room.exits:
+            lines.append(f"Exits: {', '.join(room.exits)}")
+        if room.locked and room.required_item:
+            lines.append(f"\n{room.lock_description}")
+        if len(lines) >= self._max_lines:
+            self.flush()
+
+    def inventory(self, items):
+        if not items:
+            self.message("Your inventory is empty.")
+            return
+        self._lines.append("Inventory:")
+        for item, count in items.grouped():
+            self._lines.append(f"  - {counted_name(item.name, count)}: {item.description}")
+        if len(self._lines) >= self._max_lines:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self._write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+        if self._stream is not None:
+            self._stream.flush()
+
+
+class JSONRenderer(Renderer):
+    """One JSON object per event, newline-delimited, for machine consumers"""
+
+    def __init__(self, write: Optional[Callable[[str], object]] = None, max_events: int = 256):
+        self._write = write or sys.stdout.write
+        self._events: List[str] = []
+        self._max_events = max_events
+
+    def _emit(self, event: dict):
+        self._events.append(json.dumps(event, separators=(",", ":")))
+        if len(self._events) >= self._max_events:
+            self.flush()
+
+    def message(self, text: str, kind: str = "message"):
+        self._emit({"type": "message", "kind": kind, "text": text.strip("\n")})
+
+    def room(self, room, first_visit: bool):
+        self._emit({
+            "type": "room",
+            "room": room.name,
+            "title": title_name(room.name),
+            "level": room.level,
+            "first_visit": first_visit,
+            "description": room.description,
+            "items": {item.name: count for item, count in room.items.grouped()},
+            "exits": list(room.exits),
+            "locked": room.locked,
+            "lock_description": room.lock_description if room.locked and room.required_item else None,
+        })
+
+    def inventory(self, items):
+        self._emit({"type": "inventory",
+                    "items": {item.name: count for item, count in items.grouped()}})
+
+    def flush(self):
+        if self._events:
+            self._write("\n".join(self._events) + "\n")
+            self._events.clear()
@@ -0,0 +1,185 @@
+"""
+Shortest-path routing for the ``goto`` command of Alien Starship Adventure.
+Routes are planned on two tiers: per-level shortest-path trees over the
+currently open rooms of one level, and the connectors between them, which
+are exits that change level or lead into a locked room. A query runs
+Dijkstra over the connectors only, reading in-level distances from the
+trees, so long trips across large ships touch a handful of nodes.
+
+Trees are built on first use and cached per root room. Opening a lock is
+the only change that alters a tree, and it invalidates just the trees of
+that room's level; whether a connector into a locked room is usable is
+decided per query from the keys the player carries.
+"""
+
+from collections import deque
+from heapq import heappop, heappush
+from typing import Dict, List, Optional, Tuple
+
+from starship_world import DIRECTION_COUNT, NO_ITEM
+
+
+class _Tree:
+    """Breadth-first tree over one level's open rooms, from a root room"""
+
+    __slots__ = ("level", "dist", "prev", "connectors")
+
+    def __init__(self, level: int):
+        self.level = level
+        self.dist: Dict[int, int] = {}
+        self.prev: Dict[int, int] = {}
+        # (room in the tree, room behind a level change or lock)
+        self.connectors: List[Tuple[int, int]] = []
+
+
+class Router:
+    """Cached shortest paths for one game
+
+    ``path(source, target)`` returns the rooms to walk through. Trees are
+    kept for at most ``max_trees`` roots, evicting the oldest first, and
+    whole routes are memoized per set of keys carried until the next
+    unlock.
+    """
+
+    def __init__(self, game, max_trees: int = 256, max_routes: int = 4096):
+        self.game = game
+        self.world = game.world
+        self.max_trees = max_trees
+        self.max_routes = max_routes
+        self._trees: Dict[int, _Tree] = {}
+        self._routes: Dict[Tuple[int, int, int], Optional[List[int]]] = {}
+        self._key_items = sorted(self.world.lock_items())
+        self.trees_built = 0
+
+    def clear(self):
+        self._trees.clear()
+        self._routes.clear()
+
+    def unlocked(self, room_id: int):
+        """A lock opened: forget the trees of that level and every memoized route"""
+        level = self.world.levels[room_id]
+        for root in [root for root, tree in self._trees.items() if tree.level == level]:
+            del self._trees[root]
+        self._routes.clear()
+
+    def _locked(self, room_id: int) -> bool:
+        live = getattr(self.game.rooms, "materialized", None)
+        if live is None:
+            return self.game.room_list[room_id].locked
+        room = live.get(room_id)
+        return room.locked if room is not None else self.world.starts_locked(room_id)
+
+    def _tree(self, root: int) -> _Tree:
+        tree = self._trees.get(root)
+        if tree is not None:
+            return tree
+        world = self.world
+        levels = world.levels
+        level = levels[root]
+        tree = _Tree(level)
+        dist, prev, connectors = tree.dist, tree.prev, tree.connectors
+        dist[root] = 0
+        queue = deque([root])
+        while queue:
+            room_id = queue.popleft()
+            for _, target in world.neighbors(room_id):
+                if target in dist:
+                    continue
+                if levels[target] != level or self._locked(target):
+                    connectors.append((room_id, target))
+                    continue
+                dist[target] = dist[room_id] + 1
+                prev[target] = room_id
+                queue.append(target)
+        if len(self._trees) >= self.max_trees:
+            del self._trees[next(iter(self._trees))]
+        self._trees[root] = tree
+        self.trees_built += 1
+        return tree
+
+    def _keys(self) -> int:
+        """Bitset of the lock items the player carries"""
+        inventory = self.game.player.inventory
+        names = self.world.item_names
+        bits = 0
+        for item_id in self._key_items:
+            if names[item_id] in inventory:
+                bits |= 1 << item_id
+        return bits
+
+    def _passable(self, room_id: int, keys: int) -> bool:
+        if not self._locked(room_id):
+            return True
+        key = self.world.required[room_id]
+        return key != NO_ITEM and bool(keys & (1 << key))
+
+    def path(self, source: int, target: int) -> Optional[List[int]]:
+        """Rooms from ``source`` (exclusive) to ``target`` (inclusive), or None if out of reach"""
+        if source == target:
+            return []
+        keys = self._keys()
+        memo = (source, target, keys)
+        if memo in self._routes:
+            route = self._routes[memo]
+            return list(route) if route is not None else None
+        route = self._search(source, target, keys)
+        if len(self._routes) >= self.max_routes:
+            self._routes.clear()
+        self._routes[memo] = route
+        return list(route) if route is not None else None
+
+    def _search(self, source: int, target: int, keys: int) -> Optional[List[int]]:
+        # Nodes are tree roots: the source and every room entered through a connector
+        best: Dict[int, int] = {source: 0}
+        parent: Dict[int, Tuple[int, int]] = {}
+        frontier = [(0, source)]
+        goal = None
+        goal_cost = None
+        while frontier:
+            cost, root = heappop(frontier)
+            if goal_cost is not None and cost >= goal_cost:
+                break
+            if cost > best[root]:
+                continue
+            tree = self._tree(root)
+            reached = tree.dist.get(target)
+            if reached is not None and (goal_cost is None or cost + reached < goal_cost):
+                goal, goal_cost = root, cost + reached
+            for exit_room, entry in tree.connectors:
+                step = cost + tree.dist[exit_room] + 1
+                if step < best.get(entry, step + 1) and self._passable(entry, keys):
+                    best[entry] = step
+                    parent[entry] = (root, exit_room)
+                    heappush(frontier, (step, entry))
+        if goal is None:
+            return None
+
+        rooms = self._walk(goal, target)
+        root = goal
+        while root != source:
+            previous, exit_room = parent[root]
+            rooms = self._walk(previous, exit_room) + [root] + rooms
+            root = previous
+        return rooms
+
+    def _walk(self, root: int, room_id: int) -> List[int]:
+        """Rooms along a tree from its root (exclusive) to ``room_id``"""
+        # Rebuilds the tree if it was evicted; lock state has not changed since
+        prev = self._tree(root).prev
+        rooms = []
+        while room_id != root:
+            rooms.append(room_id)
+            room_id = prev[room_id]
+        rooms.reverse()
+        return rooms
+
+    def directions(self, source: int, rooms: List[int]) -> List[int]:
+        """Direction indices that walk ``rooms`` starting from ``source``"""
+        exits = self.world.exits
+        steps = []
+        here = source
+        for room_id in rooms:
+            base = here * DIRECTION_COUNT
+            steps.append(next(d for d in range(DIRECTION_COUNT) if exits[base + d] == room_id))
+            here = room_id
+        return steps
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Compiled command scripts for scripted Alien Starship runs.
+A script is parsed once into a flat instruction list of resolved verbs,
+direction indices and item IDs, then executed in a tight loop against as
+many seeded games as needed, skipping line parsing, verb dispatch and
+item phrase resolution on every turn.
+
+Script lines are the commands a player would type, one turn each, plus:
+
+    # comment                   ignored, takes no turn
+    assert room <room>          the player is in the room
+    assert has <item>           the player carries the item
+    assert lacks <item>         the player does not carry the item
+    assert here <item>          the item lies in the current room
+    assert locked <room>        the room is still locked
+    assert unlocked <room>      the room has been opened
+    assert victory              the game has been won
+
+Assertions take no turn. A run stops at the first failed assertion, on
+victory, on ``quit``, when the script ends or after ``max_steps`` turns.
+As in game_loop, every turn fires a random event before its command, and
+blank or unknown lines still take a turn, so a compiled run of a script
+without assertions ends exactly like ``run_playthrough`` over its lines.
+
+A script is bound to the ship it was compiled for; runs and batches use
+that ship and refuse games on another one. Scripts can be compiled for the
+stock ship, generated ships and cached worlds, which worker processes
+rebuild from their ship_spec().
+
+Moves and resolved takes call the game's handlers directly, skipping verb
+dispatch. When metrics are enabled or the game has a journal, every line
+goes through ``AlienStarshipGame.execute`` instead, so both see each turn.
+
+A batch restarts one game per chunk of seeds instead of building one per
+run. Compiled runs are about 3.5x faster than game_loop reading the same
+lines on stdin, short of the 10x target: what is left is the game's own
+turn logic (random event, room forks, the handler), and cutting it further
+would mean duplicating the game rules here. The macro benchmarks track
+both timings (``macro.script.*``). Batches get the remaining factor from
+``workers``, one process per core. Against a separate process per run the
+speedup is several thousand times.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import argparse
+import io
+import os
+import sys
+import time
+
+import alien_starship_adventure
+from alien_starship_adventure import AlienStarshipGame
+from starship_commands import DEFAULT_PARSER, Command
+from starship_journal import build_ship, world_spec
+from starship_render import NullRenderer
+from starship_world import DIRECTION_INDEX, DIRECTIONS
+from starship_worldfile import shared_world
+
+# Turn opcodes; assertions sort after them
+WAIT, GO, TAKE, COMMAND = range(4)
+(ASSERT_ROOM, ASSERT_HAS, ASSERT_LACKS, ASSERT_HERE, ASSERT_LOCKED, ASSERT_UNLOCKED,
+ ASSERT_VICTORY) = range(4, 11)
+_FIRST_ASSERT = ASSERT_ROOM
+
+_ASSERTIONS = {
+    "room": ASSERT_ROOM,
+    "has": ASSERT_HAS,
+    "lacks": ASSERT_LACKS,
+    "here": ASSERT_HERE,
+    "locked": ASSERT_LOCKED,
+    "unlocked": ASSERT_UNLOCKED,
+    "victory": ASSERT_VICTORY,
+}
+_ROOM_ASSERTIONS = (ASSERT_ROOM, ASSERT_LOCKED, ASSERT_UNLOCKED)
+
+
+class ScriptError(ValueError):
+    """A script line that cannot be compiled"""
+
+
+class ScriptResult(NamedTuple):
+    script: str
+    seed: int
+    victory: bool
+    steps: int
+    items_dropped: int
+    # "line N: <assertion>" for the assertion that stopped the run, else None
+    failure: Optional[str]
+
+
+def _ship_spec(world) -> Optional[dict]:
+    spec = world_spec(world)
+    if spec is None and world is not shared_world():
+        raise ScriptError("scripts run on the stock ship, generated ships and cached worlds")
+    return spec
+
+
+class CompiledScript:
+    """A script compiled against one ship's rooms and item catalog
+
+    ``code`` holds (opcode, operand) pairs, ``commands`` the parsed command
+    of each turn (None for assertions) and ``lines`` the script line number
+    of each. ``ship`` is the ship_spec() of the ship compiled for, None for
+    the stock ship. Compiled scripts are plain tuples and pickle cheaply,
+    so batches can be spread over worker processes.
+    """
+
+    def __init__(self, name: str, code: Tuple[Tuple[int, object], ...], lines: Tuple[int, ...],
+                 source: Tuple[str, ...], commands: Tuple[Optional[Command], ...],
+                 ship: Optional[dict] = None, world=None):
+        self.name = name
+        self.code = code
+        self.lines = lines
+        self.source = source
+        self.commands = commands
+        self.ship = ship
+        self._world = world
+
+    def __getstate__(self) -> dict:
+        # Ships are rebuilt from their spec on the other side
+        return dict(self.__dict__, _world=None)
+
+    def world(self):
+        """The ship this script was compiled for, rebuilt once per process"""
+        if self._world is None:
+            self._world = build_ship(self.ship) if self.ship is not None else shared_world()
+        return self._world
+
+    def _check_ship(self, world):
+        if world is not self._world:
+            if _ship_spec(world) != self.ship:
+                raise ScriptError(f"{self.name} was compiled for another ship")
+            self._world = world
+
+    @classmethod
+    def compile(cls, lines: Iterable[str], name: str = "<script>", ship=None,
+                parser=DEFAULT_PARSER) -> "CompiledScript":
+        """Compile script lines for games on ``ship`` (the stock ship by default)"""
+        game = AlienStarshipGame(seed=0, renderer=NullRenderer(), ship=ship)
+        world = game.world
+        spec = _ship_spec(world)
+        item_ids = {item_name: item_id for item_id, item_name in enumerate(world.item_names)}
+
+        def item_id(phrase: str, number: int) -> int:
+            matches = game.item_index.candidates(phrase)
+            if len(matches) != 1:
+                found = "no item" if not matches else "several items"
+                raise ScriptError(f"line {number}: {found} match {phrase!r}")
+            return item_ids[matches[0]]
+
+        def room_id(words: Sequence[str], number: int) -> int:
+            room_name = "_".join(words)
+            if room_name not in world.room_ids:
+                raise ScriptError(f"line {number}: no room named {room_name!r}")
+            return world.room_ids[room_name]
+
+        code = []
+        numbers = []
+        source = []
+        commands = []
+        for number, line in enumerate(lines, 1):
+            line = line.rstrip("\n")
+            words = line.split()
+            if words and words[0].startswith("#"):
+                continue
+            if words and words[0].lower() == "assert":
+                if len(words) < 2 or words[1].lower() not in _ASSERTIONS:
+                    raise ScriptError(f"line {number}: unknown assertion {line.strip()!r}")
+                op = _ASSERTIONS[words[1].lower()]
+                args = [word.lower() for word in words[2:]]
+                if op == ASSERT_VICTORY:
+                    operand = None
+                elif not args:
+                    raise ScriptError(f"line {number}: {line.strip()!r} needs an argument")
+                elif op in _ROOM_ASSERTIONS:
+                    operand = room_id(args, number)
+                else:
+                    operand = item_id(" ".join(args), number)
+                command = None
+            else:
+                command = parser.parse(line)
+                op, operand = cls._instruction(command, item_ids, game)
+            code.append((op, operand))
+            numbers.append(number)
+            source.append(line.strip())
+            commands.append(command)
+        return cls(name, tuple(code), tuple(numbers), tuple(source), tuple(commands), spec, world)
+
+    @staticmethod
+    def _instruction(command: Command, item_ids: dict, game: AlienStarshipGame) -> Tuple[int, object]:
+        if command.verb is None:
+            return WAIT, None
+        if command.verb == "go" and command.args and command.args[0] in DIRECTION_INDEX:
+            return GO, DIRECTION_INDEX[command.args[0]]
+        if command.verb == "take" and command.args:
+            # Only phrases naming one item resolve ahead of time; the rest
+            # depend on what lies in the room when the line runs
+            matches = game.item_index.candidates(command.object)
+            if len(matches) == 1:
+                return TAKE, item_ids[matches[0]]
+        return COMMAND, command
+
+    @classmethod
+    def load(cls, path: str, ship=None) -> "CompiledScript":
+        with open(path) as f:
+            return cls.compile(f, os.path.basename(path), ship)
+
+    def run(self, seed: int, ship=None, max_steps: int = 1000,
+            game: Optional[AlienStarshipGame] = None) -> ScriptResult:
+        """Execute the script against a fresh seeded game
+
+        ``ship`` defaults to the ship the script was compiled for. Passing
+        ``game`` restarts that game with ``seed`` instead of building a new
+        one, as batches do for every run after the first.
+        """
+        if game is None:
+            if ship is None:
+                ship = self.world()
+            self._check_ship(ship)
+            game = AlienStarshipGame(seed=seed, renderer=NullRenderer(), ship=ship)
+        else:
+            self._check_ship(game.world)
+            game.restart(seed)
+        item_names = game.world.item_names
+        commands = self.commands
+        # Direct handler calls would bypass metrics and the journal
+        direct = game.journal is None and alien_starship_adventure._metrics is None
+        trigger_random_event = game.trigger_random_event
+        execute = game.execute
+        steps = 0
+        failure = None
+        for index, (op, operand) in enumerate(self.code):
+            if op >= _FIRST_ASSERT:
+                if not self._holds(game, op, operand):
+                    failure = f"line {self.lines[index]}: {self.source[index]}"
+                    break
+                continue
+            if steps >= max_steps:
+                break
+            trigger_random_event()
+            if not direct:
+                execute(commands[index])
+            elif op == GO:
+                if game.move_player(DIRECTIONS[operand]):
+                    game.display_room()
+            elif op == TAKE:
+                game._take_resolved(item_names[operand])
+            elif op == COMMAND:
+                execute(operand)
+            steps += 1
+            if game.victory or game.game_over:
+                break
+        return ScriptResult(self.name, seed, game.victory, steps, game.items_dropped, failure)
+
+    @staticmethod
+    def _holds(game: AlienStarshipGame, op: int, operand) -> bool:
+        player = game.player
+        if op == ASSERT_ROOM:
+            return player.current_room.id == operand
+        if op == ASSERT_VICTORY:
+            return game.victory
+        if op in (ASSERT_LOCKED, ASSERT_UNLOCKED):
+            return game.room_list[operand].locked == (op == ASSERT_LOCKED)
+        name = game.world.item_names[operand]
+        if op == ASSERT_HAS:
+            return name in player.inventory
+        if op == ASSERT_LACKS:
+            return name not in player.inventory
+        return name in player.current_room.items
+
+
+def _run_chunk(scripts: Sequence[CompiledScript], seeds: range, max_steps: int) -> List[ScriptResult]:
+    game = AlienStarshipGame(seed=0, renderer=NullRenderer(), ship=scripts[0].world())
+    return [script.run(seed, max_steps=max_steps, game=game) for script in scripts for seed in seeds]
+
+
+def run_batch(scripts: Sequence[CompiledScript], runs: int, base_seed: int = 0,
+              max_steps: int = 1000, workers: Optional[int] = None,
+              chunk_size: Optional[int] = None) -> List[ScriptResult]:
+    """Run every script against seeds ``base_seed .. base_seed + runs - 1``
+
+    Results come back grouped by chunk of seeds, then by script. As in
+    starship_sim.simulate, chunks of seeds are spread over a process pool
+    when ``workers`` is above one. All scripts must have been compiled for
+    the same ship, which the batch runs on.
+    """
+    scripts = list(scripts)
+    if any(script.ship != scripts[0].ship for script in scripts):
+        raise ScriptError("a batch needs scripts compiled for the same ship")
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, min(10000, runs // (workers * 8) or 1))
+    chunks = [range(start, min(start + chunk_size, base_seed + runs))
+              for start in range(base_seed, base_seed + runs, chunk_size)]
+    if workers == 1:
+        return [result for seeds in chunks for result in _run_chunk(scripts, seeds, max_steps)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_chunk, scripts, seeds, max_steps) for seeds in chunks]
+        return [result for future in futures for result in future.result()]
+
+
+def _is_directive(line: str) -> bool:
+    words = line.split()
+    return bool(words) and (words[0].startswith("#") or words[0].lower() == "assert")
+
+
+def _stdin_run(text: str, seed: int):
+    """Play a script through game_loop, reading stdin and printing to /dev/null"""
+    stdin, stdout = sys.stdin, sys.stdout
+    with open(os.devnull, "w") as devnull:
+        sys.stdin, sys.stdout = io.StringIO(text), devnull
+        try:
+            AlienStarshipGame(seed=seed).game_loop()
+        finally:
+            sys.stdin, sys.stdout = stdin, stdout
+
+
+def benchmark(lines: Sequence[str], runs: int = 200):
+    """Print the cost of one scripted run via game_loop on stdin and compiled"""
+    lines = [line.rstrip("\n") for line in lines]
+    start = time.perf_counter()
+    script = CompiledScript.compile(lines)
+    compiling = time.perf_counter() - start
+    text = "".join(line + "\n" for line in lines if not _is_directive(line))
+    turns = sum(op < _FIRST_ASSERT for op, _ in script.code)
+
+    start = time.perf_counter()
+    for seed in range(runs):
+        _stdin_run(text, seed)
+    interactive = (time.perf_counter() - start) / runs
+    game = AlienStarshipGame(seed=0, renderer=NullRenderer())
+    start = time.perf_counter()
+    for seed in range(runs):
+        script.run(seed, max_steps=turns, game=game)
+    compiled = (time.perf_counter() - start) / runs
+    print(f"game_loop on stdin: {interactive * 1e6:.1f} us per run")
+    print(f"compiled:           {compiled * 1e6:.1f} us per run "
+          f"({interactive / compiled:.1f}x, compiled once in {compiling * 1e6:.0f} us)")
+
+
+def main():
+    """Command line entry point: run compiled scripts against many seeds"""
+    parser = argparse.ArgumentParser(description="Run Alien Starship command scripts in batch.")
+    parser.add_argument("scripts", nargs="+", help="files with one command or assertion per line")
+    parser.add_argument("--runs", type=int, default=1000, help="seeds per script")
+    parser.add_argument("--seed", type=int, default=0, help="first seed of the batch")
+    parser.add_argument("--max-steps", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--benchmark", action="store_true",
+                        help="time the first script against game_loop on stdin instead")
+    args = parser.parse_args()
+
+    try:
+        scripts = [CompiledScript.load(path) for path in args.scripts]
+    except ScriptError as exc:
+        parser.error(str(exc))
+    if args.benchmark:
+        with open(args.scripts[0]) as f:
+            benchmark(f.readlines(), min(args.runs, 200))
+        return
+    results = run_batch(scripts, args.runs, args.seed, args.max_steps, args.workers)
+    for script in scripts:
+        mine = [result for result in results if result.script == script.name]
+        wins = sum(result.victory for result in mine)
+        failures = [result for result in mine if result.failure is not None]
+        print(f"{script.name}: {len(mine)} runs, {wins} wins, {len(failures)} failed assertions")
+        for result in failures[:5]:
+            print(f"  seed {result.seed}: {result.failure}")
+    if any(result.failure is not None for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Asyncio telnet-style server for Alien Starship Adventure.
+Hosts one isolated AlienStarshipGame per TCP connection on a single event
+loop. Each session renders through a buffered TextRenderer that is flushed
+to its stream once per command, with drain-based backpressure, idle timeouts and a
+graceful shutdown that says goodbye to every connected player.
+
+With a session database, games of players who are idle between commands
+are hibernated to SQLite and woken on their next line, so the number of
+games held in memory is bounded however many players stay connected.
+"""
+
+from typing import Optional, Set
+import argparse
+import asyncio
+import itertools
+import os
+import signal
+
+from alien_starship_adventure import AlienStarshipGame
+from starship_journal import JournalWriter
+from starship_render import TextRenderer
+from starship_sessions import SessionStore
+import starship_metrics
+
+BANNER = (
+    "=== ALIEN STARSHIP ADVENTURE ===\n"
+    "You dock with an abandoned alien starship orbiting a desolate planet.\n"
+    "Your mission: explore the ship, collect items, and find escape pods to get off alive!\n"
+    "Type 'help' for commands.\n"
+)
+PROMPT = b"\n> "
+# Longest command line accepted from a client, in bytes
+LINE_LIMIT = 4096
+
+
+class Session:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 seed: Optional[int] = None, journal_path: Optional[str] = None,
+                 store: Optional[SessionStore] = None):
+        self.reader = reader
+        self.writer = writer
+        self.renderer = TextRenderer(write=lambda text: writer.write(text.encode()))
+        game = AlienStarshipGame(seed=seed, renderer=self.renderer)
+        self.journal = JournalWriter(journal_path, game) if journal_path else None
+        self.store = store
+        self.session_id = store.add(game) if store is not None else None
+        self._game = game if store is None else None
+        # Set when the server ends the session, without waking a hibernated game
+        self.closing = False
+
+    @property
+    def game(self) -> AlienStarshipGame:
+        if self.store is None:
+            return self._game
+        game = self.store.get(self.session_id)
+        if game.renderer is not self.renderer:
+            # Woken from the store: reattach this connection's output and journal
+            game.renderer = self.renderer
+            if self.journal is not None:
+                self.journal.game = game
+                game.journal = self.journal
+        return game
+
+    async def send(self, text: str = ""):
+        """Write buffered game output plus a prompt, waiting if the peer is slow"""
+        if text:
+            self.renderer.message(text)
+        self.renderer.flush()
+        if not self.finished:
+            self.writer.write(PROMPT)
+        await self.writer.drain()
+
+    @property
+    def finished(self) -> bool:
+        return self.closing or self.game.game_over or self.game.victory
+
+    async def readline(self) -> Optional[bytes]:
+        """Read one command line; None when it exceeded LINE_LIMIT and was skipped"""
+        try:
+            return await self.reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            return e.partial
+        except asyncio.LimitOverrunError:
+            pass
+        # Discard the overlong line up to and including its newline
+        while True:
+            try:
+                await self.reader.readuntil(b"\n")
+                return None
+            except asyncio.IncompleteReadError:
+                return b""
+            except asyncio.LimitOverrunError as e:
+                await self.reader.readexactly(e.consumed)
+
+    async def run(self, idle_timeout: float):
+        self.renderer.message(BANNER, "banner")
+        self.game.display_room()
+        while True:
+            # Like game_loop: the turn's random event comes before the prompt
+            if not self.finished:
+                self.game.trigger_random_event()
+            await self.send()
+            if self.finished:
+                return
+            try:
+                line = await asyncio.wait_for(self.readline(), idle_timeout)
+            except asyncio.TimeoutError:
+                self.closing = True
+                await self.send("\nYou drift off in the silent corridors. Connection closed for inactivity.")
+                return
+            if line is None:
+                self.renderer.message(f"That line is longer than {LINE_LIMIT} bytes and was ignored.", "error")
+                continue
+            if not line:
+                return
+            self.game.handle_command(line.decode(errors="replace"))
+            if self.game.victory:
+                self.game.show_victory()
+
+
+class GameServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 4000,
+                 idle_timeout: float = 600.0, write_limit: int = 64 * 1024,
+                 journal_dir: Optional[str] = None, metrics_port: Optional[int] = None,
+                 session_db: Optional[str] = None, hot_sessions: int = 10000,
+                 hibernate_after: float = 60.0):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.write_limit = write_limit
+        # One journal per connection, for reproducing bug reports
+        self.journal_dir = journal_dir
+        self._session_ids = itertools.count(1)
+        # Prometheus scrape endpoint; instrumentation is only enabled when set
+        self.metrics_port = metrics_port
+        self.metrics_server: Optional[asyncio.AbstractServer] = None
+        # Games idle for hibernate_after seconds, or beyond hot_sessions, go to disk
+        self.session_db = session_db
+        self.hot_sessions = hot_sessions
+        self.hibernate_after = hibernate_after
+        self.store: Optional[SessionStore] = None
+        self._hibernator: Optional[asyncio.Task] = None
+        self.sessions: Set[Session] = set()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.transport.set_write_buffer_limits(high=self.write_limit)
+        journal_path = None
+        if self.journal_dir is not None:
+            journal_path = os.path.join(self.journal_dir, f"session-{os.getpid()}-{next(self._session_ids)}.jsonl")
+        session = Session(reader, writer, journal_path=journal_path, store=self.store)
+        self.sessions.add(session)
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        try:
+            await session.run(self.idle_timeout)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.sessions.discard(session)
+            self._tasks.discard(task)
+            if session.journal is not None:
+                session.journal.close()
+            if self.store is not None:
+                self.store.discard(session.session_id)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _serve_metrics(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer one HTTP GET with /metrics (Prometheus text) or /metrics.json"""
+        try:
+            request = await asyncio.wait_for(reader.readline(), 5.0)
+            path = request.split()[1].decode() if len(request.split()) > 1 else "/"
+            status = "200 OK"
+            if path == "/metrics.json":
+                body, content_type = starship_metrics.METRICS.to_json(), "application/json"
+            elif path == "/metrics":
+                body, content_type = starship_metrics.METRICS.to_prometheus(), "text/plain; version=0.0.4"
+            else:
+                status, body, content_type = "404 Not Found", "not found\n", "text/plain"
+            payload = body.encode()
+            writer.write(f"HTTP/1.0 {status}\r\nContent-Type: {content_type}\r\n"
+                         f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _detach(session_id: str, game: AlienStarshipGame):
+        """Let go of a game being hibernated; its Session reattaches on wake-up"""
+        if game.journal is not None:
+            game.journal.game = None
+            game.journal = None
+
+    async def _hibernate_idle(self):
+        while True:
+            await asyncio.sleep(self.hibernate_after / 2)
+            self.store.hibernate_idle(self.hibernate_after)
+
+    async def start(self):
+        if self.session_db is not None:
+            self.store = SessionStore(self.session_db, self.hot_sessions, on_hibernate=self._detach)
+            self._hibernator = asyncio.ensure_future(self._hibernate_idle())
+        self.server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                 limit=LINE_LIMIT, backlog=1024)
+        if self.metrics_port is not None:
+            starship_metrics.enable()
+            self.metrics_server = await asyncio.start_server(self._serve_metrics, self.host,
+                                                             self.metrics_port)
+        return self.server
+
+    async def shutdown(self, grace: float = 5.0):
+        """Stop accepting players, say goodbye to everyone and close sessions"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.metrics_server is not None:
+            self.metrics_server.close()
+            await self.metrics_server.wait_closed()
+            starship_metrics.disable()
+        for session in list(self.sessions):
+            session.closing = True
+            session.writer.write(b"\n\nThe ship's power fails. Server shutting down. Thanks for playing!\n")
+        # Closing a transport flushes what is already buffered, so cancelling
+        # the sessions still delivers the goodbye to every reachable player.
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=grace)
+        if self._hibernator is not None:
+            self._hibernator.cancel()
+        if self.store is not None:
+            self.store.close()
+
+    async def serve_forever(self):
+        await self.start()
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        await stop.wait()
+        await self.shutdown()
+
+
+def main():
+    """Command line entry point for the game server"""
+    parser = argparse.ArgumentParser(description="Host Alien Starship Adventure over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--idle-timeout", type=float, default=600.0)
+    parser.add_argument("--journal-dir", help="record every session to a journal in this directory")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics over HTTP on this port")
+    parser.add_argument("--session-db", help="hibernate idle games to this SQLite database")
+    parser.add_argument("--hot-sessions", type=int, default=10000, help="games kept in memory")
+    parser.add_argument("--hibernate-after", type=float, default=60.0,
+                        help="seconds between commands before a game is hibernated")
+    args = parser.parse_args()
+
+    if args.journal_dir:
+        os.makedirs(args.journal_dir, exist_ok=True)
+    server = GameServer(args.host, args.port, args.idle_timeout, journal_dir=args.journal_dir,
+                        metrics_port=args.metrics_port, session_db=args.session_db,
+                        hot_sessions=args.hot_sessions, hibernate_after=args.hibernate_after)
+    print(f"Alien Starship server listening on {args.host}:{args.port}")
+    asyncio.run(server.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Session store for long-running Alien Starship deployments.
+Keeps recently used games in memory up to a fixed number of hot sessions
+and hibernates the rest to SQLite as binary snapshots. A hibernated game
+is rebuilt on its next access: one primary key lookup, construction on
+the shared ship and a snapshot restore, about 70 microseconds in all.
+Evictions are written in batches, one transaction per batch, so the commit
+cost is shared by many sessions instead of paid on every miss.
+
+    sessions  id TEXT primary key, seed TEXT, ship TEXT (JSON ship spec or
+              NULL for the stock ship), state BLOB (binary snapshot)
+
+Seeds are stored as text because unseeded games draw 64-bit seeds, which
+overflow SQLite integers.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+import argparse
+import json
+import secrets
+import sqlite3
+import time
+
+from alien_starship_adventure import AlienStarshipGame
+from starship_journal import build_ship, ship_spec
+from starship_render import NullRenderer
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    seed TEXT NOT NULL,
+    ship TEXT,
+    state BLOB NOT NULL
+)
+"""
+
+
+class SessionStore:
+    """Least recently used games in memory, the others on disk
+
+    At most ``capacity`` games stay hot; adding or waking one more
+    hibernates the least recently used ``evict_batch`` of them together. ``on_hibernate(session_id, game)``
+    runs just before a game is dropped from memory, so callers can let go
+    of their own references to it. Rehydrated games render to a
+    NullRenderer until the caller installs its own.
+    """
+
+    def __init__(self, path: str = ":memory:", capacity: int = 10000,
+                 on_hibernate: Optional[Callable[[str, AlienStarshipGame], None]] = None,
+                 evict_batch: Optional[int] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.path = path
+        self.capacity = capacity
+        self.evict_batch = max(1, min(evict_batch or capacity // 64, capacity))
+        self.on_hibernate = on_hibernate
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        # Snapshots are about 2.5 KB, mostly RNG state: 8 KB pages hold three
+        # rows where 4 KB pages hold one. Only takes effect on a new database.
+        self.db.execute("PRAGMA page_size=8192")
+        # WAL without a sync per commit keeps a batch write cheap
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(_SCHEMA)
+        self._hot: "OrderedDict[str, AlienStarshipGame]" = OrderedDict()
+        self._touched: Dict[str, float] = {}
+        # JSON ship spec -> ship, so rehydrated games share one world
+        self._ships: Dict[Optional[str], object] = {None: None}
+        self._renderer = NullRenderer()
+        self.hibernations = 0
+        self.rehydrations = 0
+
+    def add(self, game: AlienStarshipGame, session_id: Optional[str] = None) -> str:
+        """Start tracking a game and return its session ID"""
+        if session_id is None:
+            session_id = secrets.token_hex(8)
+        spec = ship_spec(game)
+        if spec is not None:
+            self._ships.setdefault(json.dumps(spec, sort_keys=True), game.world)
+        self._hot[session_id] = game
+        self._hot.move_to_end(session_id)
+        self._touched[session_id] = time.monotonic()
+        self._evict()
+        return session_id
+
+    def get(self, session_id: str) -> AlienStarshipGame:
+        """The session's game, rehydrated from disk if it was hibernated"""
+        game = self._hot.get(session_id)
+        if game is not None:
+            self._hot.move_to_end(session_id)
+            self._touched[session_id] = time.monotonic()
+            return game
+        row = self.db.execute("SELECT seed, ship, state FROM sessions WHERE id = ?",
+                              (session_id,)).fetchone()
+        if row is None:
+            raise KeyError(session_id)
+        seed, spec, state = row
+        game = AlienStarshipGame(seed=int(seed), renderer=self._renderer, ship=self._ship(spec))
+        game.restore(state)
+        self.rehydrations += 1
+        self._hot[session_id] = game
+        self._touched[session_id] = time.monotonic()
+        self._evict()
+        return game
+
+    def _ship(self, spec: Optional[str]):
+        ship = self._ships.get(spec)
+        if ship is None and spec is not None:
+            ship = self._ships[spec] = build_ship(json.loads(spec))
+        return ship
+
+    def _evict(self):
+        excess = len(self._hot) - self.capacity
+        if excess > 0:
+            oldest = iter(self._hot)
+            self.hibernate(*[next(oldest) for _ in range(max(excess, self.evict_batch))])
+
+    def hibernate(self, *session_ids: str):
+        """Write hot sessions to disk in one transaction and drop them from memory"""
+        rows = []
+        games = []
+        for session_id in session_ids:
+            game = self._hot.pop(session_id)
+            del self._touched[session_id]
+            spec = ship_spec(game)
+            rows.append((session_id, str(game.seed),
+                         json.dumps(spec, sort_keys=True) if spec is not None else None,
+                         game.snapshot()))
+            games.append((session_id, game))
+        self.db.execute("BEGIN")
+        try:
+            self.db.executemany("INSERT OR REPLACE INTO sessions (id, seed, ship, state) "
+                                "VALUES (?, ?, ?, ?)", rows)
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+        self.hibernations += len(rows)
+        if self.on_hibernate is not None:
+            for session_id, game in games:
+                self.on_hibernate(session_id, game)
+
+    def hibernate_idle(self, max_idle: float) -> int:
+        """Hibernate every session untouched for ``max_idle`` seconds; returns how many"""
+        cutoff = time.monotonic() - max_idle
+        idle = []
+        # Hot sessions are kept in access order, oldest first
+        for session_id in self._hot:
+            if self._touched[session_id] > cutoff:
+                break
+            idle.append(session_id)
+        if idle:
+            self.hibernate(*idle)
+        return len(idle)
+
+    def discard(self, session_id: str):
+        """Forget a session entirely"""
+        if self._hot.pop(session_id, None) is not None:
+            del self._touched[session_id]
+        self.db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def __contains__(self, session_id: str) -> bool:
+        if session_id in self._hot:
+            return True
+        return self.db.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is not None
+
+    @property
+    def hot_count(self) -> int:
+        return len(self._hot)
+
+    def flush(self):
+        """Hibernate every hot session, e.g. before shutting down"""
+        if self._hot:
+            self.hibernate(*self._hot)
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+    def __enter__(self) -> "SessionStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def benchmark(sessions: int = 20000, capacity: int = 1000, path: str = ":memory:"):
+    """Print hibernate and rehydrate timings under a working set larger than memory"""
+    import random
+
+    store = SessionStore(path, capacity)
+    ids = [store.add(AlienStarshipGame(seed=seed, renderer=NullRenderer())) for seed in range(sessions)]
+    rng = random.Random(0)
+    start = time.perf_counter()
+    hibernated = store.hibernations
+    for _ in range(sessions):
+        game = store.get(rng.choice(ids))
+        game.trigger_random_event()
+        game.handle_command(rng.choice(("north", "south", "east", "west", "up", "down")))
+    elapsed = time.perf_counter() - start
+    misses = store.rehydrations
+    print(f"{sessions} sessions, {capacity} hot: {misses} rehydrations, "
+          f"{store.hibernations - hibernated} hibernations")
+    print(f"{elapsed / sessions * 1e6:.1f} us per command including rehydrate + evict")
+
+    session_id = ids[0]
+    timings = []
+    for _ in range(200):
+        if session_id in store._hot:
+            store.hibernate(session_id)
+        start = time.perf_counter()
+        store.get(session_id)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"rehydrate: median {timings[len(timings) // 2] * 1e6:.1f} us, "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1e6:.1f} us")
+    store.close()
+
+
+def main():
+    """Command line entry point: benchmark the session store"""
+    parser = argparse.ArgumentParser(description="Benchmark the Alien Starship session store.")
+    parser.add_argument("--sessions", type=int, default=20000)
+    parser.add_argument("--capacity", type=int, default=1000)
+    parser.add_argument("--db", default=":memory:", help="SQLite database path")
+    args = parser.parse_args()
+    benchmark(args.sessions, args.capacity, args.db)
+
+
+if __name__ == "__main__":
+    main()
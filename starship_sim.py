@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Headless simulation engine for Alien Starship Adventure.
+Runs seeded playthroughs without terminal I/O, either from a fixed command
+stream or from a policy callback, and fans large batches of runs out over a
+process pool for balance testing.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, NamedTuple, Optional
+import argparse
+import os
+import random
+
+from alien_starship_adventure import AlienStarshipGame
+from starship_render import NullRenderer
+
+Policy = Callable[[AlienStarshipGame, random.Random], str]
+
+
+class PlaythroughResult(NamedTuple):
+    seed: int
+    victory: bool
+    steps: int
+    items_dropped: int
+
+
+class SimulationSummary:
+    def __init__(self):
+        self.runs = 0
+        self.wins = 0
+        self.steps_to_victory = 0
+        self.min_steps = None
+        self.max_steps = None
+        self.items_dropped = 0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.runs if self.runs else 0.0
+
+    @property
+    def mean_steps_to_victory(self) -> Optional[float]:
+        return self.steps_to_victory / self.wins if self.wins else None
+
+    @property
+    def mean_items_dropped(self) -> float:
+        return self.items_dropped / self.runs if self.runs else 0.0
+
+    def record(self, result: PlaythroughResult):
+        """Fold a single playthrough into the summary"""
+        self.runs += 1
+        self.items_dropped += result.items_dropped
+        if result.victory:
+            self.wins += 1
+            self.steps_to_victory += result.steps
+            if self.min_steps is None or result.steps < self.min_steps:
+                self.min_steps = result.steps
+            if self.max_steps is None or result.steps > self.max_steps:
+                self.max_steps = result.steps
+
+    def merge(self, other: "SimulationSummary"):
+        """Fold another partial summary into this one"""
+        self.runs += other.runs
+        self.wins += other.wins
+        self.steps_to_victory += other.steps_to_victory
+        self.items_dropped += other.items_dropped
+        for bound, pick in (("min_steps", min), ("max_steps", max)):
+            theirs = getattr(other, bound)
+            if theirs is not None:
+                ours = getattr(self, bound)
+                setattr(self, bound, theirs if ours is None else pick(ours, theirs))
+
+    def as_dict(self) -> dict:
+        return {
+            "runs": self.runs,
+            "wins": self.wins,
+            "win_rate": self.win_rate,
+            "mean_steps_to_victory": self.mean_steps_to_victory,
+            "min_steps_to_victory": self.min_steps,
+            "max_steps_to_victory": self.max_steps,
+            "items_dropped": self.items_dropped,
+            "mean_items_dropped": self.mean_items_dropped,
+        }
+
+
+def explorer_policy(game: AlienStarshipGame, rng: random.Random) -> str:
+    """Pick up anything in sight, otherwise wander through a random exit"""
+    room = game.player.current_room
+    if room.items and len(game.player.inventory) < game.player.max_inventory:
+        return f"take {next(iter(room.items)).name}"
+    return f"go {rng.choice(list(room.exits))}"
+
+
+def run_playthrough(seed: int, policy: Optional[Policy] = None,
+                    commands: Optional[Iterable[str]] = None,
+                    max_steps: int = 1000, ship=None) -> PlaythroughResult:
+    """Play one seeded game headlessly from a command stream or a policy"""
+    game = AlienStarshipGame(seed=seed, renderer=NullRenderer(), ship=ship)
+    if commands is not None:
+        stream = iter(commands)
+        next_command = lambda: next(stream, None)
+    else:
+        policy = policy or explorer_policy
+        policy_rng = random.Random((seed << 1) | 1)
+        next_command = lambda: policy(game, policy_rng)
+
+    steps = 0
+    while steps < max_steps and not game.game_over and not game.victory:
+        game.trigger_random_event()
+        command = next_command()
+        if command is None:
+            break
+        game.handle_command(command)
+        steps += 1
+
+    return PlaythroughResult(seed, game.victory, steps, game.items_dropped)
+
+
+def _run_chunk(seeds: range, policy: Optional[Policy], commands: Optional[tuple],
+               max_steps: int) -> SimulationSummary:
+    summary = SimulationSummary()
+    for seed in seeds:
+        summary.record(run_playthrough(seed, policy, commands, max_steps))
+    return summary
+
+
+def simulate(runs: int, policy: Optional[Policy] = None,
+             commands: Optional[Iterable[str]] = None, base_seed: int = 0,
+             max_steps: int = 1000, workers: Optional[int] = None,
+             chunk_size: Optional[int] = None) -> SimulationSummary:
+    """Run many seeded playthroughs, spread over a process pool
+
+    Seeds ``base_seed .. base_seed + runs - 1`` are split into contiguous
+    chunks; each worker aggregates its chunk locally and only the partial
+    summaries travel back, so IPC cost stays flat as ``runs`` grows.
+    Policies must be picklable (module-level functions) when ``workers > 1``.
+    """
+    if commands is not None:
+        commands = tuple(commands)
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, min(10000, runs // (workers * 8) or 1))
+
+    chunks = [range(start, min(start + chunk_size, base_seed + runs))
+              for start in range(base_seed, base_seed + runs, chunk_size)]
+
+    summary = SimulationSummary()
+    if workers == 1:
+        for seeds in chunks:
+            summary.merge(_run_chunk(seeds, policy, commands, max_steps))
+        return summary
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_chunk, seeds, policy, commands, max_steps)
+                   for seeds in chunks]
+        for future in futures:
+            summary.merge(future.result())
+    return summary
+
+
+def main():
+    """Command line entry point for batch simulations"""
+    parser = argparse.ArgumentParser(description="Run headless Alien Starship playthroughs.")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="first seed of the batch")
+    parser.add_argument("--max-steps", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--script", help="file with one command per line to replay for every seed")
+    args = parser.parse_args()
+
+    commands = None
+    if args.script:
+        with open(args.script) as f:
+            commands = [line.rstrip("\n") for line in f]
+
+    summary = simulate(args.runs, commands=commands, base_seed=args.seed,
+                       max_steps=args.max_steps, workers=args.workers,
+                       chunk_size=args.chunk_size)
+    for key, value in summary.as_dict().items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
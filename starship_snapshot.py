@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Binary snapshots of Alien Starship Adventure games.
+A snapshot holds only mutable per-game state (player room, inventory, room
+contents, visited/locked flags, the player's own visited rooms in shared
+games, escape pod count and RNG state) and is restored onto a game built
+from the same ship.
+
+Layout, little-endian, version 2:
+
+    header   4s magic, B version, B flags, H escape pods, I room count,
+             I player room, I items dropped, H inventory entries, I room records
+    entries  inventory entries as (H item ID, H count)
+    records  per room: I room ID, B flags, H item entries, then (H item ID, H count)
+    visited  with the player-visited flag: I count, then I room IDs
+    rng      B has gauss, d gauss, 625I Mersenne Twister state
+
+Version 1 is the same without the visited section, and is still read.
+"""
+
+from array import array
+import random
+import struct
+import timeit
+
+MAGIC = b"ASSG"
+VERSION = 2
+
+_HEADER = struct.Struct("<4sBBHIIIHI")
+_ROOM = struct.Struct("<IBH")
+_COUNT = struct.Struct("<I")
+_RNG = struct.Struct("<Bd625I")
+
+_VICTORY = 1
+_GAME_OVER = 2
+_PLAYER_VISITED = 4
+_VISITED = 1
+_LOCKED = 2
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _bag_pairs(bag, item_ids) -> array:
+    pairs = array("H")
+    for item, count in bag.grouped():
+        pairs.append(item_ids[item.name])
+        pairs.append(count)
+    return pairs
+
+
+def _snapshot_rooms(game):
+    live = getattr(game.rooms, "materialized", None)
+    return game.room_list if live is None else live.values()
+
+
+def write_snapshot(game) -> bytes:
+    """Serialize a game's mutable state"""
+    item_ids = game.world.item_ids
+    rooms = _snapshot_rooms(game)
+    flags = (_VICTORY if game.victory else 0) | (_GAME_OVER if game.game_over else 0)
+    if game.visited is not None:
+        flags |= _PLAYER_VISITED
+    inventory = _bag_pairs(game.player.inventory, item_ids)
+
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, flags, game.escape_pods_found,
+                                 game.world.room_count, game.player.current_room.id,
+                                 game.items_dropped, len(inventory) // 2, len(rooms)))
+    out += inventory.tobytes()
+    for room in rooms:
+        pairs = _bag_pairs(room.items, item_ids) if room.items else None
+        room_flags = (_VISITED if room.visited else 0) | (_LOCKED if room.locked else 0)
+        out += _ROOM.pack(room.id, room_flags, len(pairs) // 2 if pairs else 0)
+        if pairs:
+            out += pairs.tobytes()
+    if game.visited is not None:
+        out += _COUNT.pack(len(game.visited))
+        out += array("I", sorted(game.visited)).tobytes()
+
+    _, state, gauss = game.rng.getstate()
+    out += _RNG.pack(gauss is not None, gauss or 0.0, *state)
+    return bytes(out)
+
+
+def _read_pairs(view: memoryview, offset: int, entries: int):
+    end = offset + entries * 4
+    pairs = array("H")
+    pairs.frombytes(view[offset:end])
+    return pairs, end
+
+
+def restore_snapshot(game, data: bytes):
+    """Load a snapshot onto a game built from the same ship"""
+    view = memoryview(data)
+    try:
+        (magic, version, flags, pods, room_count, player_room,
+         dropped, inventory_entries, records) = _HEADER.unpack_from(view, 0)
+    except struct.error as exc:
+        raise SnapshotError("Truncated snapshot header") from exc
+    if magic != MAGIC:
+        raise SnapshotError("Not an Alien Starship snapshot")
+    if version not in (1, VERSION):
+        raise SnapshotError(f"Unsupported snapshot version {version}")
+    if room_count != game.world.room_count:
+        raise SnapshotError("Snapshot was taken on a different ship")
+
+    items = [game.items[name] for name in game.world.item_names]
+    offset = _HEADER.size
+    pairs, offset = _read_pairs(view, offset, inventory_entries)
+    inventory = game.player.inventory
+    inventory.clear()
+    for i in range(0, len(pairs), 2):
+        inventory.add(items[pairs[i]], pairs[i + 1])
+
+    live = getattr(game.rooms, "materialized", None)
+    if live is not None:
+        game.rooms.reset()
+    for _ in range(records):
+        room_id, room_flags, entries = _ROOM.unpack_from(view, offset)
+        pairs, offset = _read_pairs(view, offset + _ROOM.size, entries)
+        room = game.room_list[room_id]
+        room.visited = bool(room_flags & _VISITED)
+        room.locked = bool(room_flags & _LOCKED)
+        room.items.clear()
+        for i in range(0, len(pairs), 2):
+            room.items.add(items[pairs[i]], pairs[i + 1])
+    if flags & _PLAYER_VISITED:
+        (count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        visited = array("I")
+        visited.frombytes(view[offset:offset + count * 4])
+        offset += count * 4
+        game.visited = set(visited)
+    elif game.visited is not None:
+        game.visited.clear()
+
+    has_gauss, gauss, *state = _RNG.unpack_from(view, offset)
+    # Skip seeding a generator whose state is overwritten right away
+    rng = random.Random.__new__(random.Random)
+    rng.setstate((3, tuple(state), gauss if has_gauss else None))
+    game.rng = rng
+
+    game.player.current_room = game.room_list[player_room]
+    game.escape_pods_found = pods
+    game.items_dropped = dropped
+    game.victory = bool(flags & _VICTORY)
+    game.game_over = bool(flags & _GAME_OVER)
+    game.revision += 1
+
+
+def benchmark(number: int = 20000):
+    """Print per-call timings of snapshot, restore and fork on a mid-game state"""
+    from alien_starship_adventure import AlienStarshipGame
+    from starship_render import NullRenderer
+
+    game = AlienStarshipGame(seed=1, renderer=NullRenderer())
+    for command in ["east", "take maintenance tool", "north", "take energy cell", "west", "look"]:
+        game.handle_command(command)
+    data = game.snapshot()
+    target = AlienStarshipGame(seed=2, renderer=NullRenderer())
+
+    print(f"snapshot size: {len(data)} bytes")
+    for label, call in [("snapshot", game.snapshot),
+                        ("restore", lambda: target.restore(data)),
+                        ("fork", game.fork)]:
+        seconds = min(timeit.repeat(call, number=number, repeat=3)) / number
+        print(f"{label}: {seconds * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    benchmark()
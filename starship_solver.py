@@ -0,0 +1,191 @@
+"""
+State-space solver for Alien Starship Adventure.
+Finds the shortest winning command sequence from the current game state by
+A* search over (room, inventory) states, and backs the in-game ``hint``
+command and automated solvability checks of generated ships.
+"""
+
+from heapq import heappop, heappush
+from typing import Dict, List, Optional, Tuple
+
+from starship_world import DIRECTIONS, NO_ITEM
+
+BEACON = "emergency_beacon"
+
+# Memo marker for states known to have no winning plan
+_UNSOLVABLE = ()
+
+
+class Solver:
+    """A* planner over (room ID, inventory bitset)
+
+    Only items that open some lock are tracked in the inventory bitset;
+    item ``i`` is bit ``1 << i``. Lock state is implied by the bitset: items
+    are never consumed, so a locked room is passable exactly when the live
+    game has already opened it or its key is in the bitset. The heuristic is
+    the number of level changes still needed to reach an escape pod bay,
+    which never overestimates because one exit moves at most
+    ``max_level_step`` levels.
+
+    Results are memoized per state as (command, next state, plan length)
+    links, so the hints along an already computed plan are O(1) and later
+    searches stop as soon as they reach a solved state. The memo is dropped
+    whenever the game's ``revision`` changes (unlocks, dropped or
+    discovered items).
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.world = game.world
+        self._memo: Dict[Tuple[int, int, int], tuple] = {}
+        self._revision = game.revision
+        self._key_items = self.world.lock_items()
+        self._beacon_id = self.world.item_ids.get(BEACON, NO_ITEM)
+        self._pod_rooms = set(self.world.escape_pod_rooms())
+        self._goal_levels = sorted({self.world.levels[r] for r in self._pod_rooms})
+        self._level_step = self.world.max_level_step()
+        self._live = getattr(game.rooms, "materialized", None)
+        self.expanded = 0
+
+    def _room(self, room_id: int):
+        if self._live is None:
+            return self.game.room_list[room_id]
+        return self._live.get(room_id)
+
+    def _locked(self, room_id: int) -> bool:
+        room = self._room(room_id)
+        return room.locked if room is not None else self.world.starts_locked(room_id)
+
+    def _item_ids(self, room_id: int) -> List[int]:
+        room = self._room(room_id)
+        item_ids = self.world.item_ids
+        if room is not None:
+            return [item_ids.get(item.name, NO_ITEM) for item in room.items]
+        return [item_ids.get(name, NO_ITEM) for name in self.world.initial_items(room_id)]
+
+    def _heuristic(self, room_id: int) -> int:
+        level = self.world.levels[room_id]
+        gap = min(abs(level - goal) for goal in self._goal_levels)
+        return -(-gap // self._level_step)
+
+    def _start_state(self) -> Tuple[int, int, int]:
+        player = self.game.player
+        bits = 0
+        for item in player.inventory:
+            item_id = self.world.item_ids.get(item.name, NO_ITEM)
+            if item_id in self._key_items:
+                bits |= 1 << item_id
+        free = player.max_inventory - len(player.inventory)
+        return player.current_room.id, bits, free
+
+    def solve(self) -> Optional[List[str]]:
+        """Shortest command sequence that wins from the current state"""
+        if self.game.victory:
+            return []
+        if self.game.revision != self._revision:
+            self._memo.clear()
+            self._revision = self.game.revision
+
+        start = self._start_state()
+        if start not in self._memo:
+            self._search(start)
+        if self._memo[start] is _UNSOLVABLE:
+            return None
+
+        plan = []
+        state = start
+        while state is not None:
+            command, state, _ = self._memo[state]
+            plan.append(command)
+        return plan
+
+    def next_command(self) -> Optional[str]:
+        plan = self.solve()
+        return plan[0] if plan else None
+
+    def _search(self, start: Tuple[int, int, int]):
+        if not self._goal_levels or self._beacon_id == NO_ITEM:
+            self._memo[start] = _UNSOLVABLE
+            return
+
+        world = self.world
+        key_items = self._key_items
+        required = world.required
+        memo = self._memo
+        parents = {start: None}
+        cost = {start: 0}
+        # Entries are (estimate, steps, tie, state, finished); a finished
+        # entry's estimate is the exact length of a complete plan, so the
+        # first one popped is optimal.
+        frontier = [(self._heuristic(start[0]), 0, 0, start, False)]
+        tie = 0
+
+        while frontier:
+            _, steps, _, state, finished = heappop(frontier)
+            if finished:
+                self._record(parents, state)
+                return
+            if steps > cost[state]:
+                continue
+            self.expanded += 1
+            room_id, bits, free = state
+
+            known = memo.get(state)
+            if known is not None and known is not _UNSOLVABLE:
+                tie += 1
+                heappush(frontier, (steps + known[2], steps + known[2], tie, state, True))
+                continue
+
+            here = self._item_ids(room_id)
+            if room_id in self._pod_rooms and free > 0 and self._beacon_id in here:
+                memo[state] = (f"take {BEACON}", None, 1)
+                tie += 1
+                heappush(frontier, (steps + 1, steps + 1, tie, state, True))
+                continue
+
+            successors = []
+            for direction, target in world.neighbors(room_id):
+                if self._locked(target):
+                    key = required[target]
+                    if key == NO_ITEM or not bits & (1 << key):
+                        continue
+                successors.append((f"go {DIRECTIONS[direction]}", (target, bits, free)))
+            if free > 0:
+                for item_id in set(here):
+                    if item_id in key_items and not bits & (1 << item_id):
+                        successors.append((f"take {world.item_names[item_id]}",
+                                           (room_id, bits | (1 << item_id), free - 1)))
+
+            for command, successor in successors:
+                if steps + 1 < cost.get(successor, steps + 2):
+                    cost[successor] = steps + 1
+                    parents[successor] = (state, command)
+                    tie += 1
+                    heappush(frontier, (steps + 1 + self._heuristic(successor[0]), steps + 1,
+                                        tie, successor, False))
+
+        memo[start] = _UNSOLVABLE
+
+    def _record(self, parents: dict, goal: tuple):
+        """Link every state on the found path to its successor in the memo"""
+        state = goal
+        remaining = self._memo[goal][2]
+        while parents[state] is not None:
+            previous, command = parents[state]
+            remaining += 1
+            self._memo[previous] = (command, state, remaining)
+            state = previous
+
+
+def solve(game) -> Optional[List[str]]:
+    """Shortest winning command sequence for a game, or None if it is unwinnable"""
+    return Solver(game).solve()
+
+
+def is_solvable(ship=None) -> bool:
+    """Whether a fresh game on the given ship (the stock ship by default) can be won"""
+    from alien_starship_adventure import AlienStarshipGame
+    from starship_render import NullRenderer
+
+    game = AlienStarshipGame(renderer=NullRenderer(), ship=ship)
+    return solve(game) is not None
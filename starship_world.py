@@ -0,0 +1,111 @@
+"""
+Compiled world representation for Alien Starship Adventure.
+Rooms become integer IDs and the exit graph a flat array of
+``room_count * 6`` slots, so moving is an index computation instead of a
+string lookup and large ships cost a few bytes per edge.
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Set, Tuple
+
+DIRECTIONS = ("north", "south", "east", "west", "up", "down")
+DIRECTION_INDEX = {name: i for i, name in enumerate(DIRECTIONS)}
+DIRECTION_COUNT = len(DIRECTIONS)
+OPPOSITE = (1, 0, 3, 2, 5, 4)
+
+# Exit slot markers
+NO_EXIT = -1
+DANGLING_EXIT = -2
+
+NO_ITEM = -1
+
+
+class CompiledWorld:
+    """Array-backed ship topology
+
+    ``exits[room_id * 6 + direction]`` holds the target room ID, ``NO_EXIT``
+    or ``DANGLING_EXIT`` (an exit naming a room that does not exist).
+    ``required[room_id]`` is the item ID needed to open the room, and bit
+    ``room_id`` of ``lock_mask`` is set for rooms that start locked.
+    """
+
+    __slots__ = ("room_names", "room_ids", "item_names", "item_ids",
+                 "levels", "exits", "required", "lock_mask")
+
+    def __init__(self, room_names: List[str], item_names: List[str],
+                 levels: bytearray, exits: array, required: array, lock_mask: bytearray):
+        self.room_names = room_names
+        self.room_ids = {name: i for i, name in enumerate(room_names)}
+        self.item_names = item_names
+        self.item_ids = {name: i for i, name in enumerate(item_names)}
+        self.levels = levels
+        self.exits = exits
+        self.required = required
+        self.lock_mask = lock_mask
+
+    @property
+    def room_count(self) -> int:
+        return len(self.room_names)
+
+    def exit(self, room_id: int, direction: int) -> int:
+        return self.exits[room_id * DIRECTION_COUNT + direction]
+
+    def neighbors(self, room_id: int) -> Iterator[Tuple[int, int]]:
+        """Yield (direction, target room ID) for every real exit of a room"""
+        base = room_id * DIRECTION_COUNT
+        for direction in range(DIRECTION_COUNT):
+            target = self.exits[base + direction]
+            if target >= 0:
+                yield direction, target
+
+    def starts_locked(self, room_id: int) -> bool:
+        return bool(self.lock_mask[room_id >> 3] & (1 << (room_id & 7)))
+
+    def lock_items(self) -> Set[int]:
+        """IDs of every item that opens some lock"""
+        return set(self.required) - {NO_ITEM}
+
+    def escape_pod_rooms(self) -> List[int]:
+        return [i for i, name in enumerate(self.room_names) if name.startswith("escape_pod_bay")]
+
+    def max_level_step(self) -> int:
+        """Largest level change made by a single exit"""
+        step = 1
+        for room_id in range(self.room_count):
+            for _, target in self.neighbors(room_id):
+                step = max(step, abs(self.levels[target] - self.levels[room_id]))
+        return step
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the fixed-width arrays"""
+        return (len(self.levels) + self.exits.itemsize * len(self.exits)
+                + self.required.itemsize * len(self.required) + len(self.lock_mask))
+
+
+def compile_world(rooms: Dict[str, "Room"], items: Dict[str, "Item"]) -> CompiledWorld:
+    """Compile the object graph into arrays and stamp each room with its ID"""
+    room_names = list(rooms)
+    room_ids = {name: i for i, name in enumerate(room_names)}
+    item_names = list(items)
+    item_ids = {name: i for i, name in enumerate(item_names)}
+
+    count = len(room_names)
+    levels = bytearray(count)
+    exits = array("i", [NO_EXIT]) * (count * DIRECTION_COUNT)
+    required = array("h", [NO_ITEM]) * count
+    lock_mask = bytearray((count + 7) >> 3)
+
+    for room_id, name in enumerate(room_names):
+        room = rooms[name]
+        room.id = room_id
+        levels[room_id] = room.level
+        for direction, target in room.exits.items():
+            if direction not in DIRECTION_INDEX:
+                raise ValueError(f"Room {name!r} has an exit in unknown direction {direction!r}")
+            exits[room_id * DIRECTION_COUNT + DIRECTION_INDEX[direction]] = room_ids.get(target, DANGLING_EXIT)
+        if room.required_item:
+            required[room_id] = item_ids.get(room.required_item, NO_ITEM)
+        if room.locked:
+            lock_mask[room_id >> 3] |= 1 << (room_id & 7)
+
+    return CompiledWorld(room_names, item_names, levels, exits, required, lock_mask)
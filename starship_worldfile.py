@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+World files for Alien Starship Adventure.
+Ships are defined in JSON or TOML files listing items and rooms (level,
+description, exits, starting items, lock). Loading a file for play goes
+through a compiled binary cache keyed by the file's content hash and the
+cache format version; the cache is memory-mapped and read in place, so
+large ships start without parsing and rooms are only decoded when the game
+reaches them. Small ships such as the bundled one are instead built once
+per process as a SharedWorld that every game on them shares.
+
+Cache layout, little-endian, version 1: a header followed by sections.
+Rooms are stored sorted by level so each level is one contiguous ID range.
+
+    header    4s magic, H version, H section count, I rooms, I items,
+              I levels, I start room, then (Q offset, Q length) per section
+    sections  levels B[n], exits i[6n], exit order B[6n], required h[n],
+              lock mask, level starts I[levels + 1], then offset tables I[n + 1]
+              and UTF-8 blobs for room names, descriptions, lock descriptions,
+              starting items (H item IDs), item names, item descriptions,
+              and item usable flags B[items]
+"""
+
+from array import array
+from typing import Dict, List, Optional
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from starship_world import (DANGLING_EXIT, DIRECTION_COUNT, DIRECTION_INDEX, DIRECTIONS,
+                            NO_EXIT, NO_ITEM, CompiledWorld, compile_world)
+
+WORLDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "worlds")
+BUNDLED_WORLD = os.path.join(WORLDS_DIR, "alien_starship.json")
+
+MAGIC = b"ASWC"
+VERSION = 1
+CACHE_SUFFIX = ".shipc"
+
+_HEADER = struct.Struct("<4sHHIIII")
+_SECTION = struct.Struct("<QQ")
+_SECTIONS = ("levels", "exits", "exit_order", "required", "lock_mask", "level_starts",
+             "name_offsets", "names", "desc_offsets", "descs", "lock_offsets", "locks",
+             "item_offsets", "room_items", "item_name_offsets", "item_names",
+             "item_desc_offsets", "item_descs", "usable")
+_NO_ORDER = 255
+
+
+class WorldFileError(ValueError):
+    pass
+
+
+_definitions: Dict[str, tuple] = {}
+
+
+def load_definition(path: str = BUNDLED_WORLD) -> dict:
+    """Parse a JSON or TOML world file, memoized per path and modification time"""
+    stamp = os.stat(path).st_mtime_ns
+    cached = _definitions.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with open(path, "rb") as f:
+        definition = parse_definition(f.read(), path)
+    _definitions[path] = (stamp, definition)
+    return definition
+
+
+def parse_definition(data: bytes, path: str = "") -> dict:
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError as exc:
+            raise WorldFileError("TOML world files need Python 3.11 or newer") from exc
+        definition = tomllib.loads(data.decode())
+    else:
+        definition = json.loads(data)
+    for key in ("items", "rooms", "start"):
+        if key not in definition:
+            raise WorldFileError(f"World file {path or '<data>'} has no {key!r}")
+    return definition
+
+
+def _blob(strings: List[str]):
+    offsets = array("I", [0])
+    blob = bytearray()
+    for text in strings:
+        blob += text.encode()
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def compile_definition(definition: dict) -> bytes:
+    """Build the binary cache image for a parsed world definition"""
+    items = definition["items"]
+    item_ids = {item["name"]: i for i, item in enumerate(items)}
+    # Stable sort keeps file order within a level
+    rooms = sorted(definition["rooms"], key=lambda room: room["level"])
+    room_ids = {room["name"]: i for i, room in enumerate(rooms)}
+    if definition["start"] not in room_ids:
+        raise WorldFileError(f"Start room {definition['start']!r} is not defined")
+
+    count = len(rooms)
+    levels = bytearray(count)
+    exits = array("i", [NO_EXIT]) * (count * DIRECTION_COUNT)
+    exit_order = bytearray([_NO_ORDER]) * (count * DIRECTION_COUNT)
+    required = array("h", [NO_ITEM]) * count
+    lock_mask = bytearray((count + 7) >> 3)
+    item_offsets = array("I", [0])
+    room_items = array("H")
+    level_numbers = sorted({room["level"] for room in rooms})
+    level_starts = array("I")
+
+    for room_id, room in enumerate(rooms):
+        levels[room_id] = room["level"]
+        if len(level_starts) < level_numbers.index(room["level"]) + 1:
+            level_starts.append(room_id)
+        for slot, (direction, target) in enumerate(room.get("exits", {}).items()):
+            if direction not in DIRECTION_INDEX:
+                raise WorldFileError(f"Room {room['name']!r} has an exit in unknown direction {direction!r}")
+            exits[room_id * DIRECTION_COUNT + DIRECTION_INDEX[direction]] = room_ids.get(target, DANGLING_EXIT)
+            exit_order[room_id * DIRECTION_COUNT + slot] = DIRECTION_INDEX[direction]
+        lock = room.get("lock")
+        if lock:
+            required[room_id] = item_ids.get(lock.get("item"), NO_ITEM)
+            lock_mask[room_id >> 3] |= 1 << (room_id & 7)
+        for name in room.get("items", ()):
+            if name not in item_ids:
+                raise WorldFileError(f"Room {room['name']!r} lists unknown item {name!r}")
+            room_items.append(item_ids[name])
+        item_offsets.append(len(room_items))
+    level_starts.append(count)
+
+    name_offsets, names = _blob([room["name"] for room in rooms])
+    desc_offsets, descs = _blob([room["description"] for room in rooms])
+    lock_offsets, locks = _blob([(room.get("lock") or {}).get("description", "") for room in rooms])
+    item_name_offsets, item_names = _blob([item["name"] for item in items])
+    item_desc_offsets, item_descs = _blob([item["description"] for item in items])
+    usable = bytes(bool(item.get("usable", False)) for item in items)
+
+    sections = [levels, exits, exit_order, required, lock_mask, level_starts,
+                name_offsets, names, desc_offsets, descs, lock_offsets, locks,
+                item_offsets, room_items, item_name_offsets, item_names,
+                item_desc_offsets, item_descs, usable]
+    payloads = [bytes(section) if not isinstance(section, array) else section.tobytes()
+                for section in sections]
+
+    offset = _HEADER.size + _SECTION.size * len(payloads)
+    table = bytearray()
+    body = bytearray()
+    for payload in payloads:
+        # Keep every section 8-byte aligned for zero-copy casts
+        padding = -(offset + len(body)) % 8
+        body += bytes(padding)
+        table += _SECTION.pack(offset + len(body), len(payload))
+        body += payload
+    header = _HEADER.pack(MAGIC, VERSION, len(payloads), count, len(items),
+                          len(level_numbers), room_ids[definition["start"]])
+    return header + bytes(table) + bytes(body)
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.environ.get("STARSHIP_CACHE_DIR") or os.path.join(base, "alien-starship")
+
+
+def cache_path(source: bytes, cache_dir: Optional[str] = None) -> str:
+    # The format is part of the key, so a layout change never reads an old cache
+    digest = hashlib.sha256(MAGIC + struct.pack("<H", VERSION) + source).hexdigest()[:32]
+    return os.path.join(cache_dir or default_cache_dir(), digest + CACHE_SUFFIX)
+
+
+def load_world(path: str = BUNDLED_WORLD, cache_dir: Optional[str] = None) -> "CachedWorld":
+    """Open a world file through its compiled cache, building the cache if needed"""
+    with open(path, "rb") as f:
+        source = f.read()
+    target = cache_path(source, cache_dir)
+    if not os.path.exists(target):
+        image = compile_definition(parse_definition(source, path))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        partial = f"{target}.{os.getpid()}.tmp"
+        with open(partial, "wb") as f:
+            f.write(image)
+        os.replace(partial, target)
+    return CachedWorld(target)
+
+
+class _Strings:
+    """Lazily decoded string table"""
+
+    __slots__ = ("_offsets", "_blob")
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+
+class CachedWorld(CompiledWorld):
+    """A compiled world read in place from a memory-mapped cache file
+
+    The topology arrays are zero-copy views into the mapping; names,
+    descriptions and starting items are decoded per room on demand. Plugs
+    into AlienStarshipGame(ship=...) the same way as a generated ship.
+    """
+
+    __slots__ = ("path", "start_room", "_map", "_names", "_descs", "_locks", "_item_offsets",
+                 "_room_items", "_exit_order", "level_starts", "_items", "_room_ids", "_catalog")
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise WorldFileError("Compiled world caches are little-endian only")
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        magic, version, section_count, rooms, items, _, start = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise WorldFileError(f"{path} is not a version {VERSION} world cache")
+        sections = {}
+        for index, name in enumerate(_SECTIONS[:section_count]):
+            offset, length = _SECTION.unpack_from(view, _HEADER.size + index * _SECTION.size)
+            sections[name] = view[offset:offset + length]
+
+        self.path = path
+        self.start_room = start
+        self.levels = sections["levels"]
+        self.exits = sections["exits"].cast("i")
+        self._exit_order = sections["exit_order"]
+        self.required = sections["required"].cast("h")
+        self.lock_mask = sections["lock_mask"]
+        self.level_starts = sections["level_starts"].cast("I")
+        self._names = _Strings(sections["name_offsets"].cast("I"), sections["names"])
+        self._descs = _Strings(sections["desc_offsets"].cast("I"), sections["descs"])
+        self._locks = _Strings(sections["lock_offsets"].cast("I"), sections["locks"])
+        self._item_offsets = sections["item_offsets"].cast("I")
+        self._room_items = sections["room_items"].cast("H")
+        item_names = _Strings(sections["item_name_offsets"].cast("I"), sections["item_names"])
+        item_descs = _Strings(sections["item_desc_offsets"].cast("I"), sections["item_descs"])
+        usable = sections["usable"]
+        self.room_names = self._names
+        self.item_names = [item_names[i] for i in range(items)]
+        self.item_ids = {name: i for i, name in enumerate(self.item_names)}
+        self._items = [(self.item_names[i], item_descs[i], bool(usable[i])) for i in range(items)]
+        self._room_ids = None
+        self._catalog = None
+
+    @property
+    def room_ids(self) -> Dict[str, int]:
+        # Built on first use; play itself only ever needs IDs
+        if self._room_ids is None:
+            self._room_ids = {self._names[i]: i for i in range(len(self._names))}
+        return self._room_ids
+
+    @property
+    def room_count(self) -> int:
+        return len(self.levels)
+
+    def level_rooms(self, level: int) -> range:
+        """Room IDs of one level, or an empty range if the ship has no such level"""
+        for index in range(len(self.level_starts) - 1):
+            start = self.level_starts[index]
+            if self.levels[start] == level:
+                return range(start, self.level_starts[index + 1])
+        return range(0)
+
+    def initial_items(self, room_id: int) -> List[str]:
+        return [self.item_names[item_id] for item_id in
+                self._room_items[self._item_offsets[room_id]:self._item_offsets[room_id + 1]]]
+
+    def make_room(self, room_id: int, items: Dict[str, "Item"]) -> "Room":
+        """Materialize the Room object for an ID"""
+        from alien_starship_adventure import Room
+
+        room = Room(self._names[room_id], self._descs[room_id], self.levels[room_id])
+        room.id = room_id
+        base = room_id * DIRECTION_COUNT
+        for slot in range(DIRECTION_COUNT):
+            direction = self._exit_order[base + slot]
+            if direction == _NO_ORDER:
+                break
+            target = self.exits[base + direction]
+            room.exits[DIRECTIONS[direction]] = self._names[target] if target >= 0 else ""
+        for item_name in self.initial_items(room_id):
+            room.items.add(items[item_name])
+        if self.starts_locked(room_id):
+            room.locked = True
+            required = self.required[room_id]
+            room.required_item = self.item_names[required] if required != NO_ITEM else None
+            room.lock_description = self._locks[room_id]
+        return room
+
+    def attach(self, game) -> "Room":
+        """Install this world's items and lazily materialized rooms on a game"""
+        from alien_starship_adventure import Item
+        from starship_generator import LazyRooms
+
+        if self._catalog is None:
+            # Items are immutable, so every game on this world shares them
+            self._catalog = {name: Item(name, description, usable) for name, description, usable in self._items}
+        game.items = self._catalog
+        game.world = self
+        game.rooms = LazyRooms(self, game.items)
+        game.room_list = game.rooms.by_id
+        return game.room_list[self.start_room]
+
+    def load_level(self, game, level: int):
+        """Materialize every room of one level on a game attached to this world"""
+        for room_id in self.level_rooms(level):
+            game.room_list[room_id]
+
+    def close(self):
+        self._map.close()
+
+
+class SharedWorld(CompiledWorld):
+    """A parsed world definition shared, read-only, by every game on it
+
+    Holds the compiled topology, one Item per item definition and a
+    template Room per room, with names interned. Games keep only an overlay
+    of rooms they have touched, forked from the templates on first access,
+    so a fresh game costs a few hundred bytes beyond its RNG. Items,
+    descriptions and exit dicts are shared and must not be mutated.
+    """
+
+    __slots__ = ("start_room", "items", "_templates")
+
+    def __init__(self, definition: dict):
+        from alien_starship_adventure import Item, Room
+
+        items = {}
+        for item in definition["items"]:
+            name = sys.intern(item["name"])
+            items[name] = Item(name, item["description"], item.get("usable", False))
+        rooms = {}
+        for entry in definition["rooms"]:
+            room = Room(sys.intern(entry["name"]), entry["description"], entry["level"])
+            room.exits = {sys.intern(direction): sys.intern(target)
+                          for direction, target in entry.get("exits", {}).items()}
+            for item_name in entry.get("items", ()):
+                if item_name not in items:
+                    raise WorldFileError(f"Room {room.name!r} lists unknown item {item_name!r}")
+                room.items.add(items[item_name])
+            lock = entry.get("lock")
+            if lock:
+                room.locked = True
+                room.required_item = lock["item"]
+                room.lock_description = lock["description"]
+            rooms[room.name] = room
+        if definition["start"] not in rooms:
+            raise WorldFileError(f"Start room {definition['start']!r} is not defined")
+
+        compiled = compile_world(rooms, items)
+        super().__init__(compiled.room_names, compiled.item_names, compiled.levels,
+                         compiled.exits, compiled.required, compiled.lock_mask)
+        self.start_room = self.room_ids[definition["start"]]
+        self.items = items
+        self._templates = list(rooms.values())
+
+    def initial_items(self, room_id: int) -> List[str]:
+        return [item.name for item in self._templates[room_id].items]
+
+    def make_room(self, room_id: int, items: Dict[str, "Item"]) -> "Room":
+        """The game's own copy of a room, sharing its description and exits"""
+        return self._templates[room_id].fork()
+
+    def attach(self, game) -> "Room":
+        """Install the shared items and lazily forked rooms on a game"""
+        from starship_generator import LazyRooms
+
+        game.items = self.items
+        game.world = self
+        game.rooms = LazyRooms(self, self.items)
+        game.room_list = game.rooms.by_id
+        return game.room_list[self.start_room]
+
+
+_shared: Dict[str, tuple] = {}
+
+
+def shared_world(path: str = BUNDLED_WORLD) -> SharedWorld:
+    """The process-wide SharedWorld of a world file
+
+    Loaded on first use and not checked again, so building a game costs no
+    file system call; reload_worlds() picks up edited files.
+    """
+    cached = _shared.get(path)
+    if cached is None:
+        definition = load_definition(path)
+        cached = _shared[path] = (definition, SharedWorld(definition))
+    return cached[1]
+
+
+def reload_worlds():
+    """Rebuild the shared worlds whose files changed since they were loaded
+
+    Games already running keep the world they were built on.
+    """
+    for path, (definition, _) in list(_shared.items()):
+        latest = load_definition(path)
+        if latest is not definition:
+            _shared[path] = (latest, SharedWorld(latest))
+
+
+def definition_from_ship(ship, items: Dict[str, "Item"]) -> dict:
+    """Export a generated ship as a world definition, for large world files"""
+    rooms = []
+    for room_id in range(ship.room_count):
+        room = ship.make_room(room_id, items)
+        entry = {"name": room.name, "level": room.level, "description": room.description,
+                 "exits": room.exits}
+        if room.items:
+            entry["items"] = [item.name for item in room.items]
+        if room.locked:
+            entry["lock"] = {"item": room.required_item, "description": room.lock_description}
+        rooms.append(entry)
+    return {
+        "name": f"procedural_{ship.seed}",
+        "start": ship.room_name(ship.start_room),
+        "items": [{"name": item.name, "description": item.description, "usable": item.usable}
+                  for item in items.values()],
+        "rooms": rooms,
+    }
+
+
+def main():
+    """Command line entry point: compile caches or export generated ships"""
+    parser = argparse.ArgumentParser(description="Compile and export Alien Starship world files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compile_cmd = commands.add_parser("compile", help="build the binary cache for a world file")
+    compile_cmd.add_argument("path")
+    compile_cmd.add_argument("--cache-dir")
+    export_cmd = commands.add_parser("export", help="write a generated ship as a JSON world file")
+    export_cmd.add_argument("output")
+    export_cmd.add_argument("--seed", type=int, default=0)
+    export_cmd.add_argument("--levels", type=int, default=5)
+    export_cmd.add_argument("--width", type=int, default=16)
+    export_cmd.add_argument("--height", type=int, default=16)
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        world = load_world(args.path, args.cache_dir)
+        print(f"{world.path}: {world.room_count} rooms")
+    else:
+        from alien_starship_adventure import AlienStarshipGame
+        from starship_generator import ProceduralShip
+        from starship_render import NullRenderer
+
+        ship = ProceduralShip(args.seed, args.levels, args.width, args.height)
+        items = AlienStarshipGame(renderer=NullRenderer()).items
+        with open(args.output, "w") as f:
+            json.dump(definition_from_ship(ship, items), f)
+        print(f"{args.output}: {ship.room_count} rooms")
+
+
+if __name__ == "__main__":
+    main()
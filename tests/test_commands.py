@@ -0,0 +1,87 @@
+import pytest
+
+from alien_starship_adventure import AlienStarshipGame
+from starship_commands import DEFAULT_PARSER, CommandParser, ItemIndex
+from starship_render import NullRenderer
+
+
+@pytest.mark.parametrize("line, verb, args", [
+    ("get energy cell", "take", ("energy", "cell")),
+    ("x torch", "examine", ("torch",)),
+    ("i", "inventory", ()),
+    ("l", "look", ()),
+    ("?", "help", ()),
+    ("walk e", "go", ("east",)),
+    ("go n", "go", ("north",)),
+    ("north", "go", ("north",)),
+    ("u", "go", ("up",)),
+    ("  LOOK  ", "look", ()),
+])
+def test_aliases_and_directions(line, verb, args):
+    command = DEFAULT_PARSER.parse(line)
+    assert (command.verb, command.args, command.raw) == (verb, args, line)
+
+
+@pytest.mark.parametrize("line, verb", [
+    ("exa", "examine"), ("insp", "examine"), ("inv", "inventory"), ("wal", "go"),
+    ("hin", "hint"), ("he", "help"), ("us", "use"), ("q", "quit"),
+])
+def test_unique_prefixes(line, verb):
+    assert DEFAULT_PARSER.parse(line).verb == verb
+
+
+@pytest.mark.parametrize("word", ["in", "h", "g"])
+def test_ambiguous_prefixes_are_unknown(word):
+    # "in": inventory or inspect; "h": help or hint; "g": go, goto or get
+    assert DEFAULT_PARSER.parse(word + " cell") == (None, (word, "cell"), word + " cell")
+
+
+def test_ambiguous_prefix_reaches_the_player_as_unknown():
+    messages = []
+
+    class Log(NullRenderer):
+        def message(self, text, kind="message"):
+            messages.append(kind)
+
+    AlienStarshipGame(seed=1, renderer=Log()).handle_command("in")
+    assert messages == ["unknown_command"]
+
+
+def test_registered_verb_changes_prefixes_only_on_its_copy():
+    parser = DEFAULT_PARSER.copy()
+    parser.register("hum", ("hm",))
+    assert parser.parse("hu").verb == "hum"
+    assert parser.parse("hm").verb == "hum"
+    assert parser.parse("h").verb is None
+    assert DEFAULT_PARSER.parse("hu").verb is None
+    assert "hum" not in DEFAULT_PARSER.verbs
+
+
+def test_blank_and_unknown_lines():
+    assert DEFAULT_PARSER.parse("   ") == (None, (), "   ")
+    assert DEFAULT_PARSER.parse("xyzzy") == (None, ("xyzzy",), "xyzzy")
+    assert CommandParser([("look", ())]).parse("take cell").verb is None
+
+
+INDEX = ItemIndex(["security_keycard", "maintenance_tool", "energy_cell", "hidden_keycard"])
+
+
+@pytest.mark.parametrize("phrase, names", [
+    ("energy cell", ("energy_cell",)),
+    ("energy_cell", ("energy_cell",)),
+    ("maint tool", ("maintenance_tool",)),
+    ("maintenence tool", ("maintenance_tool",)),
+    ("keycard", ("security_keycard", "hidden_keycard")),
+    ("hidden key", ("hidden_keycard",)),
+    ("card", ()),
+    ("zzz", ()),
+    ("", ()),
+])
+def test_item_phrases(phrase, names):
+    assert INDEX.candidates(phrase) == names
+
+
+def test_resolve_narrows_to_items_in_scope():
+    assert INDEX.resolve("keycard", [{"hidden_keycard"}]) == ("hidden_keycard",)
+    assert INDEX.resolve("keycard", [set(), {"security_keycard"}]) == ("security_keycard",)
+    assert INDEX.resolve("tool", [{"energy_cell"}]) == ()
@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from starship_env import MAX_VECTOR_ITEMS, SharedMemoryVectorEnv, SyncVectorEnv
+from starship_generator import ProceduralShip
+from starship_worldfile import load_world
+
+
+def test_spawned_workers_rebuild_a_generated_ship():
+    ship = ProceduralShip(2, 2, 6, 6)
+    local = SyncVectorEnv(4, ship=ship, max_steps=50)
+    actions = np.random.default_rng(0).integers(0, local.action_count, size=(60, 4))
+    expected = [local.reset(7).copy()] + [local.step(step)[0].copy() for step in actions]
+    with SharedMemoryVectorEnv(4, workers=2, ship=ship, max_steps=50, context="spawn") as envs:
+        observed = [envs.reset(7).copy()] + [envs.step(step)[0].copy() for step in actions]
+    assert all((a == b).all() for a, b in zip(observed, expected))
+
+
+def test_catalog_too_wide_for_bitsets_is_refused(tmp_path):
+    names = [f"gadget_{number}" for number in range(MAX_VECTOR_ITEMS)] + ["emergency_beacon"]
+    world = {"name": "wide", "start": "dock",
+             "items": [{"name": name, "description": "A thing."} for name in names],
+             "rooms": [{"name": "dock", "level": 1, "description": "Dock.", "items": names}]}
+    path = tmp_path / "wide.json"
+    path.write_text(json.dumps(world))
+    ship = load_world(str(path), str(tmp_path / "cache"))
+    with pytest.raises(ValueError, match="bitsets"):
+        SyncVectorEnv(2, ship=ship)
+    with pytest.raises(ValueError, match="bitsets"):
+        SharedMemoryVectorEnv(2, workers=1, ship=ship)
@@ -0,0 +1,40 @@
+from alien_starship_adventure import AlienStarshipGame
+from starship_multiplayer import Crew
+from starship_render import NullRenderer, TextRenderer
+
+
+def test_fork_has_its_own_renderer_and_no_journal():
+    written = []
+    game = AlienStarshipGame(seed=1, renderer=TextRenderer(write=written.append))
+    game.handle_command("look")
+    game.journal = object()
+    clone = game.fork()
+    assert clone.renderer is not game.renderer
+    assert clone.journal is None
+    clone.handle_command("east")
+    game.renderer.flush()
+    assert "Maintenance Shaft" not in "".join(written)
+
+
+def _wave(game, command):
+    game.output("You wave.")
+
+
+def test_fork_keeps_registered_verbs_apart():
+    game = AlienStarshipGame(seed=1, renderer=NullRenderer())
+    game.register_command("wave", _wave)
+    clone = game.fork()
+    clone.register_command("dance", _wave)
+    assert "dance" not in game.commands
+    assert game.parser.parse("dance").verb is None
+    assert clone.parser.parse("wave").verb == "wave"
+
+
+def test_snapshot_keeps_a_crew_players_visited_rooms():
+    crew = Crew()
+    player = crew.join(seed=1, renderer=NullRenderer())
+    player.display_room()
+    player.handle_command("east")
+    restored = crew.join(seed=2, renderer=NullRenderer())
+    restored.restore(player.snapshot())
+    assert restored.visited == player.visited == {0, player.player.current_room.id}
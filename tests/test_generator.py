@@ -0,0 +1,80 @@
+from collections import deque
+
+import pytest
+
+from starship_generator import DIRECTIONS, LOCK_ITEMS, ProceduralShip
+
+OPPOSITE = {"north": "south", "south": "north", "east": "west", "west": "east",
+            "up": "down", "down": "up"}
+
+
+def _layout(ship):
+    return [(ship.room_name(room_id), list(ship.neighbors(room_id)), ship.initial_items(room_id))
+            for room_id in range(ship.room_count)]
+
+
+def _reachable(ship, start, passable=lambda room_id: True):
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        for _, target in ship.neighbors(queue.popleft()):
+            if target not in seen and passable(target):
+                seen.add(target)
+                queue.append(target)
+    return seen
+
+
+def test_same_seed_builds_the_same_ship():
+    assert _layout(ProceduralShip(7, 3, 5, 4)) == _layout(ProceduralShip(7, 3, 5, 4))
+    assert ProceduralShip(7, 3, 5, 4).beacon_room == ProceduralShip(7, 3, 5, 4).beacon_room
+
+
+def test_different_seeds_build_different_ships():
+    layouts = {repr(_layout(ProceduralShip(seed, 3, 5, 4))) for seed in range(5)}
+    assert len(layouts) == 5
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_every_room_is_reachable_and_exits_are_two_way(seed):
+    ship = ProceduralShip(seed, 4, 6, 5)
+    assert _reachable(ship, ship.start_room) == set(range(ship.room_count))
+    for room_id in range(ship.room_count):
+        for direction, target in ship.neighbors(room_id):
+            back = DIRECTIONS.index(OPPOSITE[DIRECTIONS[direction]])
+            assert ship.exit(target, back) == room_id
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_each_deck_holds_the_key_to_the_next(seed):
+    ship = ProceduralShip(seed, 4, 6, 5)
+    for level in range(1, ship.level_count + 1):
+        base = (level - 1) * ship.per_level
+        deck = set(range(base, base + ship.per_level))
+        entry = ship.start_room if level == 1 else base + ship.up_stair[level - 1]
+        held = {LOCK_ITEMS[(below - 1) % len(LOCK_ITEMS)] for below in range(1, level)}
+        open_rooms = _reachable(ship, entry, lambda room_id: room_id in deck
+                                and ship.required_item(room_id) in held | {None})
+        if level < ship.level_count:
+            key = LOCK_ITEMS[(level - 1) % len(LOCK_ITEMS)]
+            assert base + ship.key_cell[level] in open_rooms
+            assert base + ship.up_stair[level] in open_rooms
+            assert key in ship.initial_items(base + ship.key_cell[level])
+            assert ship.required_item(base + ship.per_level + ship.up_stair[level]) == key
+            assert ship.required_item(base + ship.per_level + ship.up_shaft[level]) == key
+
+
+def test_pod_bays_and_beacon_sit_on_the_top_deck():
+    ship = ProceduralShip(3, 3, 4, 4, pod_bays=3)
+    pods = ship.escape_pod_rooms()
+    assert len(set(pods)) == 3
+    assert all(ship.levels[room_id] == ship.level_count for room_id in pods)
+    assert all(ship.room_name(room_id).startswith("escape_pod_bay_") for room_id in pods)
+    assert ship.beacon_room in pods
+    holders = [room_id for room_id in range(ship.room_count)
+               if "emergency_beacon" in ship.initial_items(room_id)]
+    assert holders == [ship.beacon_room]
+
+
+def test_decks_too_small_are_rejected():
+    with pytest.raises(ValueError):
+        ProceduralShip(1, 2, 2, 3)
@@ -0,0 +1,65 @@
+from alien_starship_adventure import AlienStarshipGame, Item, ItemBag, Player
+from starship_render import NullRenderer
+
+CELL = Item("energy_cell", "A glowing cell.")
+TOOL = Item("maintenance_tool", "A wrench.", usable=True)
+
+
+def test_duplicates_count_as_units():
+    bag = ItemBag([CELL, TOOL, CELL])
+    assert len(bag) == 3
+    assert bag.count("energy_cell") == 2
+    assert list(bag) == [CELL, CELL, TOOL]
+    assert list(bag.grouped()) == [(CELL, 2), (TOOL, 1)]
+    bag.add(TOOL, 3)
+    assert bag.count("maintenance_tool") == 4
+    assert len(bag) == 6
+
+
+def test_remove_takes_one_unit_at_a_time():
+    bag = ItemBag([CELL, CELL])
+    assert bag.remove("energy_cell") is CELL
+    assert "energy_cell" in bag and len(bag) == 1
+    assert bag.remove("energy_cell") is CELL
+    assert "energy_cell" not in bag
+    assert not bag
+    assert bag.remove("energy_cell") is None
+    assert bag.count("energy_cell") == 0 and bag.get("energy_cell") is None
+
+
+def test_insertion_order_survives_emptying_a_name():
+    bag = ItemBag([CELL, TOOL])
+    bag.remove("energy_cell")
+    bag.add(CELL)
+    assert [item for item, _ in bag.grouped()] == [TOOL, CELL]
+
+
+def test_copy_is_independent():
+    bag = ItemBag([CELL, CELL])
+    clone = bag.copy()
+    clone.remove("energy_cell")
+    clone.add(TOOL)
+    assert bag.count("energy_cell") == 2 and "maintenance_tool" not in bag
+    assert len(clone) == 2
+    bag.clear()
+    assert len(bag) == 0 and clone.count("energy_cell") == 1
+
+
+def test_inventory_limit_counts_units():
+    player = Player()
+    for _ in range(player.max_inventory):
+        assert player.add_item(CELL)
+    assert not player.add_item(TOOL)
+    assert player.has_item("Energy_Cell")
+    assert player.remove_item("energy_cell")
+    assert player.inventory.count("energy_cell") == player.max_inventory - 1
+
+
+def test_taking_one_of_two_leaves_the_other():
+    game = AlienStarshipGame(seed=1, renderer=NullRenderer())
+    room = game.player.current_room
+    cell = game.items["energy_cell"]
+    room.items.add(cell, 2)
+    game.handle_command("take energy cell")
+    assert game.player.inventory.count("energy_cell") == 1
+    assert room.items.count("energy_cell") == 1
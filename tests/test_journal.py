@@ -0,0 +1,74 @@
+import random
+import shutil
+
+import pytest
+
+from alien_starship_adventure import AlienStarshipGame
+from starship_generator import ProceduralShip
+from starship_journal import JournalError, JournalWriter, checkpoint_paths, replay, seek
+from starship_render import NullRenderer
+from starship_sim import explorer_policy
+
+
+def record(path: str, seed: int, ship, steps: int, checkpoint_every: int):
+    """Play and journal a game; returns its snapshot after every command"""
+    game = AlienStarshipGame(seed=seed, renderer=NullRenderer(), ship=ship)
+    rng = random.Random(seed)
+    snapshots = [game.snapshot()]
+    with JournalWriter(path, game, checkpoint_every=checkpoint_every):
+        for _ in range(steps):
+            if game.victory:
+                break
+            game.trigger_random_event()
+            game.handle_command(explorer_policy(game, rng))
+            snapshots.append(game.snapshot())
+    return snapshots
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("generated", [False, True])
+@pytest.mark.parametrize("checkpoint_every", [0, 16])
+def test_replay_and_seek_match_live_play(tmp_path, seed, generated, checkpoint_every):
+    ship = ProceduralShip(seed, 2, 8, 8) if generated else None
+    path = str(tmp_path / "game.jsonl")
+    snapshots = record(path, seed, ship, 150, checkpoint_every)
+
+    assert replay(path).snapshot() == snapshots[-1]
+    commands = len(snapshots) - 1
+    for command in sorted({0, 1, 15, 16, 17, commands // 2, commands}):
+        if command <= commands:
+            assert seek(path, command).snapshot() == snapshots[command], command
+
+
+def test_rerecording_drops_checkpoints_of_the_previous_game(tmp_path):
+    path = str(tmp_path / "game.jsonl")
+    record(path, 1, None, 80, checkpoint_every=16)
+    snapshots = record(path, 2, None, 40, checkpoint_every=0)
+    assert seek(path, 32).snapshot() == snapshots[32]
+
+
+def test_checkpoints_of_another_journal_are_ignored(tmp_path):
+    other, path = str(tmp_path / "other.jsonl"), str(tmp_path / "game.jsonl")
+    record(other, 1, None, 80, checkpoint_every=16)
+    snapshots = record(path, 2, None, 80, checkpoint_every=0)
+    for source, target in zip(checkpoint_paths(other), checkpoint_paths(path)):
+        shutil.copy(source, target)
+    assert seek(path, 40).snapshot() == snapshots[40]
+
+
+def _wave(game, command):
+    game.output("You wave.")
+    game.trigger_random_event()
+
+
+def test_replay_runs_registered_commands(tmp_path):
+    path = str(tmp_path / "game.jsonl")
+    game = AlienStarshipGame(seed=3, renderer=NullRenderer())
+    game.register_command("wave", _wave)
+    with JournalWriter(path, game):
+        for _ in range(30):
+            game.handle_command("wave")
+    setup = lambda replayed: replayed.register_command("wave", _wave)
+    assert replay(path, setup=setup).snapshot() == game.snapshot()
+    with pytest.raises(JournalError, match="wave"):
+        replay(path)
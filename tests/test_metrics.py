@@ -0,0 +1,56 @@
+import starship_metrics
+from alien_starship_adventure import AlienStarshipGame
+from starship_render import NullRenderer
+
+
+def play(metrics: starship_metrics.Metrics, **options):
+    starship_metrics.enable(metrics, **options)
+    try:
+        game = AlienStarshipGame(seed=1, renderer=NullRenderer())
+        for _ in range(320):
+            game.trigger_random_event()
+            game.handle_command("go east")
+            game.trigger_random_event()
+            game.handle_command("go west")
+        game.handle_command("look")
+        game.handle_command("")
+        game.handle_command("xyzzy")
+    finally:
+        starship_metrics.disable()
+
+
+def test_counts_are_exact_with_default_sampling():
+    metrics = starship_metrics.Metrics()
+    play(metrics)
+    report = metrics.as_dict()
+    assert report["commands_total"] == 643
+    assert report["commands"]["go"]["calls"] == 640
+    assert report["commands"]["look"]["calls"] == 1
+    assert report["commands"]["unknown"]["calls"] == 2
+    assert report["random_events"]["rolls"] == 640
+    assert report["handlers"]["trigger_random_event"]["calls"] == 640
+    # Only latency is sampled: every 64th command and roll
+    assert report["commands"]["go"]["sampled"] == 10
+    assert report["handlers"]["trigger_random_event"]["sampled"] == 10
+
+    text = metrics.to_prometheus()
+    assert 'starship_command_calls_total{verb="go"} 640' in text
+    assert 'starship_handler_calls_total{handler="trigger_random_event"} 640' in text
+    assert "move_player" not in text
+
+
+def test_every_call_timed_when_sampling_every_call():
+    metrics = starship_metrics.Metrics()
+    play(metrics, sample_every=1)
+    report = metrics.as_dict()
+    assert report["commands"]["go"]["sampled"] == 640
+    assert report["commands"]["go"]["calls"] == 640
+
+
+def test_reset():
+    metrics = starship_metrics.Metrics()
+    play(metrics)
+    metrics.reset()
+    report = metrics.as_dict()
+    assert report["commands_total"] == 0
+    assert report["commands"] == {}
@@ -0,0 +1,30 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import starship_montecarlo
+from starship_montecarlo import BatchSimulator
+
+
+def test_wandering_keeps_exact_room_counts():
+    sim = BatchSimulator(64, seed=1, take_items=False)
+    sim.run(400)
+    assert sim.room_items.dtype == np.int32
+    assert (sim.room_items >= 0).all()
+    assert (sim.room_totals == sim.room_items.sum(axis=2)).all()
+    start = int(sim.start_items.sum())
+    assert (sim.room_totals.sum(axis=1) == start + sim.discoveries).all()
+
+
+def test_turn_bound_stops_before_counts_overflow():
+    sim = BatchSimulator(4, seed=1, take_items=False)
+    sim.max_turns = sim.turn + 3
+    sim.run(3)
+    with pytest.raises(OverflowError):
+        sim.step()
+
+
+def test_oversized_batch_is_refused(monkeypatch):
+    monkeypatch.setattr(starship_montecarlo, "MAX_STATE_BYTES", 1 << 20)
+    with pytest.raises(ValueError, match="games per batch"):
+        BatchSimulator(100000)
@@ -0,0 +1,55 @@
+from starship_multiplayer import Crew, stress, stress_processes
+from starship_render import NullRenderer
+
+
+class RoomLog(NullRenderer):
+    def __init__(self):
+        self.visits = []
+
+    def room(self, room, first_visit: bool):
+        self.visits.append((room.name, first_visit))
+
+
+def test_visited_rooms_are_per_player():
+    crew = Crew()
+    first, second = RoomLog(), RoomLog()
+    alice = crew.join(seed=1, renderer=first)
+    bob = crew.join(seed=2, renderer=second)
+    alice.display_room()
+    alice.display_room()
+    bob.display_room()
+    assert first.visits == [("docking_bay", True), ("docking_bay", False)]
+    assert second.visits == [("docking_bay", True)]
+
+
+def test_stress_audit_passes():
+    report = stress(players=4, threads=2, steps=200)
+    assert report["errors"] == []
+
+
+def test_unlock_by_one_player_reroutes_the_others():
+    crew = Crew()
+    alice = crew.join(seed=1, renderer=NullRenderer())
+    bob = crew.join(seed=2, renderer=NullRenderer())
+    office = crew.room_list[crew.world.room_ids["security_office"]]
+    alice.player.current_room = bob.player.current_room = office
+    assert alice.path_to("armory") is None
+    bob.player.add_item(bob.items["security_keycard"])
+    bob.handle_command("goto armory")
+    assert bob.player.current_room.name == "armory"
+    assert alice.path_to("armory") is not None
+
+
+def test_rooms_materialize_on_demand():
+    crew = Crew()
+    before = crew.census()
+    player = crew.join(seed=1, renderer=NullRenderer())
+    player.handle_command("east")
+    assert len(crew.rooms.materialized) < crew.world.room_count
+    assert crew.census() == before
+
+
+def test_process_crews_pass_the_audit():
+    report = stress_processes(players=4, processes=2, steps=100)
+    assert report["processes"] == 2
+    assert report["errors"] == []
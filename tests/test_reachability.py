@@ -0,0 +1,66 @@
+import json
+import random
+
+import pytest
+
+from alien_starship_adventure import AlienStarshipGame
+from starship_generator import ProceduralShip
+from starship_reachability import Reachability, asymmetric_exits
+from starship_render import NullRenderer
+from starship_sim import explorer_policy
+from starship_worldfile import load_world
+
+# A locked pod bay and a one-way drop into a dead end
+TRAPDOOR = {
+    "name": "trapdoor",
+    "start": "docking_bay",
+    "items": [{"name": "energy_cell", "description": "A cell.", "usable": True},
+              {"name": "emergency_beacon", "description": "A beacon."}],
+    "rooms": [
+        {"name": "docking_bay", "level": 1, "description": "Dock.",
+         "exits": {"east": "hall", "down": "oubliette"}},
+        {"name": "hall", "level": 1, "description": "Hall.",
+         "exits": {"west": "docking_bay", "north": "storage", "east": "escape_pod_bay_1"}},
+        {"name": "storage", "level": 1, "description": "Storage.",
+         "exits": {"south": "hall"}, "items": ["energy_cell"]},
+        {"name": "oubliette", "level": 0, "description": "No way up.", "exits": {"east": "cell"}},
+        {"name": "cell", "level": 0, "description": "Cell.", "exits": {"west": "oubliette"}},
+        {"name": "escape_pod_bay_1", "level": 1, "description": "Pod.", "exits": {"west": "hall"},
+         "items": ["emergency_beacon"], "lock": {"item": "energy_cell", "description": "Sealed."}},
+    ],
+}
+
+
+def state(tracker: Reachability):
+    status = tracker.status()
+    return set(tracker.unreachable()), status["keys_available"], status["softlocked"]
+
+
+def check_while_playing(seed: int, ship):
+    game = AlienStarshipGame(seed=seed, renderer=NullRenderer(), ship=ship)
+    tracker = Reachability(game, warn=False)
+    rng = random.Random(seed)
+    for step in range(400):
+        if game.victory:
+            break
+        game.trigger_random_event()
+        game.handle_command(explorer_policy(game, rng))
+        if step % 5 == 0:
+            assert state(tracker) == state(Reachability(game.fork(), warn=False)), step
+    assert state(tracker) == state(Reachability(game.fork(), warn=False))
+    return tracker
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("generated", [False, True])
+def test_incremental_matches_from_scratch(seed, generated):
+    check_while_playing(seed, ProceduralShip(seed, 3, 8, 8) if generated else None)
+
+
+def test_incremental_matches_from_scratch_through_one_way_exits(tmp_path):
+    path = tmp_path / "trapdoor.json"
+    path.write_text(json.dumps(TRAPDOOR))
+    ship = load_world(str(path), str(tmp_path / "cache"))
+    assert any(one_way for *_, one_way in asymmetric_exits(ship))
+    outcomes = {check_while_playing(seed, ship).softlocked for seed in range(12)}
+    assert outcomes == {True, False}
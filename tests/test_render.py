@@ -0,0 +1,72 @@
+import json
+
+from alien_starship_adventure import AlienStarshipGame
+from starship_render import JSONRenderer, NullRenderer, TextRenderer
+
+
+def _game_with_items(renderer):
+    game = AlienStarshipGame(seed=1, renderer=renderer)
+    game.player.current_room.items.add(game.items["energy_cell"], 2)
+    game.player.current_room.items.add(game.items["plasma_torch"])
+    return game
+
+
+def test_text_rooms_inventory_and_messages():
+    written = []
+    game = _game_with_items(TextRenderer(write=written.append))
+    game.display_room()
+    game.display_room()
+    game.handle_command("take energy cell")
+    game.handle_command("inventory")
+    game.handle_command("xyzzy")
+    assert written == []
+    game.renderer.flush()
+    assert len(written) == 1
+    lines = written[0].split("\n")
+    assert lines[:4] == ["", "=== Docking Bay (Level 1) ===", game.player.current_room.description, ""]
+    assert lines[4:6] == ["Items here: Energy Cell x2, Plasma Torch", "Exits: north, east, up"]
+    assert "You are back in the docking bay." in lines
+    assert "Inventory:" in lines
+    assert f"  - Energy Cell: {game.items['energy_cell'].description}" in lines
+    assert lines[-2:] == ["I don't understand that command. Type 'help' for available commands.", ""]
+
+
+def test_text_flushes_when_the_buffer_fills():
+    written = []
+    renderer = TextRenderer(write=written.append, max_lines=3)
+    for number in range(7):
+        renderer.message(f"line {number}")
+    assert written == ["line 0\nline 1\nline 2\n", "line 3\nline 4\nline 5\n"]
+    renderer.flush()
+    renderer.flush()
+    assert written[2:] == ["line 6\n"]
+
+
+def test_json_events():
+    written = []
+    game = _game_with_items(JSONRenderer(write=written.append))
+    game.display_room()
+    game.handle_command("take energy cell")
+    game.handle_command("i")
+    game.handle_command("xyzzy")
+    game.renderer.flush()
+    events = [json.loads(line) for line in "".join(written).splitlines()]
+    room, taken, inventory, unknown = events
+    assert room["type"] == "room" and room["room"] == "docking_bay" and room["first_visit"]
+    assert room["items"] == {"energy_cell": 2, "plasma_torch": 1}
+    assert room["exits"] == ["north", "east", "up"] and room["lock_description"] is None
+    assert taken["type"] == "message" and taken["kind"] == "take"
+    assert inventory == {"type": "inventory", "items": {"energy_cell": 1}}
+    assert unknown["kind"] == "unknown_command"
+
+
+def test_null_renderer_changes_nothing_but_output():
+    texts = []
+    played = [_game_with_items(NullRenderer()), _game_with_items(TextRenderer(write=texts.append))]
+    for game in played:
+        for command in ["take energy cell", "east", "west", "take torch", "use torch"]:
+            game.trigger_random_event()
+            game.handle_command(command)
+    assert played[0].snapshot() == played[1].snapshot()
+    played[1].renderer.flush()
+    assert "Maintenance Shaft" in "".join(texts)
@@ -0,0 +1,77 @@
+from collections import deque
+import random
+
+import pytest
+
+from alien_starship_adventure import AlienStarshipGame
+from starship_generator import ProceduralShip
+from starship_render import NullRenderer, Renderer
+from starship_sim import explorer_policy
+
+
+def bfs_distances(game: AlienStarshipGame, source: int) -> dict:
+    """Shortest move counts to every room the player could walk into now"""
+    world = game.world
+    inventory = game.player.inventory
+
+    def passable(room_id: int) -> bool:
+        room = game.room_list[room_id]
+        return not room.locked or (room.required_item is not None and room.required_item in inventory)
+
+    dist = {source: 0}
+    queue = deque([source])
+    while queue:
+        room_id = queue.popleft()
+        for _, target in world.neighbors(room_id):
+            if target not in dist and passable(target):
+                dist[target] = dist[room_id] + 1
+                queue.append(target)
+    return dist
+
+
+def check_routes(game: AlienStarshipGame):
+    source = game.player.current_room.id
+    expected = bfs_distances(game, source)
+    for target, name in enumerate(game.world.room_names):
+        route = game.path_to(name)
+        if target not in expected:
+            assert route is None, name
+            continue
+        assert len(route) == expected[target], name
+        here = source
+        for direction in route:
+            here = game.world.room_ids[game.room_list[here].exits[direction]]
+        assert here == target
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_router_matches_bfs_while_playing(seed):
+    ships = [None, ProceduralShip(seed, 2, 6, 6)]
+    for ship in ships:
+        game = AlienStarshipGame(seed=seed, renderer=NullRenderer(), ship=ship)
+        rng = random.Random(seed)
+        for step in range(300):
+            if game.victory:
+                break
+            if step % 25 == 0:
+                check_routes(game)
+            game.trigger_random_event()
+            game.handle_command(explorer_policy(game, rng))
+        check_routes(game)
+
+
+class Messages(Renderer):
+    def __init__(self):
+        self.texts = []
+
+    def message(self, text: str, kind: str = "message"):
+        self.texts.append(text)
+
+
+def test_goto_counts_moves():
+    messages = Messages()
+    game = AlienStarshipGame(seed=1, renderer=messages)
+    game.handle_command("goto maintenance shaft 1")
+    assert "You head for the maintenance shaft 1 (1 move)." in messages.texts
+    game.handle_command("goto cargo hold 1")
+    assert "You head for the cargo hold 1 (2 moves)." in messages.texts
@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+import starship_metrics
+from alien_starship_adventure import AlienStarshipGame
+from starship_generator import ProceduralShip
+from starship_journal import JournalWriter, replay
+from starship_render import NullRenderer
+from starship_script import CompiledScript, ScriptError, run_batch
+from starship_sim import run_playthrough
+from starship_world import DIRECTIONS
+
+LINES = ["east", "take maintenance tool", "north", "take energy cell", "west", "look",
+         "use maintenance tool", "examine energy cell", "", "xyzzy", "go up", "take"]
+
+
+def random_script(seed: int, length: int = 200):
+    rng = random.Random(seed)
+    return [rng.choice(LINES + [f"go {direction}" for direction in DIRECTIONS])
+            for _ in range(length)]
+
+
+@pytest.mark.parametrize("script_seed", range(3))
+def test_compiled_run_matches_playthrough(script_seed):
+    lines = random_script(script_seed)
+    script = CompiledScript.compile(lines)
+    for seed in range(20):
+        compiled = script.run(seed, max_steps=len(lines))
+        played = run_playthrough(seed, commands=lines, max_steps=len(lines))
+        assert (compiled.victory, compiled.steps) == (played.victory, played.steps)
+        if compiled.steps < len(lines):
+            assert compiled.items_dropped == played.items_dropped
+
+
+def test_restarted_game_matches_fresh_game():
+    script = CompiledScript.compile(random_script(7))
+    game = AlienStarshipGame(seed=0, renderer=NullRenderer())
+    for seed in range(30):
+        assert script.run(seed, game=game) == script.run(seed)
+
+
+def test_batch_matches_single_runs():
+    scripts = [CompiledScript.compile(random_script(seed), name=str(seed)) for seed in range(2)]
+    results = run_batch(scripts, runs=12, workers=1, chunk_size=5)
+    assert sorted(results) == sorted(script.run(seed) for script in scripts for seed in range(12))
+
+
+def test_assertions():
+    script = CompiledScript.compile(["assert room docking_bay", "assert lacks energy cell",
+                                     "east", "assert room maintenance_shaft_1",
+                                     "west", "assert room maintenance_shaft_1"])
+    result = script.run(0)
+    assert result.steps == 2
+    assert result.failure == "line 6: assert room maintenance_shaft_1"
+
+
+def test_compile_errors():
+    with pytest.raises(ScriptError):
+        CompiledScript.compile(["assert room nowhere_at_all"])
+    with pytest.raises(ScriptError):
+        CompiledScript.compile(["assert sideways"])
+
+
+def test_commands_reach_metrics():
+    metrics = starship_metrics.Metrics()
+    starship_metrics.enable(metrics, sample_every=1)
+    try:
+        CompiledScript.compile(["look", "examine energy cell", "east"]).run(0)
+    finally:
+        starship_metrics.disable()
+    commands = metrics.as_dict()["commands"]
+    assert commands["look"]["calls"] == 1
+    assert commands["examine"]["calls"] == 1
+    assert commands["go"]["calls"] == 1
+    assert metrics.random_rolls == 3
+
+
+def test_journaled_run_replays(tmp_path):
+    path = str(tmp_path / "script.jsonl")
+    script = CompiledScript.compile(random_script(4))
+    game = AlienStarshipGame(seed=9, renderer=NullRenderer())
+    with JournalWriter(path, game):
+        result = script.run(9, game=game)
+    assert replay(path).snapshot() == game.snapshot()
+    assert script.run(9) == result
+
+
+def test_scripts_run_on_their_own_ship():
+    ship = ProceduralShip(3, 2, 6, 6)
+    start = ship.room_name(ship.start_room)
+    script = CompiledScript.compile([f"assert room {start}", "look", "north", "east"], ship=ship)
+    assert script.run(0).failure is None
+    results = run_batch([script], runs=4, workers=2, chunk_size=2)
+    assert results == [script.run(seed) for seed in range(4)]
+    with pytest.raises(ScriptError):
+        script.run(0, game=AlienStarshipGame(seed=0, renderer=NullRenderer()))
+    with pytest.raises(ScriptError):
+        run_batch([script, CompiledScript.compile(["look"])], runs=1, workers=1)
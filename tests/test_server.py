@@ -0,0 +1,44 @@
+import asyncio
+
+from alien_starship_adventure import AlienStarshipGame
+from starship_server import LINE_LIMIT, GameServer
+
+
+async def _until_prompt(reader):
+    return (await asyncio.wait_for(reader.readuntil(b"\n> "), 5)).decode()
+
+
+def _play(lines):
+    """Connect to a fresh server, send lines and return the text before each prompt"""
+    async def session():
+        server = GameServer(port=0)
+        await server.start()
+        port = server.server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = [await _until_prompt(reader)]
+        for line in lines:
+            writer.write(line + b"\n")
+            await writer.drain()
+            replies.append(await _until_prompt(reader))
+        writer.close()
+        await server.shutdown(grace=1.0)
+        return replies
+
+    return asyncio.run(session())
+
+
+def test_overlong_line_is_skipped_and_session_continues():
+    replies = _play([b"x" * (LINE_LIMIT + 904), b"inventory"])
+    assert f"longer than {LINE_LIMIT} bytes" in replies[1]
+    assert "I don't understand" not in replies[1]
+    assert "inventory" in replies[2].lower()
+
+
+def test_random_event_arrives_before_its_prompt(monkeypatch):
+    turns = iter(range(100))
+    monkeypatch.setattr(AlienStarshipGame, "trigger_random_event",
+                        lambda game: game.output(f"event {next(turns)}"))
+    replies = _play([b"look", b"look"])
+    assert [reply.count("event") for reply in replies] == [1, 1, 1]
+    for turn, reply in enumerate(replies):
+        assert reply.rstrip("> \n").endswith(f"event {turn}")
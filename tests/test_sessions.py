@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from alien_starship_adventure import AlienStarshipGame
+from starship_generator import ProceduralShip
+from starship_render import NullRenderer
+from starship_sessions import SessionStore
+from starship_sim import explorer_policy
+
+
+def _play(game, steps: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(steps):
+        game.trigger_random_event()
+        game.handle_command(explorer_policy(game, rng))
+
+
+@pytest.mark.parametrize("generated", [False, True])
+def test_hibernated_game_plays_on_like_the_original(generated):
+    ship = ProceduralShip(4, 2, 6, 6) if generated else None
+    game = AlienStarshipGame(renderer=NullRenderer(), ship=ship)
+    _play(game, 60, 1)
+    reference = game.fork()
+    with SessionStore() as store:
+        session_id = store.add(game)
+        store.hibernate(session_id)
+        assert store.hot_count == 0 and session_id in store
+        woken = store.get(session_id)
+        assert woken is not game and woken.seed == game.seed
+        assert woken.snapshot() == reference.snapshot()
+        _play(woken, 60, 2)
+        _play(reference, 60, 2)
+        assert woken.snapshot() == reference.snapshot()
+        assert store.rehydrations == 1
+
+
+def test_rehydrated_games_share_one_generated_ship():
+    ship = ProceduralShip(4, 2, 6, 6)
+    with SessionStore(capacity=1, evict_batch=1) as store:
+        first = store.add(AlienStarshipGame(seed=1, renderer=NullRenderer(), ship=ship))
+        second = store.add(AlienStarshipGame(seed=2, renderer=NullRenderer(), ship=ship))
+        assert store.get(first).world is ship
+        assert store.get(second).world is ship
+
+
+def test_least_recently_used_games_are_evicted():
+    dropped = []
+    store = SessionStore(capacity=3, evict_batch=1,
+                         on_hibernate=lambda session_id, game: dropped.append(session_id))
+    ids = [store.add(AlienStarshipGame(seed=seed, renderer=NullRenderer()), f"s{seed}")
+           for seed in range(3)]
+    store.get("s0")
+    store.add(AlienStarshipGame(seed=3, renderer=NullRenderer()), "s3")
+    assert dropped == ["s1"]
+    store.get("s1")
+    assert dropped == ["s1", "s2"]
+    assert store.hot_count == 3
+    assert store.hibernations == 2 and store.rehydrations == 1
+    assert all(session_id in store for session_id in ids)
+    store.close()
+
+
+def test_evictions_are_batched():
+    store = SessionStore(capacity=4, evict_batch=3)
+    for seed in range(5):
+        store.add(AlienStarshipGame(seed=seed, renderer=NullRenderer()), f"s{seed}")
+    assert store.hot_count == 2
+    assert store.hibernations == 3
+    store.close()
+
+
+def test_idle_sessions_hibernate_and_discard_forgets():
+    store = SessionStore()
+    session_id = store.add(AlienStarshipGame(seed=5, renderer=NullRenderer()))
+    assert store.hibernate_idle(3600) == 0
+    assert store.hibernate_idle(0) == 1
+    store.discard(session_id)
+    assert session_id not in store
+    with pytest.raises(KeyError):
+        store.get(session_id)
+    store.close()
+
+
+def test_sessions_survive_reopening_the_database(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    game = AlienStarshipGame(renderer=NullRenderer())
+    _play(game, 40, 3)
+    with SessionStore(path) as store:
+        session_id = store.add(game)
+    with SessionStore(path) as store:
+        woken = store.get(session_id)
+    assert woken.seed == game.seed >= 0
+    assert woken.snapshot() == game.snapshot()
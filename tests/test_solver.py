@@ -0,0 +1,66 @@
+from collections import deque
+import random
+
+import pytest
+
+from alien_starship_adventure import AlienStarshipGame
+from starship_generator import ProceduralShip
+from starship_render import NullRenderer
+from starship_sim import explorer_policy
+from starship_solver import BEACON, solve
+from starship_world import DIRECTIONS
+
+
+def bfs_plan_length(game: AlienStarshipGame):
+    """Fewest moves and takes of keys or the beacon that win, by brute force on forks"""
+    if game.victory:
+        return 0
+    wanted = {game.world.item_names[item_id] for item_id in game.world.lock_items()} | {BEACON}
+
+    def key(state: AlienStarshipGame):
+        return state.player.current_room.id, tuple(sorted(item.name for item in state.player.inventory))
+
+    seen = {key(game)}
+    queue = deque([(game, 0)])
+    while queue:
+        state, steps = queue.popleft()
+        room = state.player.current_room
+        commands = [f"go {direction}" for direction in DIRECTIONS if direction in room.exits]
+        commands += [f"take {item.name}" for item, _ in room.items.grouped() if item.name in wanted]
+        for command in commands:
+            successor = state.fork()
+            successor.handle_command(command)
+            if successor.victory:
+                return steps + 1
+            if key(successor) not in seen:
+                seen.add(key(successor))
+                queue.append((successor, steps + 1))
+    return None
+
+
+def played(seed: int, ship, steps: int) -> AlienStarshipGame:
+    game = AlienStarshipGame(seed=seed, renderer=NullRenderer(), ship=ship)
+    rng = random.Random(seed)
+    for _ in range(steps):
+        if game.victory:
+            break
+        game.trigger_random_event()
+        game.handle_command(explorer_policy(game, rng))
+    return game
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("generated", [False, True])
+def test_solver_matches_bfs(seed, generated):
+    ship = ProceduralShip(seed, 2, 6, 6) if generated else None
+    for steps in (0, 40):
+        game = played(seed, ship, steps)
+        plan = solve(game)
+        expected = bfs_plan_length(game)
+        if expected is None:
+            assert plan is None
+            continue
+        assert len(plan) == expected
+        for command in plan:
+            game.handle_command(command)
+        assert game.victory
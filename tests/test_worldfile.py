@@ -0,0 +1,80 @@
+import json
+import os
+
+import pytest
+
+import starship_worldfile
+from alien_starship_adventure import AlienStarshipGame
+from starship_render import NullRenderer
+from starship_worldfile import WorldFileError, cache_path, load_world, reload_worlds, shared_world
+
+# A ship without the stock bonus items, keycard or schematic
+TINY = {
+    "name": "tiny",
+    "start": "docking_bay",
+    "items": [{"name": "plasma_torch", "description": "A torch.", "usable": True},
+              {"name": "neural_interface", "description": "A headset.", "usable": True},
+              {"name": "emergency_beacon", "description": "A beacon."}],
+    "rooms": [{"name": "docking_bay", "level": 1, "description": "Dock.",
+               "exits": {"north": "computer_core"}, "items": ["plasma_torch", "neural_interface"]},
+              {"name": "computer_core", "level": 1, "description": "Core.",
+               "exits": {"south": "docking_bay", "east": "escape_pod_bay_1"}},
+              {"name": "escape_pod_bay_1", "level": 1, "description": "Pod.",
+               "exits": {"west": "computer_core"}, "items": ["emergency_beacon"]}],
+}
+WALKTHROUGH = ["take plasma torch", "take neural interface", "use plasma torch", "north",
+               "use neural interface", "east", "take emergency beacon"]
+
+
+def test_custom_world_without_stock_items(tmp_path):
+    path = tmp_path / "tiny.json"
+    path.write_text(json.dumps(TINY))
+    ship = load_world(str(path), str(tmp_path / "cache"))
+    for seed in range(100):
+        game = AlienStarshipGame(seed=seed, renderer=NullRenderer(), ship=ship)
+        for command in WALKTHROUGH * 2:
+            game.trigger_random_event()
+            game.handle_command(command)
+        assert game.victory
+        assert "hidden_keycard" not in game.room_list[0].items
+
+
+def test_cache_key_includes_format_version(tmp_path, monkeypatch):
+    source = json.dumps(TINY).encode()
+    before = cache_path(source, str(tmp_path))
+    monkeypatch.setattr(starship_worldfile, "VERSION", starship_worldfile.VERSION + 1)
+    assert cache_path(source, str(tmp_path)) != before
+
+
+def test_unknown_room_item_is_an_error_in_both_loaders(tmp_path):
+    broken = json.loads(json.dumps(TINY))
+    broken["rooms"][1]["items"] = ["flux_capacitor"]
+    path = tmp_path / "broken.json"
+    path.write_text(json.dumps(broken))
+    message = "Room 'computer_core' lists unknown item 'flux_capacitor'"
+    with pytest.raises(WorldFileError, match=message):
+        load_world(str(path), str(tmp_path / "cache"))
+    with pytest.raises(WorldFileError, match=message):
+        shared_world(str(path))
+
+
+def test_shared_world_is_checked_once_until_reloaded(tmp_path, monkeypatch):
+    path = tmp_path / "tiny.json"
+    path.write_text(json.dumps(TINY))
+    world = shared_world(str(path))
+    stats = []
+    real_stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda *args, **kwargs: stats.append(args) or real_stat(*args, **kwargs))
+    for seed in range(5):
+        AlienStarshipGame(seed=seed, renderer=NullRenderer(), ship=shared_world(str(path)))
+    assert stats == []
+    monkeypatch.undo()
+
+    edited = json.loads(json.dumps(TINY))
+    edited["rooms"][1]["description"] = "Humming core."
+    path.write_text(json.dumps(edited))
+    os.utime(path, ns=(0, real_stat(path).st_mtime_ns + 10 ** 9))
+    assert shared_world(str(path)) is world
+    reload_worlds()
+    assert shared_world(str(path)) is not world
+    assert shared_world(str(path))._templates[1].description == "Humming core."